@@ -1,2 +1,31 @@
-from .api import *
-from .utils import *
\ No newline at end of file
+"""
+Biblioteca interna da DIJUR.
+
+As funções de DijurLib.api, DijurLib.utils e DijurLib.portal também podem ser importadas direto de DijurLib.
+Os submódulos só são carregados no primeiro acesso (PEP 562), então quem usa apenas uma parte da biblioteca
+(ex: get_processo_pje ou os schemas) não paga a importação do Selenium.
+
+Exemplo de uso:
+    >>> from DijurLib import get_processo_pje
+"""
+import importlib
+
+_SUBPACOTES = ('api', 'utils', 'portal')
+
+def __getattr__(nome):
+    # DijurLib.api, DijurLib.utils e DijurLib.portal: o próprio subpacote
+    if nome in _SUBPACOTES:
+        return importlib.import_module(f'.{nome}', __name__)
+    for subpacote in _SUBPACOTES:
+        pacote = importlib.import_module(f'.{subpacote}', __name__)
+        if nome in pacote.__all__:
+            valor = getattr(pacote, nome)
+            globals()[nome] = valor
+            return valor
+    raise AttributeError(f"module {__name__!r} has no attribute {nome!r}")
+
+def __dir__():
+    nomes = set(globals())
+    for subpacote in _SUBPACOTES:
+        nomes |= set(importlib.import_module(f'.{subpacote}', __name__).__all__)
+    return sorted(nomes)
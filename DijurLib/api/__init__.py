@@ -0,0 +1,119 @@
+"""
+Funções de acesso às APIs do PAJ e do PJe.
+
+Exemplo de uso:
+    >>> from DijurLib.api import get_processos_npj
+    >>> get_processos_npj(driver, '2025/0019564-002')
+"""
+import importlib
+
+# Nome público -> submódulo onde ele é definido. Os submódulos só são importados no primeiro acesso (PEP 562).
+_EXPORTS = {
+    'parse_service_response': 'base',
+    'get_api_navegador': 'base',
+    'post_api_navegador': 'base',
+    'put_api_navegador': 'base',
+    'batch_api_navegador': 'base',
+    'baixar_documento': 'base',
+    'baixar_documento_pdf': 'base',
+    'baixar_documento_stream': 'base',
+    'comparar_str': 'base',
+    'CacheRespostas': 'cache',
+    'configurar_cache': 'cache',
+    'cache_respostas': 'cache',
+    'invalidar_cache': 'cache',
+    'invalidar_cache_ao_final': 'cache',
+    'cadastro_dados_iniciais': 'cadastro_npj',
+    'cadastro_numeros': 'cadastro_npj',
+    'cadastro_partes': 'cadastro_npj',
+    'cadastro_tramitacao': 'cadastro_npj',
+    'cadastro_advogado': 'cadastro_npj',
+    'cadastro_dependencias': 'cadastro_npj',
+    'cadastro_sinopse': 'cadastro_npj',
+    'cadastro_tipo_acao': 'cadastro_npj',
+    'cadastro_classe_cnj': 'cadastro_npj',
+    'cadastro': 'cadastro_npj',
+    'projetar_campos': 'cliente_js',
+    'trava_navegador': 'cliente_js',
+    'instalar_biblioteca_js': 'cliente_js',
+    'chamar_js': 'cliente_js',
+    'extrair_quantidade': 'consulta',
+    'get_processos_npj': 'consulta',
+    'get_processos_npj_lote': 'consulta',
+    'get_processo_numerodoprocesso': 'consulta',
+    'get_processo_numerodoprocesso_simples': 'consulta',
+    'get_processo_id_npj': 'consulta',
+    'get_processo_pje': 'consultaProcessos',
+    'carregar_manifesto': 'downloads',
+    'ja_baixado': 'downloads',
+    'arquivo_no_disco': 'downloads',
+    'baixar_documentos': 'downloads',
+    'get_logged_user': 'helpers',
+    'BaldeFichas': 'limitador',
+    'ControleConcorrencia': 'limitador',
+    'Familia': 'limitador',
+    'Limitador': 'limitador',
+    'configurar_limitador': 'limitador',
+    'get_api_data': 'npj',
+    'reativar_npj': 'npj',
+    'npj_cabecalho': 'npj',
+    'get_api_data_lote': 'npj',
+    'npj_dados_resumo': 'npj',
+    'npj_dados_numeros': 'npj',
+    'npj_dados_processo': 'npj',
+    'npj_pessoas_processo': 'npj',
+    'npj_tramitacao': 'npj',
+    'npj_documentos': 'npj',
+    'listar_andamentos': 'npj_andamentos',
+    'filtrar_andamentos': 'npj_andamentos',
+    'listar_documentos': 'npj_andamentos',
+    'listar_documento_vinculado': 'npj_andamentos',
+    'listar_documentos_vinculados': 'npj_andamentos',
+    'incluir_andamentos': 'npj_andamentos',
+    'iter_publicacoes': 'publicacoes',
+    'iter_publicacoes_por_numero': 'publicacoes',
+    'iter_publicacoes_historico': 'publicacoes',
+    'listar_publicacoes': 'publicacoes',
+    'listar_publicacoes_por_numero': 'publicacoes',
+    'listar_publicacoes_historico': 'publicacoes',
+    'consultar_publicacoes': 'publicacoes',
+    'detalhar_publicacao': 'publicacoes',
+    'emtratamento_publicacao': 'publicacoes',
+    'descartar_publicacao': 'publicacoes',
+    'descartar_publicacao_bbnaoparte': 'publicacoes',
+    'indicar_publicacao': 'publicacoes',
+    'aguardar_em_tratamento': 'publicacoes',
+    'tratar_publicacoes_em_lote': 'publicacoes',
+    'consultar_tratamento_publicacoes': 'publicacoes',
+    'serie_tratamento_publicacoes': 'publicacoes',
+    'ler_data': 'publicacoes',
+    'erro_retentavel': 'retry',
+    'endpoint_da_url': 'retry',
+    'OrcamentoRetry': 'retry',
+    'Circuito': 'retry',
+    'PoliticaRetry': 'retry',
+    'configurar_retry': 'retry',
+    'politica_retry': 'retry',
+    'EstadoSincronizacao': 'sincronizacao',
+    'sincronizar_publicacoes': 'sincronizacao',
+    'autenticacao_expirada': 'supervisor',
+    'SupervisorSessao': 'supervisor',
+    'configurar_supervisor': 'supervisor',
+    'supervisor_sessao': 'supervisor',
+    'sessao_expirada': 'transporte',
+    'SessaoPAJ': 'transporte',
+}
+
+__all__ = list(_EXPORTS)
+
+def __getattr__(nome):
+    modulo = _EXPORTS.get(nome)
+    if modulo is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {nome!r}")
+    valor = getattr(importlib.import_module(f'.{modulo}', __name__), nome)
+    # Guarda no módulo para que os próximos acessos não passem mais por aqui
+    globals()[nome] = valor
+    return valor
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -1,58 +1,206 @@
-from selenium.webdriver.remote.webdriver import WebDriver
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from selenium.webdriver.remote.webdriver import WebDriver
 import difflib
-import unicodedata
 import re
 import os
 import base64
+import hashlib
+import tempfile
 import time
+from concurrent.futures import ThreadPoolExecutor
+
+from .transporte import SessaoPAJ
+from .cliente_js import chamar_js, projetar_campos
+from .cache import cache_respostas
+from .retry import politica_retry, erro_retentavel
+from .limitador import limitador
+from .supervisor import supervisor_sessao, autenticacao_expirada
+from ..utils.decodificador import carregar_json
+from ..utils.texto import normalizar_texto
+from ..utils.schema.schemaDocumentos import DocumentoBaixado
+from ..utils.armazem import ArmazemDocumentos, armazem_padrao
+
+# Chamadas de lote ao navegador são quebradas em blocos que cabem no tempo limite de script do WebDriver
+TEMPO_LIMITE_SCRIPT_PADRAO = 30.0
+FRACAO_TEMPO_LIMITE_LOTE = 0.5
+LATENCIA_PRESUMIDA_LOTE = 2.0
+
+def _requisitar_sessao(driver, metodo: str, api_url: str, payload: dict = None, aceitar_texto: bool = False, campos: list = None):
+    """
+    Faz a requisição pela sessão HTTP quando o driver é uma SessaoPAJ.
+
+    :return: Resultado no formato do fetch do navegador, ou None se for preciso usar o navegador
+             (driver comum ou sessão HTTP expirada).
+    """
+    if not isinstance(driver, SessaoPAJ):
+        return None
+    return projetar_campos(driver.requisitar(metodo, api_url, payload, aceitar_texto=aceitar_texto), campos)
 
-def get_api_navegador(driver: WebDriver, api_url: str, max_attempts: int = 3):
+def _guardar_no_cache(api_url: str, resposta, campos: list = None):
+    # Somente respostas bem-sucedidas vão para o cache
+    cache = cache_respostas()
+    if cache is None or not isinstance(resposta, dict) or 'error' in resposta:
+        return
+    if resposta.get('statusCode', 200) != 200:
+        return
+    cache.guardar(api_url, resposta, campos)
+
+def _decodificar_texto(resultado, aceitar_texto: bool = False):
+    """
+    Converte o corpo recebido como string (modo texto_bruto) com o decodificador JSON mais rápido disponível.
+    Resultados que já são dicionários (erros, respostas projetadas) voltam sem alteração.
+    """
+    if not isinstance(resultado, str):
+        return resultado
+    try:
+        return carregar_json(resultado)
+    except ValueError:
+        if aceitar_texto:
+            return {'rawText': resultado}
+        return {'error': 'Resposta não está no formato JSON'}
+
+def _batch_sessao(driver, requisicoes: list, concurrency: int) -> list:
+    """
+    Executa um lote de requisições pela sessão HTTP quando o driver é uma SessaoPAJ.
+
+    :return: Lista de resultados na mesma ordem; None nas posições que precisam ser feitas pelo navegador.
+    """
+    if not isinstance(driver, SessaoPAJ):
+        return [None] * len(requisicoes)
+
+    def executar(req):
+        try:
+            # Cada requisição do pool de threads passa pelo token bucket da sua família
+            limitador().familia(req['url']).balde.adquirir()
+            resultado = driver.requisitar(req['metodo'], req['url'], req['payload'], aceitar_texto=True)
+            return projetar_campos(resultado, req['campos'])
+        except Exception as e:
+            return {'error': str(e)}
+
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        return list(executor.map(executar, requisicoes))
+
+def _tempo_limite_script(driver) -> float:
+    # Tempo limite de execute_async_script configurado no WebDriver (o padrão do Selenium é 30 s)
+    try:
+        return float(driver.timeouts.script)
+    except Exception:
+        return TEMPO_LIMITE_SCRIPT_PADRAO
+
+def _tamanho_bloco_lote(driver, urls: list, concorrencia: int) -> int:
+    """
+    Calcula quantas requisições de um lote cabem em uma chamada ao navegador sem estourar o tempo limite de script.
+
+    Usa a maior latência média medida entre as famílias das URLs (nunca menos que LATENCIA_PRESUMIDA_LOTE)
+    e reserva metade do tempo limite como margem. Como a página espaça as requisições pela taxa do limitador
+    (ver Limitador.intervalo_lote), o bloco também não passa do que essa taxa permite no mesmo tempo.
+    """
+    latencia = max(
+        [limitador().familia(url).controle.latencia_media or 0 for url in set(urls)] + [LATENCIA_PRESUMIDA_LOTE]
+    )
+    tempo_util = _tempo_limite_script(driver) * FRACAO_TEMPO_LIMITE_LOTE
+    rodadas = int(tempo_util / latencia)
+    tamanho = max(1, rodadas) * max(1, concorrencia)
+    intervalo = limitador().intervalo_lote(urls)
+    if intervalo > 0:
+        tamanho = min(tamanho, max(1, int(tempo_util / intervalo)))
+    return tamanho
+
+def _executar(driver, api_url: str, tentativa, max_attempts: int, descricao: str):
+    """
+    Executa uma requisição pela política de novas tentativas, com cada tentativa passando pelo limitador.
+    Se a sessão do PAJ tiver expirado e houver um SupervisorSessao ativo, renova a sessão e repete a requisição.
+
+    :return: Resultado da requisição, ou {'error': ...} se todas as tentativas falharem.
+    """
+    def executar():
+        return politica_retry().executar(
+            api_url,
+            lambda: limitador().executar(api_url, tentativa),
+            max_attempts,
+            descricao
+        )
+
+    resultado = executar()
+    supervisor = supervisor_sessao()
+    if supervisor is not None and autenticacao_expirada(resultado):
+        try:
+            renovada = supervisor.reautenticar(driver)
+        except Exception as e:
+            print("Não foi possível renovar a sessão do PAJ:", e)
+            renovada = False
+        if renovada:
+            print(f"Repetindo a {descricao} com a sessão renovada...")
+            resultado = executar()
+    return resultado
+
+def _reautenticar_lote(supervisor, driver) -> bool:
+    try:
+        return supervisor.reautenticar(driver)
+    except Exception as e:
+        print("Não foi possível renovar a sessão do PAJ:", e)
+        return False
+
+def parse_service_response(texto: str) -> dict:
+    """
+    Tenta extrair status, message e data de uma string no formato:
+    ServiceResponse [status=OK, messages=[], data=null]
+    Caso não encontre, retorna {'raw': texto}.
+    """
+    padrao = r"status=(\w+).*?messages?=\[([^\]]*)\].*?data=(\w+)"
+    match = re.search(padrao, texto)
+    if match:
+        status, message, data = match.groups()
+        return {
+            'status': status,
+            'message': message,
+            'data': data
+        }
+    else:
+        # Se não casou, retorna o texto cru
+        return {'raw': texto}
+
+def get_api_navegador(driver: WebDriver, api_url: str, max_attempts: int = 3, campos: list = None, texto_bruto: bool = False):
     """
     Faz uma requisição GET para uma API via navegador com retry em caso de erro.
     
     :param driver: Instância do WebDriver do Selenium.
     :param api_url: URL da API a ser acessada.
     :param max_attempts: Número máximo de tentativas (padrão: 3).
+    :param campos: (Opcional) Lista de caminhos a manter na resposta, aplicada dentro da página
+                   (ex: ['statusCode', 'data.listaOcorrencia[*].numeroProcesso']).
+    :param texto_bruto: Se True, o corpo cruza o WebDriver como uma única string e é convertido no Python
+                        por carregar_json (orjson, se instalado). Indicado para respostas grandes.
     :return: JSON obtido da API ou None se todas as tentativas falharem.
     """
-    attempts = 0
-    while attempts < max_attempts:
-        try:
-            print(f"Iniciando requisição GET - tentativa {attempts + 1}...")
-            json_data = driver.execute_async_script("""
-                const api_url = arguments[0];
-                const callback = arguments[arguments.length - 1];
-                fetch(api_url, {
-                    method: 'GET',
-                    credentials: 'same-origin'
-                })
-                .then(response => {
-                    if (!response.ok) {
-                        throw new Error('Network response was not ok: ' + response.statusText);
-                    }
-                    return response.json();
-                })
-                .then(data => callback(data))
-                .catch(error => callback({'error': error.toString()}));
-            """, api_url)
-            
-            if json_data and 'error' not in json_data:
-                print("Requisição GET bem-sucedida!")
-                return json_data
-            else:
-                print(f"Erro na requisição: {json_data.get('error') if json_data else 'Nenhuma resposta recebida'}")
-        except Exception as e:
-            print("Ocorreu um erro ao fazer a requisição GET via navegador:", e)
-        
-        attempts += 1
-        if attempts < max_attempts:
-            print("Tentando novamente em 1 segundo...")
-            time.sleep(1)
-    
-    print("Número máximo de tentativas alcançado. Retornando None.")
-    return None
+    cache = cache_respostas()
+    if cache is not None:
+        json_data = cache.obter(api_url, campos)
+        if json_data is not None:
+            print("Resposta GET obtida do cache.")
+            return json_data
 
-def post_api_navegador(driver, api_url: str, payload: dict, max_attempts: int = 3):
+    def tentativa():
+        json_data = _requisitar_sessao(driver, 'GET', api_url, campos=campos)
+        if json_data is None:
+            json_data = chamar_js(driver, 'requisitar', 'GET', api_url, None, False, campos, texto_bruto)
+            json_data = _decodificar_texto(json_data)
+        return json_data
+
+    json_data = _executar(driver, api_url, tentativa, max_attempts, 'requisição GET')
+    if 'error' in json_data:
+        print("Retornando None.")
+        return None
+
+    print("Requisição GET bem-sucedida!")
+    _guardar_no_cache(api_url, json_data, campos)
+    return json_data
+
+def post_api_navegador(driver, api_url: str, payload: dict, max_attempts: int = 3, campos: list = None, texto_bruto: bool = False):
     """
     Faz uma requisição POST para uma API via navegador e retorna um dicionário com o resultado.
     - Se o retorno for JSON válido, devolve o JSON parseado.
@@ -62,93 +210,35 @@ def post_api_navegador(driver, api_url: str, payload: dict, max_attempts: int =
     :param api_url: URL da API a ser acessada.
     :param payload: Dicionário com os dados a serem enviados no corpo da requisição.
     :param max_attempts: Número máximo de tentativas (padrão: 3).
+    :param campos: (Opcional) Lista de caminhos a manter na resposta JSON, aplicada dentro da página.
+    :param texto_bruto: Se True, o corpo cruza o WebDriver como uma única string e é convertido no Python.
     :return: Dicionário contendo a resposta. Caso ocorra erro, retorna None.
     """
+    def tentativa():
+        # Usamos response.text() e tentamos converter para JSON;
+        # se falhar, retornamos o texto cru para tratar manualmente.
+        response_data = _requisitar_sessao(driver, 'POST', api_url, payload, aceitar_texto=True, campos=campos)
+        if response_data is None:
+            response_data = chamar_js(driver, 'requisitar', 'POST', api_url, payload, True, campos, texto_bruto)
+            response_data = _decodificar_texto(response_data, aceitar_texto=True)
+        return response_data
 
-    def parse_service_response(texto: str) -> dict:
-        """
-        Tenta extrair status, message e data de uma string no formato:
-        ServiceResponse [status=OK, messages=[], data=null]
-        Caso não encontre, retorna {'raw': texto}.
-        """
-        import re
-        padrao = r"status=(\w+).*?messages?=\[([^\]]*)\].*?data=(\w+)"
-        match = re.search(padrao, texto)
-        if match:
-            status, message, data = match.groups()
-            return {
-                'status': status,
-                'message': message,
-                'data': data
-            }
-        else:
-            # Se não casou, retorna o texto cru
-            return {'raw': texto}
-    attempts = 0
-    while attempts < max_attempts:
-        try:
-            print("Iniciando requisição POST...")
-            # Abaixo, usamos response.text() e tentamos converter para JSON;
-            # se falhar, retornamos o texto cru para tratar manualmente.
-            response_data = driver.execute_async_script("""
-                const api_url = arguments[0];
-                const payload = arguments[1];
-                const callback = arguments[arguments.length - 1];
-
-                fetch(api_url, {
-                    method: 'POST',
-                    headers: {
-                        'Content-Type': 'application/json'
-                    },
-                    body: JSON.stringify(payload),
-                    credentials: 'same-origin'
-                })
-                .then(response => {
-                    if (!response.ok) {
-                        throw new Error('Network response was not ok: ' + response.statusText);
-                    }
-                    return response.text();
-                })
-                .then(text => {
-                    try {
-                        // Tenta interpretar como JSON
-                        const parsed = JSON.parse(text);
-                        callback(parsed);
-                    } catch (err) {
-                        // Se não for JSON, devolve a string para tratar no Python
-                        callback({ rawText: text });
-                    }
-                })
-                .catch(error => callback({ error: error.toString() }));
-            """, api_url, payload)
-
-            # Verifica se houve erro de rede ou similar
-            if 'error' in response_data:
-                print(f"Erro na requisição: {response_data['error']}")
-                return None
-
-            # Se não for JSON, virá no formato: {'rawText': '...'}
-            if 'rawText' in response_data:
-                parsed = parse_service_response(response_data['rawText'])
-                print("Requisição POST bem-sucedida (formato não-JSON).")
-                return parsed
-
-            # Caso seja JSON válido
-            print("Requisição POST bem-sucedida (JSON).")
-            return response_data
+    response_data = _executar(driver, api_url, tentativa, max_attempts, 'requisição POST')
+    if 'error' in response_data:
+        print("Retornando None.")
+        return None
 
-        except Exception as e:
-            print("Ocorreu um erro ao fazer a requisição POST via navegador:", e)
-        
-        attempts += 1
-        if attempts < max_attempts:
-            print("Tentando novamente em 1 segundo...")
-            time.sleep(1)
-    
-    print("Número máximo de tentativas alcançado. Retornando None.")
-    return None
+    # Se não for JSON, virá no formato: {'rawText': '...'}
+    if 'rawText' in response_data:
+        parsed = parse_service_response(response_data['rawText'])
+        print("Requisição POST bem-sucedida (formato não-JSON).")
+        return parsed
+
+    # Caso seja JSON válido
+    print("Requisição POST bem-sucedida (JSON).")
+    return response_data
     
-def put_api_navegador(driver: WebDriver, api_url: str, payload: dict, max_attempts: int = 3):
+def put_api_navegador(driver: WebDriver, api_url: str, payload: dict, max_attempts: int = 3, campos: list = None, texto_bruto: bool = False):
     """
     Faz uma requisição PUT para uma API via navegador e retorna o JSON obtido.
     
@@ -156,49 +246,215 @@ def put_api_navegador(driver: WebDriver, api_url: str, payload: dict, max_attemp
     :param api_url: URL da API a ser acessada.
     :param payload: Dicionário com os dados a serem enviados no corpo da requisição.
     :param max_attempts: Número máximo de tentativas (padrão: 3).
+    :param campos: (Opcional) Lista de caminhos a manter na resposta, aplicada dentro da página.
+    :param texto_bruto: Se True, o corpo cruza o WebDriver como uma única string e é convertido no Python.
     """
+    def tentativa():
+        json_data = _requisitar_sessao(driver, 'PUT', api_url, payload, campos=campos)
+        if json_data is None:
+            json_data = chamar_js(driver, 'requisitar', 'PUT', api_url, payload, False, campos, texto_bruto)
+            json_data = _decodificar_texto(json_data)
+        return json_data
+
+    json_data = _executar(driver, api_url, tentativa, max_attempts, 'requisição PUT')
+    if 'error' in json_data:
+        print("Retornando None.")
+        return None
+
+    print("Requisição PUT bem-sucedida!")
+    return json_data
+
+def batch_api_navegador(driver: WebDriver, requisicoes: list, concurrency: int = 4, max_attempts: int = 3, campos: list = None, texto_bruto: bool = False) -> list:
+    """
+    Faz várias requisições para APIs via navegador em uma única chamada ao WebDriver.
+    As requisições rodam dentro da página com no máximo `concurrency` fetches simultâneos.
+
+    :param driver: Instância do WebDriver do Selenium.
+    :param requisicoes: Lista de triplas (metodo, url, payload), ex: [('GET', url, None), ('POST', url, {...})].
+                        Um quarto elemento opcional define a projeção de campos só daquela requisição.
+    :param concurrency: Número máximo de requisições simultâneas (padrão: 4).
+    :param max_attempts: Número máximo de tentativas para as requisições que falharem (padrão: 3).
+    :param campos: (Opcional) Projeção de campos aplicada às requisições que não definem a sua.
+    :param texto_bruto: Se True, cada corpo cruza o WebDriver como string e é convertido no Python.
+    :return: Lista com um resultado por requisição, na mesma ordem. Cada resultado é o JSON obtido
+             ou um dicionário {'error': ...} caso a requisição tenha falhado.
+
+    As requisições feitas pelo navegador são enviadas em blocos que cabem no tempo limite de script do WebDriver.
+    Se a chamada de um bloco falhar (ex: tempo limite), só os GETs do bloco são repetidos; as demais requisições
+    voltam com {'error': ..., 'falhaNavegador': True}, pois podem ter sido aplicadas pelo servidor.
+    """
+    requisicoes = [
+        {
+            'metodo': req[0].upper(),
+            'url': req[1],
+            'payload': req[2],
+            'campos': req[3] if len(req) > 3 else campos
+        }
+        for req in requisicoes
+    ]
+    resultados = [None] * len(requisicoes)
+    pendentes = []
+
+    # Requisições GET já guardadas no cache não vão para o navegador
+    cache = cache_respostas()
+    for indice, req in enumerate(requisicoes):
+        if cache is not None and req['metodo'] == 'GET':
+            resultados[indice] = cache.obter(req['url'], req['campos'])
+        if resultados[indice] is None:
+            pendentes.append(indice)
+
+    politica = politica_retry()
+    circuitos = [politica.circuito(req['url']) for req in requisicoes]
+    for _ in pendentes:
+        politica.orcamento.registrar_requisicao()
+
+    supervisor = supervisor_sessao()
+    sessao_renovada = False
+
     attempts = 0
-    while attempts < max_attempts:
-        try:
-            print("Iniciando requisição PUT...")
-            json_data = driver.execute_async_script("""
-                const api_url = arguments[0];
-                const payload = arguments[1];
-                const callback = arguments[arguments.length - 1];
-                fetch(api_url, {
-                    method: 'PUT',
-                    headers: {
-                        'Content-Type': 'application/json'
-                    },
-                    body: JSON.stringify(payload),
-                    credentials: 'same-origin'
-                })
-                .then(response => {
-                    if (!response.ok) {
-                        throw new Error('Network response was not ok: ' + response.statusText);
-                    }
-                    return response.json();
-                })
-                .then(data => callback(data))
-                .catch(error => callback({'error': error.toString()}));
-            """, api_url, payload)
-            
-            if 'error' in json_data:
-                print(f"Erro na requisição: {json_data['error']}") 
-                return None
-            print("Requisição PUT bem-sucedida!")
-            return json_data
+    while pendentes and attempts < max_attempts:
+        # Requisições de endpoints com o circuito aberto falham na hora
+        liberados = []
+        for indice in pendentes:
+            if circuitos[indice].permitir():
+                liberados.append(indice)
+            else:
+                resultados[indice] = {'error': f'Circuito aberto para {circuitos[indice].endpoint}', 'circuitoAberto': True}
+        pendentes = liberados
+        if not pendentes:
+            break
 
+        print(f"Iniciando lote de {len(pendentes)} requisições - tentativa {attempts + 1}...")
+        lote = [requisicoes[i] for i in pendentes]
+        urls = [req['url'] for req in lote]
+        concorrencia = limitador().concorrencia_lote(urls, concurrency)
+        inicio = time.monotonic()
+        try:
+            respostas = _batch_sessao(driver, lote, concorrencia)
         except Exception as e:
-            print("Ocorreu um erro ao fazer a requisição PUT via navegador:", e)
+            print("Ocorreu um erro ao fazer o lote de requisições pela sessão HTTP:", e)
+            respostas = [{'error': str(e)}] * len(lote)
+        faltantes = [i for i, resposta in enumerate(respostas) if resposta is None]
+        if faltantes:
+            # Cada chamada ao navegador leva só as requisições que cabem no tempo limite de script do WebDriver
+            tamanho_bloco = _tamanho_bloco_lote(driver, [lote[i]['url'] for i in faltantes], concorrencia)
+            for inicio_bloco in range(0, len(faltantes), tamanho_bloco):
+                bloco = faltantes[inicio_bloco:inicio_bloco + tamanho_bloco]
+                try:
+                    # As fichas do bloco são reservadas antes do envio e a página espaça as requisições pela taxa
+                    urls_bloco = [lote[i]['url'] for i in bloco]
+                    limitador().adquirir_lote(urls_bloco)
+                    intervalo = limitador().intervalo_lote(urls_bloco) * 1000
+                    respostas_navegador = chamar_js(driver, 'lote', [lote[i] for i in bloco], concorrencia, texto_bruto, intervalo)
+                    if isinstance(respostas_navegador, dict):
+                        raise Exception(respostas_navegador.get('error'))
+                    for i, resposta in zip(bloco, respostas_navegador):
+                        respostas[i] = _decodificar_texto(resposta, aceitar_texto=True)
+                except Exception as e:
+                    print("Ocorreu um erro ao fazer o lote de requisições via navegador:", e)
+                    # Não se sabe quais requisições do bloco chegaram ao servidor
+                    for i in bloco:
+                        respostas[i] = {'error': str(e), 'falhaNavegador': True}
+        limitador().registrar_lote(urls, respostas, time.monotonic() - inicio, concorrencia)
+
+        ainda_pendentes = []
+        expiradas = []
+        for indice, resposta in zip(pendentes, respostas):
+            if resposta is None:
+                resposta = {'error': 'Nenhuma resposta recebida'}
+            elif 'rawText' in resposta:
+                resposta = parse_service_response(resposta['rawText'])
+            resultados[indice] = resposta
+            if 'error' not in resposta:
+                circuitos[indice].sucesso()
+                if requisicoes[indice]['metodo'] == 'GET':
+                    _guardar_no_cache(requisicoes[indice]['url'], resposta, requisicoes[indice]['campos'])
+            elif resposta.get('falhaNavegador'):
+                # A chamada ao navegador caiu no meio do bloco: só GETs são repetidos, porque uma escrita
+                # pode já ter sido aplicada pelo servidor
+                if requisicoes[indice]['metodo'] == 'GET':
+                    ainda_pendentes.append(indice)
+            elif supervisor is not None and not sessao_renovada and autenticacao_expirada(resposta):
+                expiradas.append(indice)
+            elif erro_retentavel(resposta):
+                circuitos[indice].falha()
+                ainda_pendentes.append(indice)
+            else:
+                # O endpoint respondeu; a falha é da requisição e não adianta repetir
+                circuitos[indice].sucesso()
+        pendentes = ainda_pendentes
+
+        # Sessão expirada no meio do lote: renova uma vez e repete essas requisições sem gastar tentativa
+        if expiradas and _reautenticar_lote(supervisor, driver):
+            sessao_renovada = True
+            print(f"Repetindo {len(expiradas)} requisições com a sessão renovada...")
+            pendentes = sorted(pendentes + expiradas)
+            continue
+
         attempts += 1
-        if attempts < max_attempts:
-            print("Tentando novamente em 1 segundo...")
-            time.sleep(1)
-    print("Número máximo de tentativas alcançado. Retornando None.")
-    return None
+        if pendentes and attempts < max_attempts:
+            # Cada requisição repetida gasta uma ficha do orçamento global
+            pendentes = [indice for indice in pendentes if politica.orcamento.gastar()]
+            if not pendentes:
+                print("Orçamento de novas tentativas esgotado.")
+                break
+            espera = politica.espera(attempts - 1)
+            print(f"{len(pendentes)} requisições falharam. Tentando novamente em {espera:.1f} segundos...")
+            time.sleep(espera)
+
+    falhas = sum(1 for resultado in resultados if resultado is None or 'error' in resultado)
+    print(f"Lote concluído: {len(requisicoes) - falhas} de {len(requisicoes)} requisições bem-sucedidas.")
+    return resultados
+
+def _obter_documento_base64(driver, id_documento: str, url: str, armazem: ArmazemDocumentos = None) -> dict:
+    """
+    Obtém o documento em base64, consultando antes o armazém local (se houver) e guardando nele o que for baixado.
+    O download passa pela política de novas tentativas, pelo limitador e pelo SupervisorSessao.
+
+    :return: Dicionário com base64, contentType e sha256 (None se não houver armazém).
+    """
+    if armazem is not None:
+        registro = armazem.buscar(id_documento)
+        if registro is not None:
+            print(f"Documento {id_documento} encontrado no armazém local.")
+            with open(registro['caminho'], 'rb') as f:
+                b64 = base64.b64encode(f.read()).decode('ascii')
+            return {'base64': b64, 'contentType': registro['contentType'], 'sha256': registro['sha256']}
+
+    def tentativa():
+        # Busca o arquivo pela biblioteca JS da página e retorna os dados em base64 e o Content-Type
+        resultado = chamar_js(driver, 'baixarBase64', url)
+        if isinstance(resultado, dict) and 'error' not in resultado and 'text/html' in (resultado.get('contentType') or ''):
+            # A página de login do portal volta como HTML: não pode ser gravada como documento
+            return {'error': 'Sessão expirada', 'status': 401}
+        return resultado
+
+    resultado = _executar(driver, url, tentativa, 3, 'requisição de download')
+
+    # Trata erros do script JavaScript
+    if isinstance(resultado, dict) and 'error' in resultado:
+        raise Exception(resultado['error'])
 
-def baixar_documento(driver, id_documento: str, caminho_destino: str = None) -> str:
+    b64 = resultado.get('base64')
+    content_type = resultado.get('contentType')
+    if not b64 or not content_type:
+        raise Exception("Não foi possível obter os dados do arquivo ou seu tipo.")
+
+    sha256 = None
+    if armazem is not None:
+        sha256 = armazem.guardar_bytes(id_documento, base64.b64decode(b64), content_type)['sha256']
+    return {'base64': b64, 'contentType': content_type, 'sha256': sha256}
+
+def _salvar_documento(caminho_destino: str, documento: dict, armazem: ArmazemDocumentos = None):
+    # Com armazém, o arquivo é entregue a partir do objeto guardado (hard link ou cópia)
+    if armazem is not None and documento['sha256']:
+        armazem.materializar(documento['sha256'], caminho_destino)
+        return
+    file_data = base64.b64decode(documento['base64'])
+    with open(caminho_destino, 'wb') as f:
+        f.write(file_data)
+
+def baixar_documento(driver, id_documento: str, caminho_destino: str = None, armazem: ArmazemDocumentos = None) -> str:
     """
     Baixa um documento via navegador sem abrir uma nova guia, define a extensão do arquivo
     automaticamente com base no Content-Type retornado pela API e retorna o conteúdo do documento
@@ -208,6 +464,7 @@ def baixar_documento(driver, id_documento: str, caminho_destino: str = None) ->
     :param id_documento: ID do documento a ser baixado.
     :param caminho_destino: (Opcional) Caminho (incluindo o nome do arquivo) para salvar o documento.
                             Se None, o arquivo não será salvo.
+    :param armazem: (Opcional) Armazém local consultado antes do download. Se None, usa o armazém padrão, se houver.
     :return: O conteúdo do documento em uma string base64.
     """
     if not isinstance(id_documento, str):
@@ -217,42 +474,10 @@ def baixar_documento(driver, id_documento: str, caminho_destino: str = None) ->
     
     try:
         print(f"Baixando documento {id_documento}...")
-        # Executa script assíncrono no navegador para buscar o arquivo e retornar dados em base64 e o Content-Type
-        resultado = driver.execute_async_script("""
-            const url = arguments[0];
-            const callback = arguments[arguments.length - 1];
-            fetch(url, {
-                method: 'GET',
-                credentials: 'same-origin'
-            })
-            .then(response => {
-                if (!response.ok) {
-                    throw new Error('Erro na resposta: ' + response.statusText);
-                }
-                // Obtém o Content-Type
-                const contentType = response.headers.get('Content-Type');
-                return response.blob().then(blob => ({ blob, contentType }));
-            })
-            .then(result => {
-                const reader = new FileReader();
-                reader.onloadend = function() {
-                    // O resultado vem no formato "data:[<mediatype>];base64,<dados>"
-                    const b64data = reader.result.split(',')[1];
-                    callback({ base64: b64data, contentType: result.contentType });
-                };
-                reader.readAsDataURL(result.blob);
-            })
-            .catch(error => callback({ error: error.toString() }));
-        """, url)
-        
-        # Trata erros do script JavaScript
-        if isinstance(resultado, dict) and 'error' in resultado:
-            raise Exception(resultado['error'])
-        
-        b64 = resultado.get('base64')
-        content_type = resultado.get('contentType')
-        if not b64 or not content_type:
-            raise Exception("Não foi possível obter os dados do arquivo ou seu tipo.")
+        armazem = armazem or armazem_padrao()
+        documento = _obter_documento_base64(driver, id_documento, url, armazem)
+        b64 = documento['base64']
+        content_type = documento['contentType']
         
         # Mapeia alguns content types para extensões de arquivo
         extensoes = {
@@ -270,9 +495,7 @@ def baixar_documento(driver, id_documento: str, caminho_destino: str = None) ->
             # Se o caminho não possuir extensão, adiciona a extensão obtida
             if not os.path.splitext(caminho_destino)[1] and extensao:
                 caminho_destino += extensao
-            file_data = base64.b64decode(b64)
-            with open(caminho_destino, 'wb') as f:
-                f.write(file_data)
+            _salvar_documento(caminho_destino, documento, armazem)
             print(f"Download concluído com sucesso! Arquivo salvo em: {caminho_destino}")
         
         # Retorna a string base64, que é JSON serializable
@@ -282,51 +505,24 @@ def baixar_documento(driver, id_documento: str, caminho_destino: str = None) ->
         raise Exception(f"Erro ao baixar o documento {id_documento}: {e}")
 
 
-def baixar_documento_pdf(driver, id_documento: str, npj: str, caminho_destino: str = None) -> bool:
+def baixar_documento_pdf(driver, id_documento: str, npj: str, caminho_destino: str = None, armazem: ArmazemDocumentos = None) -> bool:
     """
     Baixa um documento somente se ele for do tipo PDF, salvando com um nome único.
 
     :param driver: Instância do Selenium WebDriver.
     :param id_documento: ID do documento a ser baixado.
     :param npj: Identificador NPJ utilizado para nomear o arquivo.
+    :param armazem: (Opcional) Armazém local consultado antes do download. Se None, usa o armazém padrão, se houver.
     :return: True se o download do PDF foi bem-sucedido, False se o documento não for PDF.
     """
     url = f'https://juridico.intranet.bb.com.br/paj/resources/app/v0/processo/documento/download/{id_documento}'
 
     try:
         print(f"Verificando documento {id_documento} para confirmação de PDF...")
-        resultado = driver.execute_async_script("""
-            const url = arguments[0];
-            const callback = arguments[arguments.length - 1];
-            fetch(url, {
-                method: 'GET',
-                credentials: 'same-origin'
-            })
-            .then(response => {
-                if (!response.ok) {
-                    throw new Error('Erro na resposta: ' + response.statusText);
-                }
-                const contentType = response.headers.get('Content-Type');
-                return response.blob().then(blob => ({ blob, contentType }));
-            })
-            .then(result => {
-                const reader = new FileReader();
-                reader.onloadend = function() {
-                    const b64data = reader.result.split(',')[1];
-                    callback({ base64: b64data, contentType: result.contentType });
-                };
-                reader.readAsDataURL(result.blob);
-            })
-            .catch(error => callback({ error: error.toString() }));
-        """, url)
-
-        if isinstance(resultado, dict) and 'error' in resultado:
-            raise Exception(resultado['error'])
-
-        b64 = resultado.get('base64')
-        content_type = resultado.get('contentType')
-        if not b64 or not content_type:
-            raise Exception("Não foi possível obter os dados do arquivo ou seu tipo.")
+        armazem = armazem or armazem_padrao()
+        documento = _obter_documento_base64(driver, id_documento, url, armazem)
+        b64 = documento['base64']
+        content_type = documento['contentType']
 
         # Verifica se o documento é PDF
         if content_type != 'application/pdf' and content_type != 'application/zip':
@@ -351,10 +547,7 @@ def baixar_documento_pdf(driver, id_documento: str, npj: str, caminho_destino: s
             if not os.path.splitext(caminho_destino)[1] and extensao:
                 caminho_destino += extensao
             
-            file_data = base64.b64decode(b64)
-            
-            with open(caminho_destino, 'wb') as f:
-                f.write(file_data)
+            _salvar_documento(caminho_destino, documento, armazem)
             print(f"Download concluído com sucesso! Arquivo salvo em: {caminho_destino}")
             return True
         
@@ -364,6 +557,133 @@ def baixar_documento_pdf(driver, id_documento: str, npj: str, caminho_destino: s
     except Exception as e:
         raise Exception(f"Erro ao baixar o documento {id_documento}: {e}")
 
+# Mapeia os content types para extensões de arquivo
+EXTENSOES_DOCUMENTO = {
+    'application/pdf': '.pdf',
+    'application/zip': '.zip',
+    'image/jpeg': '.jpg',
+    'image/png': '.png',
+    'application/msword': '.doc',
+    'application/vnd.openxmlformats-officedocument.wordprocessingml.document': '.docx',
+}
+
+def baixar_documento_stream(driver, id_documento: str, caminho_destino: str, tamanho_bloco: int = 4 * 1024 * 1024, armazem: ArmazemDocumentos = None) -> DocumentoBaixado:
+    """
+    Baixa um documento gravando direto no disco, bloco a bloco, sem manter o arquivo inteiro na memória do Python.
+    Com uma SessaoPAJ o download é feito por streaming HTTP; com um WebDriver o arquivo fica no navegador
+    e os blocos cruzam o WebDriver um de cada vez. O download passa pela política de novas tentativas, pelo
+    limitador e pelo SupervisorSessao, como as demais requisições.
+
+    :param driver: Instância do WebDriver do Selenium ou SessaoPAJ.
+    :param id_documento: ID do documento a ser baixado.
+    :param caminho_destino: Caminho (incluindo o nome do arquivo) para salvar o documento.
+                            Se não tiver extensão, ela é definida pelo Content-Type.
+    :param tamanho_bloco: Tamanho de cada bloco em bytes (padrão: 4 MB).
+    :param armazem: (Opcional) Armazém local consultado antes do download. Se None, usa o armazém padrão, se houver.
+    :return: Metadados do arquivo salvo (caminho, tamanho, contentType e sha256).
+    """
+    if not isinstance(id_documento, str):
+        raise Exception("O ID do documento deve ser uma string!")
+
+    armazem = armazem or armazem_padrao()
+    registro = armazem.buscar(id_documento) if armazem is not None else None
+    if registro is not None:
+        content_type = registro['contentType'] or ''
+        extensao = EXTENSOES_DOCUMENTO.get(content_type.split(';')[0].strip(), '')
+        if not os.path.splitext(caminho_destino)[1] and extensao:
+            caminho_destino += extensao
+        armazem.materializar(registro['sha256'], caminho_destino)
+        print(f"Documento {id_documento} encontrado no armazém local. Arquivo salvo em: {caminho_destino}")
+        return {
+            'id_documento': id_documento,
+            'caminho': caminho_destino,
+            'tamanho': registro['tamanho'],
+            'contentType': content_type,
+            'sha256': registro['sha256'],
+        }
+
+    url = f'https://juridico.intranet.bb.com.br/paj/resources/app/v0/processo/documento/download/{id_documento}'
+    # Arquivo parcial único na pasta do destino: dois downloads para o mesmo destino não gravam no mesmo arquivo
+    pasta = os.path.dirname(caminho_destino) or '.'
+    descritor, caminho_parcial = tempfile.mkstemp(dir=pasta, prefix=os.path.basename(caminho_destino) + '.', suffix='.parcial')
+    os.close(descritor)
+
+    def tentativa():
+        # Cada tentativa grava o arquivo parcial do zero e devolve os metadados, ou {'error': ..., 'status': ...}
+        sha256 = hashlib.sha256()
+        tamanho = 0
+        response = driver.enviar('GET', url, stream=True) if isinstance(driver, SessaoPAJ) else None
+
+        if response is not None:
+            with response:
+                if not response.ok:
+                    return {'error': f'Erro na resposta: {response.reason}', 'status': response.status_code}
+                content_type = response.headers.get('Content-Type', '')
+                if 'text/html' in content_type:
+                    return {'error': 'Sessão expirada', 'status': 401}
+                with open(caminho_parcial, 'wb') as f:
+                    for bloco in response.iter_content(chunk_size=tamanho_bloco):
+                        f.write(bloco)
+                        sha256.update(bloco)
+                        tamanho += len(bloco)
+        else:
+            download = chamar_js(driver, 'abrirDownload', url)
+            if 'error' in download:
+                return download
+            handle = download['handle']
+            content_type = download.get('contentType') or ''
+            try:
+                with open(caminho_parcial, 'wb') as f:
+                    while tamanho < download['tamanho']:
+                        b64 = chamar_js(driver, 'lerBloco', handle, tamanho, tamanho + tamanho_bloco)
+                        if isinstance(b64, dict):
+                            return b64
+                        bloco = base64.b64decode(b64)
+                        if not bloco:
+                            raise Exception("Bloco vazio recebido do navegador.")
+                        f.write(bloco)
+                        sha256.update(bloco)
+                        tamanho += len(bloco)
+            finally:
+                chamar_js(driver, 'fecharDownload', handle)
+
+        return {'contentType': content_type, 'tamanho': tamanho, 'sha256': sha256.hexdigest()}
+
+    try:
+        print(f"Baixando documento {id_documento} em blocos...")
+        baixado = _executar(driver, url, tentativa, 3, 'requisição de download')
+        if 'error' in baixado:
+            raise Exception(baixado['error'])
+        content_type = baixado['contentType']
+        # A página de login do portal volta como HTML: não pode ser gravada como documento
+        if 'text/html' in content_type:
+            raise Exception("Sessão expirada: o PAJ devolveu uma página HTML no lugar do documento.")
+
+        # Se o caminho não possuir extensão, adiciona a extensão obtida
+        extensao = EXTENSOES_DOCUMENTO.get(content_type.split(';')[0].strip(), '')
+        if not os.path.splitext(caminho_destino)[1] and extensao:
+            caminho_destino += extensao
+        # mkstemp cria o arquivo só para o dono; o documento fica com as permissões de um arquivo comum
+        os.chmod(caminho_parcial, 0o644)
+        os.replace(caminho_parcial, caminho_destino)
+        print(f"Download concluído com sucesso! Arquivo salvo em: {caminho_destino}")
+
+        if armazem is not None:
+            armazem.guardar_arquivo(id_documento, caminho_destino, content_type, sha256=baixado['sha256'])
+
+        resultado: DocumentoBaixado = {
+            'id_documento': id_documento,
+            'caminho': caminho_destino,
+            'tamanho': baixado['tamanho'],
+            'contentType': content_type,
+            'sha256': baixado['sha256'],
+        }
+        return resultado
+
+    except Exception as e:
+        if os.path.exists(caminho_parcial):
+            os.remove(caminho_parcial)
+        raise Exception(f"Erro ao baixar o documento {id_documento}: {e}")
 
 def comparar_str(str1: str, str2: str):
     """
@@ -375,11 +695,8 @@ def comparar_str(str1: str, str2: str):
     :example: comparar_str("João da Silva", "João Silva") -> 0.9
     """
     def normalize(text):
-        # Remove acentos
-        text = unicodedata.normalize('NFD', text)
-        text = text.encode('ascii', 'ignore').decode("utf-8")
-        # Converte para minúsculas
-        text = text.lower()
+        # Remove acentos e converte para minúsculas (mesma normalização do índice de publicações)
+        text = normalizar_texto(text)
         # Remove pontuação
         text = re.sub(r'[^\w\s]', '', text)
         # Remove espaços
@@ -0,0 +1,188 @@
+from collections import OrderedDict
+import copy
+import functools
+import inspect
+import re
+import threading
+import time
+
+from ..utils.cache_processos import invalidar_cache_processos
+
+# TTL (em segundos) por padrão de URL. Somente as URLs que casam com algum padrão são guardadas.
+TTLS_PADRAO = {
+    r'/v1/processo/consulta/\d+$': 300,
+    r'/resumo/processo/consultar/\d+$': 300,
+    r'/pessoas/listarPessoasProcesso/': 300,
+    r'/processo/distribuicao/\d+$': 300,
+    r'/processo/cadastro/numero/\d+$': 300,
+    r'/dadosusuario/get-current-user/': 3600,
+}
+
+class CacheRespostas:
+    """
+    Cache em memória para as respostas de endpoints GET idempotentes do PAJ.
+
+    Cada padrão de URL tem o seu TTL; o número de respostas guardadas é limitado e as menos usadas
+    saem primeiro (LRU). As funções de escrita (cadastro_*, reativar_npj, incluir_andamentos) chamam
+    invalidar_cache para descartar as respostas do processo alterado.
+
+    Exemplo de uso:
+        >>> configurar_cache(CacheRespostas())
+        >>> npj_cabecalho(driver, 20250019564)
+        >>> cache_respostas().estatisticas()
+    """
+
+    def __init__(self, ttls: dict = None, max_itens: int = 1000):
+        """
+        :param ttls: Dicionário {regex da URL: TTL em segundos}. Se None, usa TTLS_PADRAO.
+        :param max_itens: Número máximo de respostas guardadas (padrão: 1000).
+        """
+        self.ttls = [(re.compile(padrao), ttl) for padrao, ttl in (ttls or TTLS_PADRAO).items()]
+        self.max_itens = max_itens
+        self._itens = OrderedDict()
+        self._trava = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.invalidacoes = 0
+
+    def ttl_para(self, api_url: str):
+        """
+        Retorna o TTL configurado para a URL, ou None se ela não deve ser guardada.
+        """
+        for padrao, ttl in self.ttls:
+            if padrao.search(api_url):
+                return ttl
+        return None
+
+    def obter(self, api_url: str, campos: list = None):
+        """
+        Retorna uma cópia da resposta guardada para a URL, ou None se não houver resposta válida.
+
+        :param api_url: URL da API.
+        :param campos: Projeção de campos usada na requisição (faz parte da chave).
+        """
+        if self.ttl_para(api_url) is None:
+            return None
+        chave = (api_url, tuple(campos or ()))
+        with self._trava:
+            item = self._itens.get(chave)
+            if item is None or item[0] < time.monotonic():
+                if item is not None:
+                    del self._itens[chave]
+                self.misses += 1
+                return None
+            self._itens.move_to_end(chave)
+            self.hits += 1
+            resposta = item[1]
+        return copy.deepcopy(resposta)
+
+    def guardar(self, api_url: str, resposta, campos: list = None):
+        """
+        Guarda a resposta de uma URL, se ela casar com algum padrão configurado.
+
+        :param api_url: URL da API.
+        :param resposta: JSON obtido da API.
+        :param campos: Projeção de campos usada na requisição (faz parte da chave).
+        """
+        ttl = self.ttl_para(api_url)
+        if ttl is None:
+            return
+        chave = (api_url, tuple(campos or ()))
+        with self._trava:
+            self._itens[chave] = (time.monotonic() + ttl, copy.deepcopy(resposta))
+            self._itens.move_to_end(chave)
+            while len(self._itens) > self.max_itens:
+                self._itens.popitem(last=False)
+
+    def invalidar(self, id_npj: int = None, padrao: str = None):
+        """
+        Descarta respostas guardadas.
+
+        :param id_npj: (Opcional) Descarta as respostas cujas URLs contêm este ID de NPJ.
+        :param padrao: (Opcional) Descarta as respostas cujas URLs casam com esta regex.
+        Sem argumentos, descarta tudo.
+        """
+        with self._trava:
+            if id_npj is None and padrao is None:
+                removidas = list(self._itens)
+            else:
+                regex = re.compile(padrao) if padrao else None
+                # O ID aparece na URL como segmento do caminho (ex: .../consultar/20250019564)
+                trecho = re.compile(rf'/{id_npj}(/|$)') if id_npj is not None else None
+                removidas = [
+                    chave for chave in self._itens
+                    if (trecho and trecho.search(chave[0])) or (regex and regex.search(chave[0]))
+                ]
+            for chave in removidas:
+                del self._itens[chave]
+            self.invalidacoes += len(removidas)
+
+    def estatisticas(self) -> dict:
+        """
+        Retorna os contadores do cache: hits, misses, invalidações e itens guardados.
+        """
+        with self._trava:
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'invalidacoes': self.invalidacoes,
+                'itens': len(self._itens),
+            }
+
+_cache = None
+
+def configurar_cache(cache: CacheRespostas):
+    """
+    Ativa o cache de respostas usado por get_api_navegador e batch_api_navegador.
+
+    :param cache: Instância de CacheRespostas, ou None para desativar.
+    """
+    global _cache
+    _cache = cache
+
+def cache_respostas() -> CacheRespostas:
+    """
+    Retorna o cache configurado por configurar_cache, ou None.
+    """
+    return _cache
+
+def invalidar_cache(id_npj: int = None, padrao: str = None):
+    """
+    Descarta respostas do cache configurado (não faz nada se o cache estiver desativado).
+    Chamada pelas funções de escrita depois de alterar um processo; com id_npj, também descarta
+    os registros do processo no cache em disco (ver configurar_cache_processos).
+
+    :param id_npj: (Opcional) ID do NPJ alterado.
+    :param padrao: (Opcional) Regex das URLs a descartar.
+    """
+    if _cache is not None:
+        _cache.invalidar(id_npj=id_npj, padrao=padrao)
+    if id_npj is not None:
+        invalidar_cache_processos(id_npj=id_npj)
+
+def invalidar_cache_ao_final(parametro: str):
+    """
+    Decorador das funções de escrita: chama invalidar_cache para o processo alterado ao final da função,
+    mesmo que ela levante exceção depois de alguma escrita ter chegado ao servidor (ex: uma conferência que falhou).
+
+    :param parametro: Nome do parâmetro da função que recebe o ID do NPJ alterado.
+    :example:
+        @invalidar_cache_ao_final('idNpj')
+        def reativar_npj(driver, justificativa, npj, idNpj): ...
+    """
+    def decorador(funcao):
+        assinatura = inspect.signature(funcao)
+
+        @functools.wraps(funcao)
+        def envoltorio(*args, **kwargs):
+            try:
+                return funcao(*args, **kwargs)
+            finally:
+                try:
+                    id_npj = assinatura.bind_partial(*args, **kwargs).arguments.get(parametro)
+                except TypeError:
+                    id_npj = None
+                if id_npj is not None:
+                    invalidar_cache(id_npj=id_npj)
+        return envoltorio
+    return decorador
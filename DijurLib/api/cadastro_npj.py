@@ -1,9 +1,13 @@
-from selenium.webdriver.remote.webdriver import WebDriver
+from __future__ import annotations
 
-import time
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from selenium.webdriver.remote.webdriver import WebDriver
 
 from .base import get_api_navegador, put_api_navegador, post_api_navegador, comparar_str 
 from .npj import npj_pessoas_processo
+from .cache import invalidar_cache, invalidar_cache_ao_final
 
 def cadastro_dados_iniciais(driver: WebDriver, npj: str, polo: str, autuacao: str):
     """
@@ -82,11 +86,17 @@ def cadastro_dados_iniciais(driver: WebDriver, npj: str, polo: str, autuacao: st
     # Liga o incidental ao principal
     incidental = post_api_navegador(driver, 'https://juridico.intranet.bb.com.br/paj/resources/app/v1/pessoas/incluirPessoa/inicial/incidental', payload_incidental)
 
+    # O principal ganhou uma incidental: descarta as respostas guardadas dos dois processos
+    # antes da conferência, pois a escrita pode ter chegado ao servidor mesmo que a resposta indique erro
+    invalidar_cache(id_npj=dados['numeroProcesso'])
+    invalidar_cache(id_npj=numeroProcessoCriado)
+
     if incidental == None or incidental['status'] != 'OK':
         raise Exception(f"Dados Iniciais: Erro ao ligar o incidental ao principal")
     
     return numeroProcessoCriado
 
+@invalidar_cache_ao_final('numeroProcessoCriado')
 def cadastro_numeros(driver: WebDriver, numeroProcessoCriado: int, cnj: str, publicacao: str, outros: str = None):
     """
     Função que cadastra os números do processo.
@@ -174,6 +184,7 @@ def cadastro_numeros(driver: WebDriver, numeroProcessoCriado: int, cnj: str, pub
     if proxima_pagina == None or proxima_pagina['data'] != True:
         raise Exception(f"Numeros: Erro ao passar para a proxima pagina")
 
+@invalidar_cache_ao_final('numeroProcessoCriado')
 def cadastro_partes(driver: WebDriver, numeroProcessoCriado: int, polos: list):
     """
     Função que confere as partes do processo no cadastro.
@@ -261,6 +272,7 @@ def cadastro_partes(driver: WebDriver, numeroProcessoCriado: int, polos: list):
     
     return True
 
+@invalidar_cache_ao_final('numeroProcessoCriado')
 def cadastro_tramitacao(driver: WebDriver, numeroProcessoCriado: int, tramitacao: str, tribunal: str):
     """
     Função que cadastra a tramitação do processo.
@@ -342,7 +354,8 @@ def cadastro_tramitacao(driver: WebDriver, numeroProcessoCriado: int, tramitacao
     
     if proxima_pagina == None or proxima_pagina['data'] != True:
         raise Exception(f"Tramitação: Erro ao passar para a proxima pagina")
-    
+
+@invalidar_cache_ao_final('numeroProcessoCriado')
 def cadastro_advogado(driver: WebDriver, numeroProcessoCriado: int, advogado: str):
     # Busca advogado
     advogado_payload = {
@@ -394,6 +407,7 @@ def cadastro_advogado(driver: WebDriver, numeroProcessoCriado: int, advogado: st
     if proxima_pagina == None or proxima_pagina['data'] != True:
         raise Exception(f"Advogado: Erro ao passar para a proxima pagina")
 
+@invalidar_cache_ao_final('numeroProcessoCriado')
 def cadastro_dependencias(driver: WebDriver, numeroProcessoCriado: int):
     """
     Função que cadastra as dependências do processo.
@@ -474,6 +488,7 @@ def cadastro_dependencias(driver: WebDriver, numeroProcessoCriado: int):
     if proxima_pagina == None or proxima_pagina['data'] != True:
         raise Exception(f"Dependencias: Erro ao passar para a proxima pagina")
 
+@invalidar_cache_ao_final('numeroProcessoCriado')
 def cadastro_sinopse(driver: WebDriver, numeroProcessoCriado: int, sinopse: str = None):
     """
     Função que cadastra a sinopse do processo.
@@ -516,7 +531,8 @@ def cadastro_sinopse(driver: WebDriver, numeroProcessoCriado: int, sinopse: str
     
     if proxima_pagina == None or proxima_pagina['data'] != True:
         raise Exception(f"Sinopse: Erro ao passar para a proxima pagina")
-    
+
+@invalidar_cache_ao_final('numeroProcessoCriado')
 def cadastro_tipo_acao(driver: WebDriver, numeroProcessoCriado: int, tipo_acao: str, tribunal: str):
     """
     Função que cadastra o tipo de ação do processo.
@@ -577,7 +593,8 @@ def cadastro_tipo_acao(driver: WebDriver, numeroProcessoCriado: int, tipo_acao:
     
     if proxima_pagina == None or proxima_pagina['data'] != True:
         raise Exception(f"Tipo Ação: Erro ao passar para a proxima pagina")
-    
+
+@invalidar_cache_ao_final('numeroProcessoCriado')
 def cadastro_classe_cnj(driver: WebDriver, numeroProcessoCriado: int, tipo_acao: str):
     """
     Função que cadastra a classe CNJ do processo.
@@ -665,29 +682,21 @@ def cadastro(driver: WebDriver, npj: str, polo: str, autuacao: str, cnj: str, pu
     """
                 
     numeroProcessoCriado = cadastro_dados_iniciais(driver, npj, polo, autuacao)
-    time.sleep(1)
     
     cadastro_numeros(driver, numeroProcessoCriado, cnj, publicacao, outros)        
-    time.sleep(1)   
                 
     
     confere_partes = cadastro_partes(driver, numeroProcessoCriado, polos)
-    time.sleep(1)
     
     cadastro_tramitacao(driver, numeroProcessoCriado, tramitacao, tribunal)
-    time.sleep(1)
     
     cadastro_advogado(driver, numeroProcessoCriado, advogado)
-    time.sleep(1)
     
     cadastro_dependencias(driver, numeroProcessoCriado)
-    time.sleep(1)
     
     cadastro_sinopse(driver, numeroProcessoCriado)
-    time.sleep(1)
     
     cadastro_tipo_acao(driver, numeroProcessoCriado, tipo_processo, tribunal)
-    time.sleep(1)
     
     cadastro_classe_cnj(driver, numeroProcessoCriado, tipo_processo)
     
@@ -0,0 +1,313 @@
+from __future__ import annotations
+
+import threading
+import weakref
+
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from selenium.webdriver.remote.webdriver import WebDriver
+
+# Versão da biblioteca JS. Altere sempre que BIBLIOTECA_JS mudar, para forçar a reinstalação nas páginas abertas.
+VERSAO_JS = 8
+
+# Biblioteca instalada uma única vez por página em window.__dijur.
+# Depois de uma navegação ou login a página perde a biblioteca e ela é reinstalada automaticamente.
+BIBLIOTECA_JS = """
+window.__dijur = {
+    versao: %d,
+
+    // Monta a árvore de projeção a partir de caminhos como 'data.listaPublicacao[*].numeroPublicacaoJudicial'
+    arvoreCampos(campos) {
+        const arvore = {};
+        for (const campo of campos) {
+            let no = arvore;
+            const partes = campo.split('.');
+            partes.forEach((parte, i) => {
+                const lista = parte.endsWith('[*]');
+                const nome = lista ? parte.slice(0, -3) : parte;
+                const ultimo = i === partes.length - 1;
+                if (nome) {
+                    if (ultimo && !lista) {
+                        no[nome] = true;
+                        return;
+                    }
+                    if (no[nome] === true) {
+                        return;
+                    }
+                    no = no[nome] = no[nome] || {};
+                }
+                if (lista) {
+                    if (ultimo) {
+                        no['*'] = true;
+                        return;
+                    }
+                    no = no['*'] = no['*'] || {};
+                }
+            });
+        }
+        return arvore;
+    },
+
+    projetar(valor, arvore) {
+        if (arvore === true || valor === null || typeof valor !== 'object') {
+            return valor;
+        }
+        if (Array.isArray(valor)) {
+            return '*' in arvore ? valor.map(item => this.projetar(item, arvore['*'])) : valor;
+        }
+        const resultado = {};
+        for (const chave of Object.keys(arvore)) {
+            if (chave !== '*' && chave in valor) {
+                resultado[chave] = this.projetar(valor[chave], arvore[chave]);
+            }
+        }
+        return resultado;
+    },
+
+    // Erros HTTP levam o status, usado no Python para decidir se vale tentar de novo
+    falhar(mensagem, status) {
+        const erro = new Error(mensagem);
+        erro.status = status;
+        throw erro;
+    },
+
+    // Sessão expirada: o PAJ redireciona para a página de login, que volta como HTML com status 200
+    verificarSessao(response) {
+        const html = (response.headers.get('Content-Type') || '').includes('text/html');
+        if ((response.redirected && !response.url.includes('/paj/resources/')) || (html && response.url.includes('/paj/resources/'))) {
+            this.falhar('Sessão expirada', 401);
+        }
+    },
+
+    // Com comoTexto, o corpo volta como uma única string, convertida no Python por carregar_json
+    async requisitar(metodo, url, payload, aceitarTexto, campos, comoTexto) {
+        const opcoes = { method: metodo, credentials: 'same-origin' };
+        if (payload !== null && payload !== undefined) {
+            opcoes.headers = { 'Content-Type': 'application/json' };
+            opcoes.body = JSON.stringify(payload);
+        }
+        const response = await fetch(url, opcoes);
+        if (!response.ok) {
+            this.falhar('Network response was not ok: ' + response.statusText, response.status);
+        }
+        this.verificarSessao(response);
+        const text = await response.text();
+        if (comoTexto && !campos) {
+            return text;
+        }
+        let dados;
+        try {
+            dados = JSON.parse(text);
+        } catch (err) {
+            if (aceitarTexto) {
+                return { rawText: text };
+            }
+            throw new Error('Resposta não está no formato JSON');
+        }
+        if (campos) {
+            dados = this.projetar(dados, this.arvoreCampos(campos));
+        }
+        return comoTexto ? JSON.stringify(dados) : dados;
+    },
+
+    // intervalo: tempo mínimo, em ms, entre o início de duas requisições (a taxa do limitador do Python)
+    async lote(requisicoes, concurrency, comoTexto, intervalo) {
+        const resultados = new Array(requisicoes.length);
+        let proxima = 0;
+        let proximoInicio = 0;
+        const aguardarVez = async () => {
+            if (!intervalo) {
+                return;
+            }
+            const agora = Date.now();
+            const inicio = Math.max(agora, proximoInicio);
+            proximoInicio = inicio + intervalo;
+            if (inicio > agora) {
+                await new Promise(resolve => setTimeout(resolve, inicio - agora));
+            }
+        };
+        const trabalhador = async () => {
+            while (proxima < requisicoes.length) {
+                const indice = proxima++;
+                const req = requisicoes[indice];
+                await aguardarVez();
+                try {
+                    resultados[indice] = await this.requisitar(req.metodo, req.url, req.payload, true, req.campos, comoTexto);
+                } catch (error) {
+                    resultados[indice] = { error: error.toString(), status: error.status || null };
+                }
+            }
+        };
+        const trabalhadores = [];
+        for (let i = 0; i < Math.min(concurrency, requisicoes.length); i++) {
+            trabalhadores.push(trabalhador());
+        }
+        await Promise.all(trabalhadores);
+        return resultados;
+    },
+
+    downloads: {},
+    proximoDownload: 0,
+
+    // Download em blocos: o arquivo fica no navegador e o Python lê um bloco por vez
+    async abrirDownload(url) {
+        const response = await fetch(url, { method: 'GET', credentials: 'same-origin' });
+        if (!response.ok) {
+            this.falhar('Erro na resposta: ' + response.statusText, response.status);
+        }
+        this.verificarSessao(response);
+        const blob = await response.blob();
+        const handle = String(++this.proximoDownload);
+        this.downloads[handle] = blob;
+        return { handle: handle, tamanho: blob.size, contentType: response.headers.get('Content-Type') };
+    },
+
+    async lerBloco(handle, inicio, fim) {
+        const blob = this.downloads[handle];
+        if (!blob) {
+            throw new Error('Download não encontrado: ' + handle);
+        }
+        const dataUrl = await new Promise((resolve, reject) => {
+            const reader = new FileReader();
+            reader.onloadend = () => resolve(reader.result);
+            reader.onerror = () => reject(reader.error);
+            reader.readAsDataURL(blob.slice(inicio, fim));
+        });
+        return dataUrl.split(',')[1] || '';
+    },
+
+    async fecharDownload(handle) {
+        delete this.downloads[handle];
+        return true;
+    },
+
+    async baixarBase64(url) {
+        const response = await fetch(url, { method: 'GET', credentials: 'same-origin' });
+        if (!response.ok) {
+            this.falhar('Erro na resposta: ' + response.statusText, response.status);
+        }
+        this.verificarSessao(response);
+        const contentType = response.headers.get('Content-Type');
+        const blob = await response.blob();
+        const dataUrl = await new Promise((resolve, reject) => {
+            const reader = new FileReader();
+            reader.onloadend = () => resolve(reader.result);
+            reader.onerror = () => reject(reader.error);
+            reader.readAsDataURL(blob);
+        });
+        // O resultado vem no formato "data:[<mediatype>];base64,<dados>"
+        return { base64: dataUrl.split(',')[1], contentType: contentType };
+    }
+};
+""" % VERSAO_JS
+
+# Script curto enviado a cada chamada: só o nome da função e os argumentos cruzam o WebDriver.
+_CHAMADA_JS = """
+const callback = arguments[arguments.length - 1];
+const dijur = window.__dijur;
+if (!dijur || dijur.versao !== arguments[0]) {
+    callback({ __dijurAusente: true });
+    return;
+}
+dijur[arguments[1]].apply(dijur, arguments[2])
+    .then(resultado => callback(resultado))
+    .catch(error => callback({ error: error.toString(), status: error.status || null }));
+"""
+
+def _arvore_campos(campos: list) -> dict:
+    """
+    Monta a árvore de projeção a partir dos caminhos, com a mesma regra de window.__dijur.arvoreCampos.
+    """
+    arvore = {}
+    for campo in campos:
+        no = arvore
+        partes = campo.split('.')
+        for i, parte in enumerate(partes):
+            lista = parte.endswith('[*]')
+            nome = parte[:-3] if lista else parte
+            ultimo = i == len(partes) - 1
+            if nome:
+                if ultimo and not lista:
+                    no[nome] = True
+                    break
+                if no.get(nome) is True:
+                    break
+                no = no.setdefault(nome, {})
+            if lista:
+                if ultimo:
+                    no['*'] = True
+                    break
+                no = no.setdefault('*', {})
+    return arvore
+
+def _projetar(valor, arvore):
+    if arvore is True or not isinstance(valor, (dict, list)):
+        return valor
+    if isinstance(valor, list):
+        return [_projetar(item, arvore['*']) for item in valor] if '*' in arvore else valor
+    return {
+        chave: _projetar(valor[chave], sub)
+        for chave, sub in arvore.items()
+        if chave != '*' and chave in valor
+    }
+
+def projetar_campos(dados, campos: list):
+    """
+    Mantém somente os campos indicados de uma resposta, com a mesma regra aplicada dentro da página.
+    Usada quando a resposta não passa pelo navegador (ex: SessaoPAJ).
+
+    :param dados: Resposta já convertida para dicionário/lista.
+    :param campos: Lista de caminhos a manter (ex: ['statusCode', 'data.listaPublicacao[*].numeroPublicacaoJudicial']).
+    :return: Resposta somente com os campos indicados. Se campos for vazio, retorna os dados sem alteração.
+    :example: projetar_campos({'a': 1, 'b': [{'c': 2, 'd': 3}]}, ['b[*].c']) -> {'b': [{'c': 2}]}
+    """
+    if not campos or not isinstance(dados, (dict, list)):
+        return dados
+    # Respostas de erro não são projetadas
+    if isinstance(dados, dict) and ('error' in dados or 'rawText' in dados):
+        return dados
+    return _projetar(dados, _arvore_campos(campos))
+
+# Uma trava por navegador: sessões do WebDriver não são thread-safe
+_travas = weakref.WeakKeyDictionary()
+_trava_travas = threading.Lock()
+
+def trava_navegador(driver: WebDriver) -> threading.RLock:
+    """
+    Retorna a trava que serializa os comandos enviados a um navegador quando ele é usado por várias threads.
+
+    :param driver: Instância do WebDriver do Selenium ou SessaoPAJ (usa o navegador da sessão).
+    """
+    navegador = getattr(driver, 'driver', driver)
+    with _trava_travas:
+        trava = _travas.get(navegador)
+        if trava is None:
+            trava = _travas[navegador] = threading.RLock()
+        return trava
+
+def instalar_biblioteca_js(driver: WebDriver):
+    """
+    Instala a biblioteca window.__dijur na página atual do navegador.
+
+    :param driver: Instância do WebDriver do Selenium.
+    """
+    driver.execute_script(BIBLIOTECA_JS)
+
+def chamar_js(driver: WebDriver, funcao: str, *args):
+    """
+    Chama uma função da biblioteca window.__dijur, instalando-a antes se a página ainda não a tiver.
+
+    :param driver: Instância do WebDriver do Selenium.
+    :param funcao: Nome da função da biblioteca (ex: 'requisitar', 'lote', 'baixarBase64').
+    :param args: Argumentos repassados para a função.
+    :return: Valor retornado pela função JS, ou {'error': ..., 'status': ...} se ela falhar (status HTTP ou None).
+    """
+    with trava_navegador(driver):
+        for _ in range(2):
+            resultado = driver.execute_async_script(_CHAMADA_JS, VERSAO_JS, funcao, list(args))
+            if isinstance(resultado, dict) and resultado.get('__dijurAusente'):
+                instalar_biblioteca_js(driver)
+                continue
+            return resultado
+    raise Exception("Não foi possível instalar a biblioteca JS do DijurLib na página.")
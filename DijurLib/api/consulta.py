@@ -1,6 +1,12 @@
-from typing import List
-from selenium.webdriver.remote.webdriver import WebDriver
-from .base import get_api_navegador, post_api_navegador
+from __future__ import annotations
+
+from typing import Dict, List
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from selenium.webdriver.remote.webdriver import WebDriver
+from .base import get_api_navegador, post_api_navegador, batch_api_navegador
+from ..utils.cache_processos import cache_processos
 from ..utils.schema.schemaConsulta import ResponseProcessos, ProcessosResponse, Processo, DataProcessos, DataRespostaSimples, ProcessoRespostaSimples, RespostaProcessosSimples
 
 def extrair_quantidade(data: DataProcessos) -> int:
@@ -12,37 +18,27 @@ def extrair_quantidade(data: DataProcessos) -> int:
     """
     return data.get("quantidadeRegistro") or data.get("quantidadeOcorrencia") or 0
 
-def get_processos_npj(driver: WebDriver, npj: str) -> ProcessosResponse:
-    """
-    Obtém os processos de um determinado Número de Processo Judicial (NPJ) a partir da API da Dijur.
-
-    :param driver: Instância do WebDriver do Selenium.
-    :param npj: Número de Processo Judicial a ser consultado.
-    :return: Dicionário com informações dos processos.
-    :raises ValueError: Se npj não for uma string válida.
-    :raises Exception: Se houver erro ao acessar a API.
-    """
+def _normalizar_npj(npj: str) -> str:
     if not isinstance(npj, str):
         try:
             npj = str(npj)
         except ValueError:
             raise ValueError("npj deve ser uma string válida.")
         
-    npj = npj.replace("/", "").replace("-", "")
+    return npj.replace("/", "").replace("-", "")
 
+def _url_processos_npj(npj: str) -> str:
     npj1, npj2 = npj[:11], npj[11:]
 
     if npj2 == "":
         npj2 = "-1"   
 
-    api_url = f"https://juridico.intranet.bb.com.br/paj/resources/app/v1/processo/consulta/{npj1}/{npj2}/0"
-    
-    # Obter dados da API via GET
-    response: ResponseProcessos = get_api_navegador(driver, api_url)
-    
+    return f"https://juridico.intranet.bb.com.br/paj/resources/app/v1/processo/consulta/{npj1}/{npj2}/0"
+
+def _montar_processos(response: ResponseProcessos) -> ProcessosResponse:
     # Verificar status da resposta
     if response.get("statusCode") != 200:
-        raise Exception(f"Erro na resposta da API: {response.get('status')}")
+        raise Exception(f"Erro na resposta da API: {response.get('status', response.get('error'))}")
     
     data: DataProcessos = response.get("data", {})
     
@@ -58,6 +54,71 @@ def get_processos_npj(driver: WebDriver, npj: str) -> ProcessosResponse:
     
     return resultado
 
+def get_processos_npj(driver: WebDriver, npj: str) -> ProcessosResponse:
+    """
+    Obtém os processos de um determinado Número de Processo Judicial (NPJ) a partir da API da Dijur.
+
+    :param driver: Instância do WebDriver do Selenium.
+    :param npj: Número de Processo Judicial a ser consultado.
+    :return: Dicionário com informações dos processos.
+    :raises ValueError: Se npj não for uma string válida.
+    :raises Exception: Se houver erro ao acessar a API.
+    """
+    npj = _normalizar_npj(npj)
+
+    cache = cache_processos()
+    if cache is not None:
+        resultado = cache.obter('npj', npj)
+        if resultado is not None:
+            return resultado
+
+    api_url = _url_processos_npj(npj)
+    
+    # Obter dados da API via GET
+    response: ResponseProcessos = get_api_navegador(driver, api_url)
+    
+    resultado = _montar_processos(response)
+    
+    if cache is not None:
+        cache.guardar('npj', npj, resultado)
+    
+    return resultado
+
+def get_processos_npj_lote(driver: WebDriver, lista_npj: List[str], concurrency: int = 4) -> Dict[str, ProcessosResponse]:
+    """
+    Obtém os processos de vários NPJs de uma vez: NPJs repetidos são consultados uma única vez
+    e os que não estão no cache vão ao PAJ em um único lote.
+
+    :param driver: Instância do WebDriver do Selenium.
+    :param lista_npj: NPJs a consultar, em qualquer formato aceito por get_processos_npj.
+    :param concurrency: Número máximo de requisições simultâneas (padrão: 4).
+    :return: Dicionário {npj normalizado (só dígitos): resposta ou {'error': ...}}.
+    :raises ValueError: Se algum npj não for uma string válida.
+    """
+    resultados: Dict[str, ProcessosResponse] = {}
+    cache = cache_processos()
+    faltantes = []
+    for npj in dict.fromkeys(_normalizar_npj(npj) for npj in lista_npj):
+        resultado = cache.obter('npj', npj) if cache is not None else None
+        if resultado is not None:
+            resultados[npj] = resultado
+        else:
+            faltantes.append(npj)
+
+    if faltantes:
+        respostas = batch_api_navegador(driver, [('GET', _url_processos_npj(npj), None) for npj in faltantes], concurrency=concurrency)
+        for npj, response in zip(faltantes, respostas):
+            try:
+                resultado = _montar_processos(response)
+            except Exception as e:
+                resultados[npj] = {'error': str(e)}
+                continue
+            resultados[npj] = resultado
+            if cache is not None:
+                cache.guardar('npj', npj, resultado)
+
+    return resultados
+
 def get_processo_numerodoprocesso(driver: WebDriver, numerodoprocesso: str) -> ProcessosResponse:
     """
     Obtém os dados de um processo a partir do seu Número do Processo.
@@ -71,6 +132,12 @@ def get_processo_numerodoprocesso(driver: WebDriver, numerodoprocesso: str) -> P
     if not isinstance(numerodoprocesso, str):
         raise ValueError("numerodoprocesso deve ser uma string.")
     
+    cache = cache_processos()
+    if cache is not None:
+        resultado = cache.obter('numero_processo', numerodoprocesso)
+        if resultado is not None:
+            return resultado
+    
     payload = {
         "numeroProcesso": numerodoprocesso,
         "unidadeJuridica": 0,
@@ -100,6 +167,10 @@ def get_processo_numerodoprocesso(driver: WebDriver, numerodoprocesso: str) -> P
         "listaOcorrencia": lista_ocorrencia
     }
     
+    # Consulta sem resultado não é guardada: o processo pode ser cadastrado depois
+    if cache is not None and lista_ocorrencia:
+        cache.guardar('numero_processo', numerodoprocesso, resultado)
+    
     return resultado
 
 def get_processo_numerodoprocesso_simples(driver: WebDriver, numerodoprocesso: str) -> RespostaProcessosSimples:
@@ -2,6 +2,7 @@ from typing import Optional
 from urllib.parse import urlencode
 import requests
 
+from .retry import politica_retry
 from ..utils.schema.schemaPje import PJEResponse
 
 
@@ -52,15 +53,15 @@ def get_processo_pje(
 
     # Constrói a URL com os parâmetros filtrados
     url_final = f"{base_url}?{urlencode(parametros_filtrados)}"
-    tentativas = 0
-    while True:
-        try:
-            response = requests.get(url_final).json()
-            break
-        except Exception as e:
-            tentativas += 1
-            if tentativas >= 3:
-                raise Exception(f'Erro ao acessar a API do PJE: {e}') from e
+    def tentativa():
+        resposta = requests.get(url_final, timeout=60)
+        if not resposta.ok:
+            return {'error': f'Erro na resposta: {resposta.reason}', 'status': resposta.status_code}
+        return resposta.json()
+
+    response = politica_retry().executar(url_final, tentativa, 3, 'requisição ao PJE')
+    if 'error' in response:
+        raise Exception(f"Erro ao acessar a API do PJE: {response['error']}")
 
     if response is None:
         return None
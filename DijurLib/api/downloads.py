@@ -0,0 +1,227 @@
+from __future__ import annotations
+
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from selenium.webdriver.remote.webdriver import WebDriver
+from typing import List, Tuple
+import hashlib
+import json
+import os
+import threading
+import time
+
+from .base import baixar_documento_stream, EXTENSOES_DOCUMENTO
+from .transporte import SessaoPAJ
+from ..utils.armazem import armazem_padrao
+from ..utils.schema.schemaDocumentos import DocumentoBaixado, RelatorioDownloads
+
+# Intervalo mínimo, em segundos, entre duas gravações do manifesto durante os downloads
+INTERVALO_MANIFESTO = 5.0
+
+def _sha256_arquivo(caminho: str, tamanho_bloco: int = 1024 * 1024) -> str:
+    sha256 = hashlib.sha256()
+    with open(caminho, 'rb') as f:
+        for bloco in iter(lambda: f.read(tamanho_bloco), b''):
+            sha256.update(bloco)
+    return sha256.hexdigest()
+
+def carregar_manifesto(caminho_manifesto: str) -> dict:
+    """
+    Lê o manifesto de downloads já concluídos.
+
+    :param caminho_manifesto: Caminho do arquivo JSON do manifesto.
+    :return: Dicionário {id_documento: DocumentoBaixado}. Vazio se o arquivo ainda não existir.
+    """
+    if not caminho_manifesto or not os.path.exists(caminho_manifesto):
+        return {}
+    with open(caminho_manifesto, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+def _salvar_manifesto(caminho_manifesto: str, manifesto: dict):
+    # Grava em arquivo temporário e troca, para não corromper o manifesto se o processo cair no meio
+    caminho_temporario = caminho_manifesto + '.tmp'
+    with open(caminho_temporario, 'w', encoding='utf-8') as f:
+        json.dump(manifesto, f, ensure_ascii=False, indent=2)
+    os.replace(caminho_temporario, caminho_manifesto)
+
+def ja_baixado(registro: DocumentoBaixado, verificar_hash: bool = False) -> bool:
+    """
+    Confere se o arquivo registrado no manifesto continua no disco com o mesmo tamanho (e hash, se pedido).
+
+    :param registro: Registro do documento no manifesto.
+    :param verificar_hash: Se True, também recalcula o SHA-256 do arquivo.
+    :return: True se o download pode ser pulado.
+    """
+    caminho = registro.get('caminho')
+    if not caminho or not os.path.exists(caminho):
+        return False
+    if os.path.getsize(caminho) != registro.get('tamanho'):
+        return False
+    if verificar_hash and _sha256_arquivo(caminho) != registro.get('sha256'):
+        return False
+    return True
+
+def arquivo_no_disco(caminho_destino: str, tamanho: int, sha256: str = None) -> str:
+    """
+    Procura no disco um documento já baixado para o caminho de destino, mesmo sem registro no manifesto.
+    Se o destino não tiver extensão, procura também com as extensões que baixar_documento_stream acrescenta.
+
+    Só arquivos com o tamanho esperado (e o hash, se informado) contam: um arquivo gravado pela metade
+    (ex: por baixar_documento ou por uma execução interrompida) é baixado de novo.
+
+    :param caminho_destino: Caminho de destino informado no job.
+    :param tamanho: Tamanho esperado do documento, em bytes.
+    :param sha256: (Opcional) SHA-256 esperado do documento.
+    :return: Caminho do arquivo encontrado, ou None.
+    """
+    candidatos = [caminho_destino]
+    if not os.path.splitext(caminho_destino)[1]:
+        candidatos += [caminho_destino + extensao for extensao in EXTENSOES_DOCUMENTO.values()]
+    for caminho in candidatos:
+        if not os.path.isfile(caminho) or os.path.getsize(caminho) != tamanho:
+            continue
+        if sha256 and _sha256_arquivo(caminho) != sha256:
+            continue
+        return caminho
+    return None
+
+def _tamanho_esperado(driver, id_documento: str, registro: DocumentoBaixado = None) -> tuple:
+    """
+    Tamanho e hash esperados de um documento: do manifesto, do armazém padrão ou, com uma SessaoPAJ,
+    do Content-Length de uma requisição HEAD.
+
+    :return: Tupla (tamanho, sha256); (None, None) se não houver como saber.
+    """
+    if registro and registro.get('tamanho'):
+        return registro['tamanho'], registro.get('sha256')
+    armazem = armazem_padrao()
+    guardado = armazem.buscar(id_documento) if armazem is not None else None
+    if guardado is not None:
+        return guardado['tamanho'], guardado['sha256']
+    if isinstance(driver, SessaoPAJ):
+        url = f'https://juridico.intranet.bb.com.br/paj/resources/app/v0/processo/documento/download/{id_documento}'
+        try:
+            response = driver.enviar('HEAD', url)
+        except Exception as e:
+            print(f"Não foi possível consultar o tamanho do documento {id_documento}: {e}")
+            return None, None
+        if response is not None:
+            with response:
+                if response.ok and response.headers.get('Content-Length', '').isdigit():
+                    return int(response.headers['Content-Length']), None
+    return None, None
+
+def _registro_do_disco(id_documento: str, caminho: str) -> DocumentoBaixado:
+    # Monta o registro do manifesto de um arquivo encontrado no disco; o Content-Type vem da extensão
+    extensao = os.path.splitext(caminho)[1].lower()
+    content_type = next((tipo for tipo, ext in EXTENSOES_DOCUMENTO.items() if ext == extensao), '')
+    return {
+        'id_documento': id_documento,
+        'caminho': caminho,
+        'tamanho': os.path.getsize(caminho),
+        'contentType': content_type,
+        'sha256': _sha256_arquivo(caminho),
+    }
+
+def baixar_documentos(driver: WebDriver, jobs: List[Tuple[str, str]], max_workers: int = 4, caminho_manifesto: str = None, verificar_hash: bool = False) -> RelatorioDownloads:
+    """
+    Baixa vários documentos em paralelo, pulando os que já estão no disco e registrando o progresso em um manifesto.
+    Um documento é pulado se o manifesto o registra, ou se já existe no caminho de destino um arquivo com o tamanho
+    esperado (ver arquivo_no_disco). O manifesto é gravado a cada INTERVALO_MANIFESTO segundos e ao final.
+    Se a execução for interrompida, basta chamar de novo com o mesmo manifesto para continuar de onde parou.
+
+    Com uma SessaoPAJ os downloads rodam de fato em paralelo; com um único WebDriver os comandos ao navegador
+    são serializados (ver trava_navegador), então prefira uma SessaoPAJ para exportações grandes.
+
+    :param driver: Instância do WebDriver do Selenium ou SessaoPAJ.
+    :param jobs: Lista de pares (id_documento, caminho_destino).
+    :param max_workers: Número máximo de downloads simultâneos (padrão: 4).
+    :param caminho_manifesto: (Opcional) Caminho do arquivo JSON com os downloads concluídos.
+    :param verificar_hash: Se True, confere o SHA-256 dos arquivos já baixados antes de pulá-los.
+    :return: Relatório com os documentos baixados, pulados, falhas e a vazão obtida.
+    """
+    manifesto = carregar_manifesto(caminho_manifesto)
+    trava_manifesto = threading.Lock()
+
+    relatorio: RelatorioDownloads = {
+        'baixados': [],
+        'pulados': [],
+        'falhas': [],
+        'bytes': 0,
+        'segundos': 0.0,
+        'mb_por_segundo': 0.0,
+    }
+
+    pendentes = []
+    vistos = set()
+    novos_registros = False
+    for id_documento, caminho_destino in jobs:
+        id_documento = str(id_documento)
+        # O mesmo documento pedido duas vezes é baixado uma vez só
+        if id_documento in vistos:
+            continue
+        vistos.add(id_documento)
+        registro = manifesto.get(id_documento)
+        if registro and ja_baixado(registro, verificar_hash):
+            relatorio['pulados'].append(id_documento)
+            continue
+        tamanho, sha256 = _tamanho_esperado(driver, id_documento, registro)
+        caminho_existente = arquivo_no_disco(caminho_destino, tamanho, sha256) if tamanho is not None else None
+        if caminho_existente is not None:
+            # Arquivo baixado em uma execução sem manifesto (ou com outro manifesto): entra no manifesto atual
+            relatorio['pulados'].append(id_documento)
+            if caminho_manifesto:
+                manifesto[id_documento] = _registro_do_disco(id_documento, caminho_existente)
+                novos_registros = True
+            continue
+        pendentes.append((id_documento, caminho_destino))
+
+    if novos_registros:
+        _salvar_manifesto(caminho_manifesto, manifesto)
+
+    print(f"{len(pendentes)} documentos para baixar, {len(relatorio['pulados'])} já estavam no disco.")
+
+    inicio = time.monotonic()
+    # Regravar o manifesto inteiro a cada documento custaria O(n²) em exportações grandes
+    ultima_gravacao = inicio
+    alterado = False
+    try:
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futuros = {
+                executor.submit(baixar_documento_stream, driver, id_documento, caminho_destino): id_documento
+                for id_documento, caminho_destino in pendentes
+            }
+            for futuro in as_completed(futuros):
+                id_documento = futuros[futuro]
+                try:
+                    documento = futuro.result()
+                except Exception as e:
+                    print(f"Falha ao baixar o documento {id_documento}: {e}")
+                    relatorio['falhas'].append({'id_documento': id_documento, 'erro': str(e)})
+                    continue
+
+                relatorio['baixados'].append(documento)
+                relatorio['bytes'] += documento['tamanho']
+                if caminho_manifesto:
+                    with trava_manifesto:
+                        manifesto[id_documento] = documento
+                        alterado = True
+                        if time.monotonic() - ultima_gravacao >= INTERVALO_MANIFESTO:
+                            _salvar_manifesto(caminho_manifesto, manifesto)
+                            ultima_gravacao = time.monotonic()
+                            alterado = False
+    finally:
+        # Grava o que faltou mesmo se a execução for interrompida
+        if caminho_manifesto and alterado:
+            with trava_manifesto:
+                _salvar_manifesto(caminho_manifesto, manifesto)
+
+    relatorio['segundos'] = time.monotonic() - inicio
+    if relatorio['segundos'] > 0:
+        relatorio['mb_por_segundo'] = relatorio['bytes'] / (1024 * 1024) / relatorio['segundos']
+
+    print(f"Downloads concluídos: {len(relatorio['baixados'])} baixados, {len(relatorio['pulados'])} pulados, "
+          f"{len(relatorio['falhas'])} falhas, {relatorio['mb_por_segundo']:.2f} MB/s.")
+    return relatorio
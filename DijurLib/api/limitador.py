@@ -0,0 +1,243 @@
+import re
+import threading
+import time
+
+# Famílias de endpoints do PAJ: (regex da URL, requisições por segundo, rajada, concorrência inicial, concorrência máxima).
+# A primeira família que casar com a URL é usada; URLs que não casam com nenhuma ficam na família 'outros'.
+# 'cadastro' vem antes de 'publicacao' porque a validação da matéria (/publicacao/validacao/) é uma etapa do cadastro.
+# Com rajada 1, duas chamadas do cadastro (inclusive de etapas seguidas) ficam sempre a pelo menos 1/taxa segundos.
+FAMILIAS_PADRAO = {
+    'cadastro': (r'/processo/cadastro/|/incluirPessoa/|/processo/dependencia/|/processo/classeCNJ/|/v0/advogado'
+                 r'|/publicacao/validacao/|/distribuicao/processo/funcionario', 2.0, 1, 1, 2),
+    'publicacao': (r'/publicacao/', 5.0, 10, 4, 16),
+    'processo/consulta': (r'/processo/consulta|/pesquisa-avancada/', 10.0, 20, 4, 16),
+    'andamento': (r'/processo/andamento/', 5.0, 10, 4, 8),
+    'outros': (r'', 10.0, 20, 4, 16),
+}
+
+class BaldeFichas:
+    """
+    Token bucket: libera até `taxa` requisições por segundo, com rajadas de até `rajada` requisições.
+
+    As fichas podem ser reservadas antes de chegarem (saldo negativo): quem reserva espera só pela primeira
+    e se compromete a espaçar as demais em 1/taxa segundos; os próximos a adquirir esperam o saldo voltar.
+    """
+
+    def __init__(self, taxa: float, rajada: int):
+        self.taxa = taxa
+        self.rajada = rajada
+        self._fichas = float(rajada)
+        self._ultimo = time.monotonic()
+        self._trava = threading.Lock()
+
+    def adquirir(self, quantidade: int = 1):
+        """
+        Reserva `quantidade` fichas e bloqueia até a primeira delas estar disponível.
+
+        :param quantidade: Número de requisições que serão feitas (padrão: 1). Com mais de uma, quem chama
+                           deve espaçar as requisições em pelo menos 1/taxa segundos (ver Limitador.intervalo_lote).
+        """
+        with self._trava:
+            agora = time.monotonic()
+            self._fichas = min(self.rajada, self._fichas + (agora - self._ultimo) * self.taxa)
+            self._ultimo = agora
+            espera = max(0.0, (1 - self._fichas) / self.taxa)
+            self._fichas -= quantidade
+        if espera > 0:
+            time.sleep(espera)
+
+class ControleConcorrencia:
+    """
+    Controle AIMD do número de requisições simultâneas de uma família.
+
+    Enquanto as respostas chegam sem erro e sem lentidão, o limite sobe devagar (+1 a cada `limite`
+    respostas). Um 429, um 5xx ou uma resposta muito mais lenta que a média corta o limite pela metade.
+    """
+
+    def __init__(self, inicial: int = 4, minimo: int = 1, maximo: int = 16, fator_lentidao: float = 3.0):
+        """
+        :param inicial: Limite inicial de requisições simultâneas.
+        :param minimo: Limite mínimo.
+        :param maximo: Limite máximo.
+        :param fator_lentidao: Uma resposta mais lenta que fator_lentidao vezes a média conta como sobrecarga.
+        """
+        self.limite = float(inicial)
+        self.minimo = minimo
+        self.maximo = maximo
+        self.fator_lentidao = fator_lentidao
+        self.latencia_media = None
+        self.em_voo = 0
+        self._condicao = threading.Condition()
+
+    def adquirir(self):
+        """
+        Bloqueia até o número de requisições em andamento ficar abaixo do limite.
+        """
+        with self._condicao:
+            while self.em_voo >= int(self.limite):
+                self._condicao.wait()
+            self.em_voo += 1
+
+    def liberar(self, latencia: float, sobrecarga: bool = False):
+        """
+        Registra o fim de uma requisição e ajusta o limite.
+
+        :param latencia: Duração da requisição, em segundos.
+        :param sobrecarga: True se o servidor respondeu 429/5xx.
+        """
+        with self._condicao:
+            self.em_voo -= 1
+            self._ajustar(latencia, sobrecarga)
+
+    def registrar(self, latencia: float, sobrecarga: bool = False, quantidade: int = 1):
+        """
+        Ajusta o limite com respostas que não passaram por adquirir (ex: requisições de um lote feito na página).
+
+        :param latencia: Latência média das respostas, em segundos.
+        :param sobrecarga: True se alguma delas foi 429/5xx.
+        :param quantidade: Número de respostas. Um lote com sobrecarga corta o limite uma vez só, não uma vez por resposta.
+        """
+        with self._condicao:
+            self._ajustar(latencia, sobrecarga, quantidade)
+
+    def _ajustar(self, latencia: float, sobrecarga: bool, quantidade: int = 1):
+        lenta = self.latencia_media is not None and latencia > self.fator_lentidao * self.latencia_media
+        if sobrecarga or lenta:
+            self.limite = max(self.minimo, self.limite / 2)
+        else:
+            for _ in range(quantidade):
+                self.limite = min(self.maximo, self.limite + 1 / self.limite)
+        # Média móvel exponencial; respostas lentas entram na média para o controle não travar em lentidão permanente
+        self.latencia_media = latencia if self.latencia_media is None else 0.8 * self.latencia_media + 0.2 * latencia
+        self._condicao.notify_all()
+
+class Familia:
+    def __init__(self, nome: str, regex: str, taxa: float, rajada: int, concorrencia: int, concorrencia_maxima: int):
+        self.nome = nome
+        self.regex = re.compile(regex)
+        self.balde = BaldeFichas(taxa, rajada)
+        self.controle = ControleConcorrencia(concorrencia, 1, concorrencia_maxima)
+
+def _sobrecarga(resultado) -> bool:
+    if not isinstance(resultado, dict):
+        return False
+    status = resultado.get('status')
+    return isinstance(status, int) and (status == 429 or status >= 500)
+
+class Limitador:
+    """
+    Limitador de requisições ao PAJ por família de endpoints, usado por todas as funções de api/base.py.
+
+    Cada família tem um token bucket (taxa máxima) e um controle AIMD de concorrência.
+
+    Exemplo de uso:
+        >>> configurar_limitador(Limitador({**FAMILIAS_PADRAO, 'publicacao': (r'/publicacao/', 2.0, 4, 2, 4)}))
+    """
+
+    def __init__(self, familias: dict = None):
+        """
+        :param familias: (Opcional) Dicionário {nome: (regex, taxa, rajada, concorrência inicial, concorrência máxima)}.
+                         Se None, usa FAMILIAS_PADRAO.
+        """
+        self.familias = [Familia(nome, *config) for nome, config in (familias or FAMILIAS_PADRAO).items()]
+
+    def familia(self, api_url: str) -> Familia:
+        """
+        Retorna a família da URL.
+        """
+        for familia in self.familias:
+            if familia.regex.search(api_url):
+                return familia
+        return self.familias[-1]
+
+    def executar(self, api_url: str, funcao):
+        """
+        Executa uma requisição respeitando a taxa e a concorrência da família da URL.
+
+        :param api_url: URL da requisição.
+        :param funcao: Função sem argumentos que faz a requisição.
+        :return: O que funcao retornar.
+        """
+        familia = self.familia(api_url)
+        familia.balde.adquirir()
+        familia.controle.adquirir()
+        inicio = time.monotonic()
+        resultado = None
+        try:
+            resultado = funcao()
+            return resultado
+        finally:
+            familia.controle.liberar(time.monotonic() - inicio, _sobrecarga(resultado))
+
+    def concorrencia_lote(self, urls: list, maximo: int) -> int:
+        """
+        Concorrência a usar em um lote, limitada pela família mais restrita do lote.
+        Não consome fichas: elas são reservadas por adquirir_lote antes de cada envio.
+
+        :param urls: URLs das requisições do lote.
+        :param maximo: Concorrência pedida pelo chamador.
+        """
+        limite = maximo
+        for familia in {self.familia(api_url) for api_url in urls}:
+            limite = min(limite, int(familia.controle.limite))
+        return max(1, limite)
+
+    def intervalo_lote(self, urls: list) -> float:
+        """
+        Intervalo mínimo, em segundos, entre o início de duas requisições de um lote executado dentro da página:
+        1/taxa da família mais lenta do lote.
+
+        :param urls: URLs das requisições do lote.
+        """
+        return max((1 / self.familia(api_url).balde.taxa for api_url in set(urls)), default=0.0)
+
+    def adquirir_lote(self, urls: list):
+        """
+        Reserva as fichas de um lote antes de enviá-lo, uma por requisição, na família de cada URL.
+        Espera só pela primeira ficha de cada família; o lote deve espaçar as requisições por intervalo_lote.
+
+        :param urls: URLs das requisições do lote.
+        """
+        quantidades = {}
+        for api_url in urls:
+            familia = self.familia(api_url)
+            quantidades[familia] = quantidades.get(familia, 0) + 1
+        for familia, quantidade in quantidades.items():
+            familia.balde.adquirir(quantidade)
+
+    def registrar_lote(self, urls: list, resultados: list, segundos: float, concorrencia: int):
+        """
+        Registra o resultado de um lote no controle de concorrência de cada família.
+
+        :param urls: URLs das requisições do lote.
+        :param resultados: Resultados na mesma ordem.
+        :param segundos: Duração total do lote.
+        :param concorrencia: Concorrência usada no lote.
+        """
+        # Dentro da página não se mede cada fetch; usa a latência média estimada do lote
+        latencia = segundos * concorrencia / max(1, len(urls))
+        # Um ajuste por família: várias respostas 5xx no mesmo lote são um único sinal de sobrecarga
+        por_familia = {}
+        for api_url, resultado in zip(urls, resultados):
+            familia = self.familia(api_url)
+            quantidade, sobrecarga = por_familia.get(familia, (0, False))
+            por_familia[familia] = (quantidade + 1, sobrecarga or _sobrecarga(resultado))
+        for familia, (quantidade, sobrecarga) in por_familia.items():
+            familia.controle.registrar(latencia, sobrecarga, quantidade)
+
+_limitador = Limitador()
+
+def configurar_limitador(limitador: Limitador):
+    """
+    Substitui o limitador usado pelas funções de DijurLib.api.
+
+    :param limitador: Instância de Limitador.
+    """
+    global _limitador
+    _limitador = limitador
+
+def limitador() -> Limitador:
+    """
+    Retorna o limitador em uso.
+    """
+    return _limitador
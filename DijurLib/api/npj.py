@@ -1,6 +1,13 @@
-from .base import get_api_navegador, post_api_navegador
+from __future__ import annotations
+
+from .base import get_api_navegador, post_api_navegador, batch_api_navegador
 from .consulta import get_processos_npj
-from selenium.webdriver.remote.webdriver import WebDriver
+from .cache import invalidar_cache_ao_final
+from ..utils.cache_processos import cache_processos
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from selenium.webdriver.remote.webdriver import WebDriver
 
 # Schemas
 from typing import List
@@ -19,6 +26,7 @@ def get_api_data(driver: WebDriver, api_url: str) -> dict:
         raise Exception(f"Erro na resposta da API {api_url}: {response.get('status')}")
     return response.get("data", {})
 
+@invalidar_cache_ao_final('idNpj')
 def reativar_npj(driver, justificativa: str, npj: str, idNpj: int) -> dict:
     """
     Reativa um processo a partir do seu Número do id de um NPJ.
@@ -113,10 +121,26 @@ def npj_cabecalho(driver: WebDriver, idNpj: int) -> CabecalhoResponse:
     
     return resultado
 
+def get_api_data_lote(driver: WebDriver, api_urls: List[str]) -> List[dict]:
+    """
+    Versão em lote de get_api_data: busca várias URLs em uma única chamada ao navegador.
+    """
+    respostas = batch_api_navegador(driver, [('GET', api_url, None) for api_url in api_urls])
+
+    dados = []
+    for api_url, response in zip(api_urls, respostas):
+        if "error" in response:
+            raise Exception(f"Erro ao acessar a API {api_url}: {response['error']}")
+        if response.get("statusCode") != 200:
+            raise Exception(f"Erro na resposta da API {api_url}: {response.get('status')}")
+        dados.append(response.get("data", {}))
+    return dados
+
 def npj_dados_resumo(driver: WebDriver, idNpj: int) -> dict:
-    # URL da API de resumo
+    # URLs das APIs de resumo e de histórico (para obter o 'cadastramento')
     api_resumo = f"https://juridico.intranet.bb.com.br/paj/resources/app/v1/portal/dados/processo/resumo/processo/consultar/{idNpj}"
-    data_resumo = get_api_data(driver, api_resumo)
+    api_historico = f"https://juridico.intranet.bb.com.br/paj/resources/app/v1/portal/processo/classificacao/listarClassificacoesProcesso/ativas/{idNpj}"
+    data_resumo, data_historico = get_api_data_lote(driver, [api_resumo, api_historico])
     
     # Extração dos dados do resumo
     tipo = data_resumo.get("textoTipoProcesso", "")
@@ -124,9 +148,7 @@ def npj_dados_resumo(driver: WebDriver, idNpj: int) -> dict:
     acao = data_resumo.get("textoTipoAcao", "")
     data_ajuizamento = data_resumo.get("dataProtocoloJuridico", "")
     
-    # Chamada à API de histórico para obter o 'cadastramento'
-    api_historico = f"https://juridico.intranet.bb.com.br/paj/resources/app/v1/portal/processo/classificacao/listarClassificacoesProcesso/ativas/{idNpj}"
-    data_historico = get_api_data(driver, api_historico)
+    # Extração do 'cadastramento' a partir do histórico
     cadastramento = ""
     for item in data_historico:
         if item.get('nomeTipoClassificacaoProcesso') == 'CADASTRO':
@@ -142,6 +164,12 @@ def npj_dados_resumo(driver: WebDriver, idNpj: int) -> dict:
     }
 
 def npj_dados_numeros(driver: WebDriver, idNpj: int) -> dict:
+    cache = cache_processos()
+    if cache is not None:
+        resultado = cache.obter('numeros', idNpj)
+        if resultado is not None:
+            return resultado
+
     api_numeros = f"https://juridico.intranet.bb.com.br/paj/resources/app/v1/processo/cadastro/numero/{idNpj}"
     data_numeros = get_api_data(driver, api_numeros)
     
@@ -164,12 +192,16 @@ def npj_dados_numeros(driver: WebDriver, idNpj: int) -> dict:
     else:
         outros = []
     
-    return {
+    resultado = {
         "uf": uf,
         "cnj": cnj,
         "publicacao": publicacao,
         "outros": outros
     }
+    if cache is not None:
+        cache.guardar('numeros', idNpj, resultado)
+    
+    return resultado
 
 def npj_dados_processo(driver: WebDriver, idNpj: int, apis: List[str] = None) -> DadosProcessoResponse:
     """
@@ -237,20 +269,39 @@ def npj_pessoas_processo(driver: WebDriver, idNpj: int) -> PartesResponse:
     api_neutros = f"https://juridico.intranet.bb.com.br/paj/resources/app/v1/pessoas/listarPessoasProcesso/{idNpj}/3/0"
     api_advogado = f"https://juridico.intranet.bb.com.br/paj/resources/app/v1/processo/distribuicao/{idNpj}"
     
-    # Função auxiliar para obter dados da API
-    def get_data(api_url):
-        response = get_api_navegador(driver, api_url)
-        if response["statusCode"] != 200:
-            raise Exception(f"Erro ao acessar {api_url}: {response['status']}")
-        return response["data"]
+    # Somente os campos usados abaixo cruzam o WebDriver
+    campos_partes = ["statusCode", "status"] + [
+        f"data.listaOcorrencia[*].{campo}" for campo in (
+            "nomeRazaoSocialClientePessoa",
+            "codigoMercadoInternoPessoa",
+            "numeroCpfCadastroNacPessoasJuridicasPessoa",
+            "codigoTipoRelacionamentoPessoaBanco",
+        )
+    ]
+    campos_advogado = ["statusCode", "status"] + [
+        f"data.{campo}" for campo in (
+            "nomeRazaoSocialAdvogado",
+            "codigoPrefixoTributarioAdvogado",
+            "nomeDependenciaTributarioAdvogado",
+            "numeroCpfCadastroNacPessoasJuridicas",
+            "siglaUnidadeFederacaoUnidadeOrganizacional",
+        )
+    ]
+    
+    # Coletando dados das partes e do advogado em um único lote
+    apis = [api_ativos, api_passivos, api_neutros, api_advogado]
+    respostas = batch_api_navegador(driver, [
+        ('GET', api_ativos, None, campos_partes),
+        ('GET', api_passivos, None, campos_partes),
+        ('GET', api_neutros, None, campos_partes),
+        ('GET', api_advogado, None, campos_advogado),
+    ])
     
-    # Coletando dados das partes
-    ativos_data = get_data(api_ativos)
-    passivos_data = get_data(api_passivos)
-    neutros_data = get_data(api_neutros)
+    for api_url, response in zip(apis, respostas):
+        if response.get("statusCode") != 200:
+            raise Exception(f"Erro ao acessar {api_url}: {response.get('status', response.get('error'))}")
     
-    # Coletando dados do advogado
-    advogado_data = get_data(api_advogado)
+    ativos_data, passivos_data, neutros_data, advogado_data = [response["data"] for response in respostas]
     
     # Função para extrair os campos desejados das partes
     def extrair_campos_partes(lista_ocorrencia):
@@ -363,7 +414,7 @@ def npj_documentos(driver: WebDriver, idNpj: int) -> List[Documentos]:
             raise ValueError("idNpj deve ser um inteiro.")
         
     api_documentos = f"https://juridico.intranet.bb.com.br/paj/resources/app/v1/processo/documentoV2?codigoTipoDocumentoPesquisa=0&numeroPosicaoPesquisa=0&numeroProcesso={idNpj}&tipoDocumento=0"
-    documentos = get_api_navegador(driver, api_documentos)
+    documentos = get_api_navegador(driver, api_documentos, texto_bruto=True)
     if documentos.get("statusCode") != 200:
         raise Exception(f"Erro na resposta da API: {documentos.get('status')}")
     documentos_data = documentos["data"]
@@ -1,14 +1,23 @@
-from selenium.webdriver.remote.webdriver import WebDriver
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from selenium.webdriver.remote.webdriver import WebDriver
 from typing import List
 from DijurLib.utils.schema.schemaNpjAndamentos import Andamento, Documentos
-from .base import post_api_navegador, get_api_navegador
+from .base import post_api_navegador, get_api_navegador, batch_api_navegador
+from .cache import invalidar_cache_ao_final
+from ..utils.compacto import AndamentoCompacto
 
-def listar_andamentos(driver: WebDriver, id_npj: int) -> List:
+def listar_andamentos(driver: WebDriver, id_npj: int, compacto: bool = False) -> List:
     """
     Lista os andamentos de um processo a partir do seu ID NPJ.
     
     :param driver: Instância do WebDriver do Selenium.
     :param id_npj: ID do NPJ do processo a ser consultado.
+    :param compacto: Se True, retorna AndamentoCompacto (só os campos do schema, em __slots__, textos repetidos internados)
+                     em vez do dicionário completo do servidor. Use para_dict() quando precisar do dicionário.
     :return: Lista de andamentos no formato da classe Andamento.
     :raises Exception: Se houver erro na resposta da API.
     """
@@ -35,7 +44,10 @@ def listar_andamentos(driver: WebDriver, id_npj: int) -> List:
         if andamentos == []:
             break
         # Extrair a lista de andamentos no formato da classe Andamento
-        resultado: List = [item["andamento"] for item in andamentos]
+        if compacto:
+            resultado: List = [AndamentoCompacto(item["andamento"]) for item in andamentos]
+        else:
+            resultado: List = [item["andamento"] for item in andamentos]
         lista_andamentos.extend(resultado)
 
         if data.get("quantidadeRegistros") % 50 == 0:
@@ -72,7 +84,7 @@ def listar_documentos(driver, idNpj):
     posicao_lista = 1
     while True:
         url = f"https://juridico.intranet.bb.com.br/paj/resources/app/v1/processo/documentoV2?codigoTipoDocumentoPesquisa=0&numeroPosicaoPesquisa={posicao_lista}&numeroProcesso={idNpj}&tipoDocumento=0"
-        response = get_api_navegador(driver, api_url=url)
+        response = get_api_navegador(driver, api_url=url, texto_bruto=True)
 
         if response.get("statusCode") != 200 and response.get("status") != "OK":
             raise Exception(f"Erro na resposta da API: {response.get('status')}")
@@ -113,6 +125,32 @@ def listar_documento_vinculado(driver: WebDriver, idNpj: int, num_admt: int) ->
 
     return documentos
 
+def listar_documentos_vinculados(driver: WebDriver, idNpj: int, lista_num_admt: List[int]) -> dict:
+    """
+    Lista os documentos vinculados a vários andamentos de um processo em uma única chamada ao navegador.
+
+    :param driver: Instância do WebDriver do Selenium.
+    :param idNpj: ID do NPJ do processo.
+    :param lista_num_admt: Lista com os números dos andamentos do processo.
+    :return: Dicionário {numero do andamento: lista de documentos vinculados}.
+    :raises Exception: Se houver erro na resposta da API.
+    """
+    urls = [
+        f"https://juridico.intranet.bb.com.br/paj/resources/app/v1/processo/andamento/documentos/{idNpj}/{num_admt}/0"
+        for num_admt in lista_num_admt
+    ]
+
+    respostas = batch_api_navegador(driver, [('GET', url, None) for url in urls])
+
+    documentos = {}
+    for num_admt, response in zip(lista_num_admt, respostas):
+        if response.get("statusCode") != 200 and response.get("status") != "OK":
+            raise Exception(f"Erro na resposta da API: {response.get('status', response.get('error'))}")
+        documentos[num_admt] = response.get("data", {}).get("listaDocumento", [])
+
+    return documentos
+
+@invalidar_cache_ao_final('idNpj')
 def incluir_andamentos(driver: WebDriver, cd_admt: int, cd_solicitante:str, dt_admt: str, ind_doc_dig:bool, idNpj:str, descricao:str, cd_tipo_doc: int, nome_arquivo: str, rawbytes: str) -> dict:
     """
     Realiza a inclusão de um andamento no processo.
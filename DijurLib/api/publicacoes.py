@@ -1,167 +1,298 @@
-from .base import post_api_navegador
-from .consulta import get_processos_npj
-from datetime import datetime, timedelta
-from selenium.webdriver.remote.webdriver import WebDriver
+from __future__ import annotations
 
-from typing import List, Optional
+from .base import post_api_navegador, batch_api_navegador
+from .consulta import get_processos_npj, get_processos_npj_lote
+from .retry import erro_retentavel
+from datetime import date, datetime, timedelta
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from selenium.webdriver.remote.webdriver import WebDriver
+    from ..utils.indice_publicacoes import IndicePublicacoes
+
+from typing import Dict, Iterable, Iterator, List, Optional, Union
 import json
 import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
 
-from ..utils.schema.schemaPublicacoes import PublicacoesResponse
+from ..utils.cache_processos import cache_processos
+from ..utils.compacto import compactar_publicacoes
+from ..utils.schema.schemaPublicacoes import PublicacoesResponse, ConsultaPublicacoesResponse, DecisaoPublicacao, ResultadoTratamento, SerieTratamento
 
-def listar_publicacoes(driver: WebDriver, tipo: str, tribunal: str) -> PublicacoesResponse:
-    """
-    Lista as publicações judiciais de um determinado tipo e tribunal nos últimos 5 dias.
-    Faz paginação para coletar todas as publicações disponíveis.
-    
-    :param driver: Instância do WebDriver do Selenium.
-    :param tipo: Tipo de publicação (ex: 'todas', 'tratadas', 'pendente', 'emtratamento').
-    :param tribunal: Tribunal de origem (ex: 'stf', 'stj', 'tst').
-    :return: Dicionário com a lista de publicações filtradas, conforme o schema PublicacoesResponse.
-    """
-    dict_tipo = {
-        'todas': '0',
-        'tratada': '2',
-        'pendente': '3',
-        'emtratamento': '12',
-        'complementada': '4',
-        'descartada': '13',
-        'descartadabbnaoparte': '6',
-        'enviadaparacadastramento': '11',
-        'env.paracadastroincidental': '14',
-        'cadastroempresaexterna': '16',
-        'cadastroempresaexternaincidental': '15',
-        'npjnaocadastrado': '17',
-    }
-    
-    dict_tribunal = {
-        'stf': 22,
-        'stj': 23,
-        'tst': 24,
-    }
-    
-    # Dicionários invertidos para mapear código para string
-    dict_tipo_reversed = {int(v): k for k, v in dict_tipo.items()}
-    dict_tribunal_reversed = {v: k for k, v in dict_tribunal.items()}
-    
-    tipo_codigo = dict_tipo.get(tipo.lower().strip())
+# Campos da publicação mantidos pelas funções de listagem (ver schema Publicacao)
+CAMPOS_PUBLICACAO = [
+    "codigoEstadoPublicacaoJudicial",
+    "codigoExternoProcessoInteresse",
+    "codigoIdentificadorJornalOficial",
+    "codigoUnidadeOrganizacionalRecebedor",
+    "dataDivulgacao",
+    "dataPublicacao",
+    "dataRecebimento",
+    "nomeEmpresaResponsavel",
+    "numeroProcesso",
+    "numeroProcessoCompleto",
+    "numeroProcessoPrincipal",
+    "numeroPublicacaoJudicial",
+    "numeroVariacao",
+    "textoPublicacaoJudicial",
+]
+
+# Projeção aplicada no navegador: descarta o resto do objeto antes de cruzar o WebDriver
+CAMPOS_LISTAGEM = ["statusCode", "status", "data.totalDePublicacoes"] + [
+    f"data.listaPublicacao[*].{campo}" for campo in CAMPOS_PUBLICACAO
+]
+
+# Códigos do estado da publicação no PAJ
+DICT_TIPO = {
+    'todas': '0',
+    'tratada': '2',
+    'pendente': '3',
+    'emtratamento': '12',
+    'complementada': '4',
+    'descartada': '13',
+    'descartadabbnaoparte': '6',
+    'enviadaparacadastramento': '11',
+    'env.paracadastroincidental': '14',
+    'cadastroempresaexterna': '16',
+    'cadastroempresaexternaincidental': '15',
+    'npjnaocadastrado': '17',
+}
+
+# Códigos do jornal oficial de cada tribunal
+DICT_TRIBUNAL = {
+    'stf': 22,
+    'stj': 23,
+    'tst': 24,
+}
+
+# Dicionários invertidos para mapear código para string
+DICT_TIPO_REVERSED = {int(v): k for k, v in DICT_TIPO.items()}
+DICT_TRIBUNAL_REVERSED = {v: k for k, v in DICT_TRIBUNAL.items()}
+
+# Quantidade de publicações por página da listagem
+TAMANHO_PAGINA = 50
+
+# Máximo de páginas pedidas em cada chamada a batch_api_navegador nas consultas grandes,
+# para que a memória e o tempo de cada leva não cresçam com a janela consultada
+PAGINAS_POR_LEVA = 200
+
+URL_LISTAR_TRIBUNAL = "https://juridico.intranet.bb.com.br/paj/resources/app/v1/publicacao/listar/unidadeJuridicaEJornalOficial"
+URL_LISTAR_NUMERO = "https://juridico.intranet.bb.com.br/paj/resources/app/v1/publicacao/listar/numeroCNJ"
+
+URL_DETALHAR = "https://juridico.intranet.bb.com.br/paj/resources/app/v1/publicacao/detalhar"
+URL_EM_TRATAMENTO = "https://juridico.intranet.bb.com.br/paj/resources/app/v1/publicacao/tratamento/emTratamento"
+URL_DESCARTAR = "https://juridico.intranet.bb.com.br/paj/resources/app/v1/publicacao/tratamento/descartar"
+URL_DESCARTAR_BB_NAO_PARTE = "https://juridico.intranet.bb.com.br/paj/resources/app/v1/publicacao/tratamento/descartar/banco/nao/parte"
+URL_INDICAR = "https://juridico.intranet.bb.com.br/paj/resources/app/v1/publicacao/tratamento/identificar"
+
+# Código do estado 'emtratamento', conferido antes da transição final
+ESTADO_EM_TRATAMENTO = int(DICT_TIPO['emtratamento'])
+
+# Quando o detalhamento não informa o estado, volta-se à espera fixa de antes da consulta do estado, em segundos
+ESPERA_SEM_ESTADO = 1.0
+
+def _codigo_tipo(tipo: str) -> str:
+    tipo_codigo = DICT_TIPO.get(tipo.lower().strip())
     if tipo_codigo is None:
         raise ValueError(f"Tipo inválido: {tipo}")
-    
-    tribunal_codigo = dict_tribunal.get(tribunal.lower().strip())
+    return tipo_codigo
+
+def _codigo_tribunal(tribunal: Union[str, int]) -> int:
+    # Códigos numéricos de jornal oficial fora de DICT_TRIBUNAL são repassados como estão
+    if isinstance(tribunal, int):
+        return tribunal
+    tribunal_codigo = DICT_TRIBUNAL.get(tribunal.lower().strip())
     if tribunal_codigo is None:
         raise ValueError(f"Tribunal inválido: {tribunal}")
-    
-    data_atual = datetime.now()
-    data_5_dias_atras = data_atual - timedelta(days=5)
-    
-    url = "https://juridico.intranet.bb.com.br/paj/resources/app/v1/publicacao/listar/unidadeJuridicaEJornalOficial"
-    
-    lista_publicacao_processada: List[dict] = []
-    posicao_inicial = 1  # primeiro registro
-    total_publicacoes = None  # será definido na primeira chamada
-    
-    while True:
-        payload = {
-            "codigoUnidadeOrganizacionalRecebedor": 18908,
-            "dataFimDivulgacao": data_atual.strftime('%d.%m.%Y'),
-            "dataFimPublicacao": "",
-            "dataInicioDivulgacao": data_5_dias_atras.strftime('%d.%m.%Y'),
-            "dataInicioPublicacao": "",
-            "numeroOrdem": 8,
-            "codigoEstadoPublicacaoJudicial": tipo_codigo,
-            "tipo": 6,
-            "codigoIdentificadorJornalOficial": tribunal_codigo,
-            "numeroPosicaoLista": posicao_inicial
-        }
-    
-        response = post_api_navegador(driver, url, payload)
-    
-        if response["statusCode"] != 200:
-            raise Exception(f"Erro ao listar publicações: {response.get('status', 'Erro desconhecido')}")
-    
-        data = response.get("data", {})
-        if total_publicacoes is None:
-            total_publicacoes = data.get("totalDePublicacoes", 0)
-        
-        lista_publicacao_raw = data.get("listaPublicacao", [])
-    
-        for pub in lista_publicacao_raw:
-            try:
-                publicacao = {
-                    "codigoEstadoPublicacaoJudicial": dict_tipo_reversed.get(pub.get("codigoEstadoPublicacaoJudicial"), "Desconhecido"),
-                    "codigoExternoProcessoInteresse": pub.get("codigoExternoProcessoInteresse", ""),
-                    "codigoIdentificadorJornalOficial": dict_tribunal_reversed.get(pub.get("codigoIdentificadorJornalOficial"), "Desconhecido"),
-                    "codigoUnidadeOrganizacionalRecebedor": pub.get("codigoUnidadeOrganizacionalRecebedor", 0),
-                    "dataDivulgacao": pub.get("dataDivulgacao", ""),
-                    "dataPublicacao": pub.get("dataPublicacao", ""),
-                    "dataRecebimento": pub.get("dataRecebimento", ""),
-                    "nomeEmpresaResponsavel": pub.get("nomeEmpresaResponsavel", ""),
-                    "numeroProcesso": pub.get("numeroProcesso", 0),
-                    "numeroProcessoCompleto": pub.get("numeroProcessoCompleto", ""),
-                    "numeroProcessoPrincipal": pub.get("numeroProcessoPrincipal", 0),
-                    "numeroPublicacaoJudicial": pub.get("numeroPublicacaoJudicial", 0),
-                    "numeroVariacao": pub.get("numeroVariacao", 0),
-                    "textoPublicacaoJudicial": pub.get("textoPublicacaoJudicial", ""),
-                }
-                lista_publicacao_processada.append(publicacao)
-            except Exception as e:
-                # Logar o erro e continuar com as demais publicações
-                print(f"Erro ao processar publicação: {e}")
-                continue
-        
-        # Se já pegamos todas as publicações, sai do loop
-        if posicao_inicial + 50 > total_publicacoes:
-            break
-        
-        posicao_inicial += 50
-    
-    resultado: PublicacoesResponse = {
-        "quantidadeRegistro": len(lista_publicacao_processada),
-        "listaPublicacao": lista_publicacao_processada
-    }
-    
-    return resultado
+    return tribunal_codigo
 
+# Formatos de data aceitos nos parâmetros e encontrados nas respostas do PAJ
+_FORMATOS_DATA = ('%d.%m.%Y', '%d/%m/%Y', '%Y-%m-%d')
 
-def listar_publicacoes_por_numero(driver: WebDriver, tipo: str, numero: str) -> PublicacoesResponse:
+def ler_data(valor) -> Optional[date]:
     """
-    Lista as publicações judiciais de um determinado tipo e tribunal nos últimos 5 dias.
+    Converte uma data do PAJ ('dd.mm.aaaa', 'dd/mm/aaaa', 'aaaa-mm-dd', com ou sem hora) para date.
 
-    :param driver: Instância do WebDriver do Selenium.
-    :param tipo: Tipo de publicação a ser consultada (ex: 'todas', 'tratadas', 'pendente', 'emtratamento').
-    :param tribunal: Tribunal de origem da publicação (ex: 'stf', 'stj', 'tst').
-    :return: Dicionário com a lista de publicações filtradas, conforme o schema PublicacoesResponse.
+    :param valor: Texto, date ou datetime.
+    :return: A data, ou None se o valor estiver vazio ou em formato desconhecido.
     """
+    if isinstance(valor, datetime):
+        return valor.date()
+    if isinstance(valor, date):
+        return valor
+    if not valor or not isinstance(valor, str):
+        return None
+    texto = valor.strip()[:10]
+    for formato in _FORMATOS_DATA:
+        try:
+            return datetime.strptime(texto, formato).date()
+        except ValueError:
+            continue
+    return None
 
-    dict_tipo = {
-        'todas': '0',
-        'tratada': '2',
-        'pendente': '3',
-        'emtratamento': '12',
-        'complementada': '4',
-        'descartada': '13',
-        'descartadabbnaoparte': '6',
-        'enviadaparacadastramento': '11',
-        'env.paracadastroincidental': '14',
-        'cadastroempresaexterna': '16',
-        'cadastroempresaexternaincidental': '15',
-        'npjnaocadastrado': '17',
+def _formatar_data(valor, padrao: date) -> str:
+    if valor is None:
+        valor = padrao
+    data = ler_data(valor)
+    if data is None:
+        raise ValueError(f"Data inválida: {valor}")
+    return data.strftime('%d.%m.%Y')
+
+def _payload_tribunal(tipo_codigo: str, tribunal_codigo: int, data_inicio: str, data_fim: str, posicao: int) -> dict:
+    return {
+        "codigoUnidadeOrganizacionalRecebedor": 18908,
+        "dataFimDivulgacao": data_fim,
+        "dataFimPublicacao": "",
+        "dataInicioDivulgacao": data_inicio,
+        "dataInicioPublicacao": "",
+        "numeroOrdem": 8,
+        "codigoEstadoPublicacaoJudicial": tipo_codigo,
+        "tipo": 6,
+        "codigoIdentificadorJornalOficial": tribunal_codigo,
+        "numeroPosicaoLista": posicao
     }
 
-    dict_tribunal = {
-        'stf': 22,
-        'stj': 23,
-        'tst': 24,
+def _processar_publicacao(pub: dict) -> dict:
+    """
+    Converte uma publicação da listagem do PAJ para o formato do schema Publicacao.
+    """
+    return {
+        "codigoEstadoPublicacaoJudicial": DICT_TIPO_REVERSED.get(pub.get("codigoEstadoPublicacaoJudicial"), "Desconhecido"),
+        "codigoExternoProcessoInteresse": pub.get("codigoExternoProcessoInteresse", ""),
+        "codigoIdentificadorJornalOficial": DICT_TRIBUNAL_REVERSED.get(pub.get("codigoIdentificadorJornalOficial"), "Desconhecido"),
+        "codigoUnidadeOrganizacionalRecebedor": pub.get("codigoUnidadeOrganizacionalRecebedor", 0),
+        "dataDivulgacao": pub.get("dataDivulgacao", ""),
+        "dataPublicacao": pub.get("dataPublicacao", ""),
+        "dataRecebimento": pub.get("dataRecebimento", ""),
+        "nomeEmpresaResponsavel": pub.get("nomeEmpresaResponsavel", ""),
+        "numeroProcesso": pub.get("numeroProcesso", 0),
+        "numeroProcessoCompleto": pub.get("numeroProcessoCompleto", ""),
+        "numeroProcessoPrincipal": pub.get("numeroProcessoPrincipal", 0),
+        "numeroPublicacaoJudicial": pub.get("numeroPublicacaoJudicial", 0),
+        "numeroVariacao": pub.get("numeroVariacao", 0),
+        "textoPublicacaoJudicial": pub.get("textoPublicacaoJudicial", ""),
     }
 
-    # Dicionários invertidos para mapear código para string
-    dict_tipo_reversed = {int(v): k for k, v in dict_tipo.items()}
-    dict_tribunal_reversed = {v: k for k, v in dict_tribunal.items()}
+def _processar_lista(lista_publicacao_raw: list) -> List[dict]:
+    lista_publicacao_processada: List[dict] = []
+    for pub in lista_publicacao_raw:
+        try:
+            lista_publicacao_processada.append(_processar_publicacao(pub))
+        except Exception as e:
+            # Logar o erro e continuar com as demais publicações
+            print(f"Erro ao processar publicação: {e}")
+            continue
+    return lista_publicacao_processada
 
-    tipo_codigo = dict_tipo.get(tipo.lower().strip())
-    if tipo_codigo is None:
-        raise ValueError(f"Tipo inválido: {tipo}")
+def _verificar_listagem(response: dict) -> dict:
+    if response is None or response.get("statusCode") != 200:
+        status = response.get('status', response.get('error', 'Erro desconhecido')) if response else 'Nenhuma resposta recebida'
+        raise Exception(f"Erro ao listar publicações: {status}")
+    return response.get("data", {})
+
+def _iterar_listagem(driver: WebDriver, url: str, payload_pagina, concurrency: int, prefetch: bool,
+                     indice: IndicePublicacoes = None) -> Iterator[dict]:
+    """
+    Percorre uma listagem paginada do PAJ, devolvendo uma publicação de cada vez.
+
+    A primeira página informa o total; as demais são buscadas em grupos de `concurrency` páginas por lote.
+    Com prefetch, o próximo grupo é buscado em segundo plano enquanto o atual é consumido, então no máximo
+    dois grupos de páginas ficam em memória, seja qual for o tamanho da listagem.
+
+    :param payload_pagina: Função que recebe a posição inicial da página e retorna o payload.
+    :param indice: (Opcional) Índice em que cada página é gravada antes de ser devolvida.
+    """
+    data = _verificar_listagem(post_api_navegador(driver, url, payload_pagina(1), campos=CAMPOS_LISTAGEM))
+    total_publicacoes = data.get("totalDePublicacoes", 0)
+    primeira_pagina = data.get("listaPublicacao", [])
+    del data
+
+    posicoes = list(range(1 + TAMANHO_PAGINA, total_publicacoes + 1, TAMANHO_PAGINA))
+    grupos = [posicoes[i:i + concurrency] for i in range(0, len(posicoes), concurrency)]
+
+    def buscar(grupo: list) -> list:
+        respostas = batch_api_navegador(
+            driver,
+            [('POST', url, payload_pagina(posicao)) for posicao in grupo],
+            concurrency=concurrency,
+            campos=CAMPOS_LISTAGEM
+        )
+        return [_verificar_listagem(resposta).get("listaPublicacao", []) for resposta in respostas]
+
+    # Se a lista andou durante a leitura, a mesma publicação pode aparecer em duas páginas;
+    # só os números já vistos ficam guardados
+    vistas = set()
+
+    def publicacoes(paginas: list) -> Iterator[dict]:
+        for pagina in paginas:
+            pagina = _processar_lista(pagina)
+            if indice is not None:
+                indice.guardar(pagina)
+            for publicacao in pagina:
+                if publicacao["numeroPublicacaoJudicial"] in vistas:
+                    continue
+                vistas.add(publicacao["numeroPublicacaoJudicial"])
+                yield publicacao
+
+    if not prefetch:
+        yield from publicacoes([primeira_pagina])
+        for grupo in grupos:
+            yield from publicacoes(buscar(grupo))
+        return
+
+    # O navegador é protegido por trava_navegador, então a thread de prefetch pode usá-lo junto com o consumidor
+    executor = ThreadPoolExecutor(max_workers=1)
+    futuro = executor.submit(buscar, grupos[0]) if grupos else None
+    try:
+        yield from publicacoes([primeira_pagina])
+        for numero_grupo in range(len(grupos)):
+            paginas = futuro.result()
+            futuro = executor.submit(buscar, grupos[numero_grupo + 1]) if numero_grupo + 1 < len(grupos) else None
+            yield from publicacoes(paginas)
+    finally:
+        # O consumidor pode parar no meio: descarta o grupo que ainda não começou
+        if futuro is not None:
+            futuro.cancel()
+        executor.shutdown(wait=True)
+
+def iter_publicacoes(driver: WebDriver, tipo: str, tribunal: str, concurrency: int = 4, prefetch: bool = True,
+                     data_inicio: Union[str, date, None] = None, data_fim: Union[str, date, None] = None,
+                     indice: IndicePublicacoes = None) -> Iterator[dict]:
+    """
+    Percorre as publicações judiciais de um determinado tipo e tribunal (por padrão, dos últimos 5 dias), página por página.
+    As publicações são devolvidas assim que a página chega, então o tratamento pode começar pela primeira página
+    e a memória usada não cresce com o tamanho do acervo.
+
+    :param driver: Instância do WebDriver do Selenium.
+    :param tipo: Tipo de publicação (ex: 'todas', 'tratadas', 'pendente', 'emtratamento').
+    :param tribunal: Tribunal de origem (ex: 'stf', 'stj', 'tst').
+    :param concurrency: Número máximo de páginas buscadas ao mesmo tempo (padrão: 4).
+    :param prefetch: Se True, busca as próximas páginas em segundo plano enquanto as atuais são consumidas (padrão: True).
+    :param data_inicio: (Opcional) Início da janela de divulgação ('dd/mm/aaaa', 'dd.mm.aaaa' ou date). Padrão: 5 dias atrás.
+    :param data_fim: (Opcional) Fim da janela de divulgação. Padrão: hoje.
+    :param indice: (Opcional) IndicePublicacoes em que as publicações recebidas são gravadas.
+    :return: Gerador de publicações no formato do schema Publicacao.
+
+    :example:
+        >>> for publicacao in iter_publicacoes(driver, 'pendente', 'stj'):
+        ...     print(publicacao['numeroPublicacaoJudicial'])
+    """
+    tipo_codigo = _codigo_tipo(tipo)
+    tribunal_codigo = _codigo_tribunal(tribunal)
+    
+    data_atual = datetime.now()
+    data_fim = _formatar_data(data_fim, data_atual)
+    data_inicio = _formatar_data(data_inicio, data_atual - timedelta(days=5))
+    
+    def payload_pagina(posicao: int) -> dict:
+        return _payload_tribunal(tipo_codigo, tribunal_codigo, data_inicio, data_fim, posicao)
+    
+    return _iterar_listagem(driver, URL_LISTAR_TRIBUNAL, payload_pagina, concurrency, prefetch, indice)
+
+def _iterar_por_numero(driver: WebDriver, tipo: str, numero: str, dias: int, concurrency: int, prefetch: bool,
+                       indice: IndicePublicacoes = None) -> Iterator[dict]:
+    tipo_codigo = _codigo_tipo(tipo)
 
     if not isinstance(numero, str):
         try:
@@ -170,53 +301,57 @@ def listar_publicacoes_por_numero(driver: WebDriver, tipo: str, numero: str) ->
             raise ValueError("numero deve ser uma string.")
 
     data_atual = datetime.now()
-    data_5_dias_atras = data_atual - timedelta(days=5)
+    data_inicio = data_atual - timedelta(days=dias)
 
-    payload = {
-        "codigoUnidadeOrganizacionalRecebedor": 1,
-        "dataFimDivulgacao": data_atual.strftime('%d.%m.%Y'),
-        "dataFimPublicacao": "",
-        "dataInicioDivulgacao": data_5_dias_atras.strftime('%d.%m.%Y'),
-        "dataInicioPublicacao": "",
-        "numeroOrdem": 8,
-        "codigoEstadoPublicacaoJudicial": tipo_codigo,
-        "tipo": 5,
-        "numeroCNJ": numero
-    }
+    def payload_pagina(posicao: int) -> dict:
+        return {
+            "codigoUnidadeOrganizacionalRecebedor": 1,
+            "dataFimDivulgacao": data_atual.strftime('%d.%m.%Y'),
+            "dataFimPublicacao": "",
+            "dataInicioDivulgacao": data_inicio.strftime('%d.%m.%Y'),
+            "dataInicioPublicacao": "",
+            "numeroOrdem": 8,
+            "codigoEstadoPublicacaoJudicial": tipo_codigo,
+            "tipo": 5,
+            "numeroCNJ": numero,
+            "numeroPosicaoLista": posicao
+        }
 
-    url = "https://juridico.intranet.bb.com.br/paj/resources/app/v1/publicacao/listar/numeroCNJ"
-    response = post_api_navegador(driver, url, payload)
+    return _iterar_listagem(driver, URL_LISTAR_NUMERO, payload_pagina, concurrency, prefetch, indice)
 
-    if response["statusCode"] != 200:
-        raise Exception(f"Erro ao listar publicações: {response.get('status', 'Erro desconhecido')}")
+def iter_publicacoes_por_numero(driver: WebDriver, tipo: str, numero: str, concurrency: int = 4, prefetch: bool = True,
+                                indice: IndicePublicacoes = None) -> Iterator[dict]:
+    """
+    Percorre as publicações judiciais de um processo (número CNJ) nos últimos 5 dias, página por página.
 
-    lista_publicacao_raw = response.get("data", {}).get("listaPublicacao", [])
+    :param driver: Instância do WebDriver do Selenium.
+    :param tipo: Tipo de publicação a ser consultada (ex: 'todas', 'tratadas', 'pendente', 'emtratamento').
+    :param numero: Número CNJ do processo.
+    :param concurrency: Número máximo de páginas buscadas ao mesmo tempo (padrão: 4).
+    :param prefetch: Se True, busca as próximas páginas em segundo plano enquanto as atuais são consumidas (padrão: True).
+    :param indice: (Opcional) IndicePublicacoes em que as publicações recebidas são gravadas.
+    :return: Gerador de publicações no formato do schema Publicacao.
+    """
+    return _iterar_por_numero(driver, tipo, numero, 5, concurrency, prefetch, indice)
 
-    lista_publicacao_processada: List[dict] = []
+def iter_publicacoes_historico(driver: WebDriver, tipo: str, numero: str, concurrency: int = 4, prefetch: bool = True,
+                               indice: IndicePublicacoes = None) -> Iterator[dict]:
+    """
+    Percorre as publicações judiciais de um processo (número CNJ) nos últimos 11 meses, página por página.
 
-    for pub in lista_publicacao_raw:
-        try:
-            publicacao = {
-                "codigoEstadoPublicacaoJudicial": dict_tipo_reversed.get(pub.get("codigoEstadoPublicacaoJudicial"), "Desconhecido"),
-                "codigoExternoProcessoInteresse": pub.get("codigoExternoProcessoInteresse", ""),
-                "codigoIdentificadorJornalOficial": dict_tribunal_reversed.get(pub.get("codigoIdentificadorJornalOficial"), "Desconhecido"),
-                "codigoUnidadeOrganizacionalRecebedor": pub.get("codigoUnidadeOrganizacionalRecebedor", 0),
-                "dataDivulgacao": pub.get("dataDivulgacao", ""),
-                "dataPublicacao": pub.get("dataPublicacao", ""),
-                "dataRecebimento": pub.get("dataRecebimento", ""),
-                "nomeEmpresaResponsavel": pub.get("nomeEmpresaResponsavel", ""),
-                "numeroProcesso": pub.get("numeroProcesso", 0),
-                "numeroProcessoCompleto": pub.get("numeroProcessoCompleto", ""),
-                "numeroProcessoPrincipal": pub.get("numeroProcessoPrincipal", 0),
-                "numeroPublicacaoJudicial": pub.get("numeroPublicacaoJudicial", 0),
-                "numeroVariacao": pub.get("numeroVariacao", 0),
-                "textoPublicacaoJudicial": pub.get("textoPublicacaoJudicial", ""),
-            }
-            lista_publicacao_processada.append(publicacao)
-        except Exception as e:
-            # Logar o erro e continuar com as demais publicações
-            print(f"Erro ao processar publicação: {e}")
-            continue
+    :param driver: Instância do WebDriver do Selenium.
+    :param tipo: Tipo de publicação a ser consultada (ex: 'todas', 'tratadas', 'pendente', 'emtratamento').
+    :param numero: Número CNJ do processo.
+    :param concurrency: Número máximo de páginas buscadas ao mesmo tempo (padrão: 4).
+    :param prefetch: Se True, busca as próximas páginas em segundo plano enquanto as atuais são consumidas (padrão: True).
+    :param indice: (Opcional) IndicePublicacoes em que as publicações recebidas são gravadas.
+    :return: Gerador de publicações no formato do schema Publicacao.
+    """
+    return _iterar_por_numero(driver, tipo, numero, 330, concurrency, prefetch, indice)
+
+def _montar_resposta(publicacoes: Iterator[dict], compacto: bool = False) -> PublicacoesResponse:
+    # Com compacto, cada publicação vira PublicacaoCompacta assim que sai do gerador; a lista de dicionários nunca existe inteira
+    lista_publicacao_processada: List[dict] = compactar_publicacoes(publicacoes) if compacto else list(publicacoes)
 
     resultado: PublicacoesResponse = {
         "quantidadeRegistro": len(lista_publicacao_processada),
@@ -225,103 +360,177 @@ def listar_publicacoes_por_numero(driver: WebDriver, tipo: str, numero: str) ->
 
     return resultado
 
-def listar_publicacoes_historico(driver: WebDriver, tipo: str, numero: str) -> PublicacoesResponse:
+def listar_publicacoes(driver: WebDriver, tipo: str, tribunal: str, concurrency: int = 4,
+                       data_inicio: Union[str, date, None] = None, data_fim: Union[str, date, None] = None,
+                       indice: IndicePublicacoes = None, compacto: bool = False) -> PublicacoesResponse:
     """
-    Lista as publicações judiciais de um determinado tipo e tribunal nos últimos 5 dias.
+    Lista as publicações judiciais de um determinado tipo e tribunal (por padrão, dos últimos 5 dias).
+    Faz paginação para coletar todas as publicações disponíveis (ver iter_publicacoes).
+    
+    :param driver: Instância do WebDriver do Selenium.
+    :param tipo: Tipo de publicação (ex: 'todas', 'tratadas', 'pendente', 'emtratamento').
+    :param tribunal: Tribunal de origem (ex: 'stf', 'stj', 'tst').
+    :param concurrency: Número máximo de páginas buscadas ao mesmo tempo (padrão: 4).
+    :param data_inicio: (Opcional) Início da janela de divulgação ('dd/mm/aaaa', 'dd.mm.aaaa' ou date). Padrão: 5 dias atrás.
+    :param data_fim: (Opcional) Fim da janela de divulgação. Padrão: hoje.
+    :param indice: (Opcional) IndicePublicacoes em que as publicações recebidas são gravadas.
+    :param compacto: Se True, a lista traz PublicacaoCompacta (__slots__, textos repetidos internados) em vez de dicionários.
+                     Ocupa bem menos memória em listagens grandes; use para_dict() quando precisar do dicionário.
+    :return: Dicionário com a lista de publicações filtradas, conforme o schema PublicacoesResponse.
+    """
+    return _montar_resposta(iter_publicacoes(driver, tipo, tribunal, concurrency, data_inicio=data_inicio, data_fim=data_fim, indice=indice),
+                            compacto)
+
+
+def listar_publicacoes_por_numero(driver: WebDriver, tipo: str, numero: str, indice: IndicePublicacoes = None,
+                                  compacto: bool = False) -> PublicacoesResponse:
+    """
+    Lista as publicações judiciais de um processo (número CNJ) nos últimos 5 dias.
 
     :param driver: Instância do WebDriver do Selenium.
     :param tipo: Tipo de publicação a ser consultada (ex: 'todas', 'tratadas', 'pendente', 'emtratamento').
-    :param tribunal: Tribunal de origem da publicação (ex: 'stf', 'stj', 'tst').
+    :param numero: Número CNJ do processo.
+    :param indice: (Opcional) IndicePublicacoes em que as publicações recebidas são gravadas.
+    :param compacto: Se True, a lista traz PublicacaoCompacta em vez de dicionários (ver listar_publicacoes).
     :return: Dicionário com a lista de publicações filtradas, conforme o schema PublicacoesResponse.
     """
+    return _montar_resposta(iter_publicacoes_por_numero(driver, tipo, numero, indice=indice), compacto)
 
-    dict_tipo = {
-        'todas': '0',
-        'tratada': '2',
-        'pendente': '3',
-        'emtratamento': '12',
-        'complementada': '4',
-        'descartada': '13',
-        'descartadabbnaoparte': '6',
-        'enviadaparacadastramento': '11',
-        'env.paracadastroincidental': '14',
-        'cadastroempresaexterna': '16',
-        'cadastroempresaexternaincidental': '15',
-        'npjnaocadastrado': '17',
-    }
+def listar_publicacoes_historico(driver: WebDriver, tipo: str, numero: str, indice: IndicePublicacoes = None,
+                                 compacto: bool = False) -> PublicacoesResponse:
+    """
+    Lista as publicações judiciais de um processo (número CNJ) nos últimos 11 meses.
 
-    dict_tribunal = {
-        'stf': 22,
-        'stj': 23,
-        'tst': 24,
-    }
+    :param driver: Instância do WebDriver do Selenium.
+    :param tipo: Tipo de publicação a ser consultada (ex: 'todas', 'tratadas', 'pendente', 'emtratamento').
+    :param numero: Número CNJ do processo.
+    :param indice: (Opcional) IndicePublicacoes em que as publicações recebidas são gravadas.
+    :param compacto: Se True, a lista traz PublicacaoCompacta em vez de dicionários (ver listar_publicacoes).
+    :return: Dicionário com a lista de publicações filtradas, conforme o schema PublicacoesResponse.
+    """
+    return _montar_resposta(iter_publicacoes_historico(driver, tipo, numero, indice=indice), compacto)
 
-    # Dicionários invertidos para mapear código para string
-    dict_tipo_reversed = {int(v): k for k, v in dict_tipo.items()}
-    dict_tribunal_reversed = {v: k for k, v in dict_tribunal.items()}
+def _fatias(inicio: date, fim: date, dias_por_fatia: int) -> List[tuple]:
+    fatias = []
+    while inicio <= fim:
+        fim_fatia = min(fim, inicio + timedelta(days=dias_por_fatia - 1))
+        fatias.append((inicio, fim_fatia))
+        inicio = fim_fatia + timedelta(days=1)
+    return fatias
 
-    tipo_codigo = dict_tipo.get(tipo.lower().strip())
-    if tipo_codigo is None:
-        raise ValueError(f"Tipo inválido: {tipo}")
+def consultar_publicacoes(driver: WebDriver, tribunais: Iterable[Union[str, int]], tipos: Iterable[str],
+                          data_inicio: Union[str, date], data_fim: Union[str, date, None] = None,
+                          dias_por_fatia: int = 5, concurrency: int = 8, indice: IndicePublicacoes = None,
+                          paginas_por_leva: int = PAGINAS_POR_LEVA) -> ConsultaPublicacoesResponse:
+    """
+    Consulta as publicações de vários tribunais e estados em uma janela qualquer, de uma vez.
 
-    if not isinstance(numero, str):
-        try:
-            numero = str(numero)
-        except ValueError:
-            raise ValueError("numero deve ser uma string.")
+    A janela é dividida em fatias de `dias_por_fatia` dias, e cada combinação tribunal × estado × fatia vira uma listagem.
+    Primeiro são buscadas as primeiras páginas de todas as listagens; depois, as páginas restantes de todas elas.
+    Cada etapa é enviada em levas de no máximo `paginas_por_leva` páginas por lote.
+    O resultado junta tudo, sem repetir publicações, com o tempo de cada fatia (soma das levas em que ela apareceu).
 
-    data_atual = datetime.now()
-    data_11_meses_atras = data_atual - timedelta(days=330)
+    :param driver: Instância do WebDriver do Selenium.
+    :param tribunais: Tribunais (ex: ['stf', 'stj', 'tst']) ou códigos numéricos de jornal oficial.
+    :param tipos: Estados da publicação (ex: ['pendente', 'emtratamento']).
+    :param data_inicio: Início da janela de divulgação ('dd/mm/aaaa', 'dd.mm.aaaa' ou date).
+    :param data_fim: (Opcional) Fim da janela. Padrão: hoje.
+    :param dias_por_fatia: Tamanho de cada fatia da janela, em dias (padrão: 5).
+    :param concurrency: Número máximo de requisições simultâneas nos lotes (padrão: 8).
+    :param indice: (Opcional) IndicePublicacoes em que as publicações recebidas são gravadas.
+    :param paginas_por_leva: Máximo de páginas por lote (padrão: PAGINAS_POR_LEVA).
+    :return: Dicionário conforme o schema ConsultaPublicacoesResponse.
 
-    payload = {
-        "codigoUnidadeOrganizacionalRecebedor": 1,
-        "dataFimDivulgacao": data_atual.strftime('%d.%m.%Y'),
-        "dataFimPublicacao": "",
-        "dataInicioDivulgacao": data_11_meses_atras.strftime('%d.%m.%Y'),
-        "dataInicioPublicacao": "",
-        "numeroOrdem": 8,
-        "codigoEstadoPublicacaoJudicial": tipo_codigo,
-        "tipo": 5,
-        "numeroCNJ": numero
-    }
+    :example:
+        >>> resultado = consultar_publicacoes(driver, ['stf', 'stj', 'tst'], ['pendente', 'emtratamento'], '01/05/2025', '31/05/2025')
+        >>> for fatia in resultado['fatias']:
+        ...     print(fatia['tribunal'], fatia['tipo'], fatia['dataInicio'], fatia['quantidade'], fatia['segundos'])
+    """
+    if dias_por_fatia < 1:
+        raise ValueError("dias_por_fatia deve ser maior que zero.")
+    if paginas_por_leva < 1:
+        raise ValueError("paginas_por_leva deve ser maior que zero.")
+    inicio = ler_data(data_inicio)
+    if inicio is None:
+        raise ValueError(f"Data inválida: {data_inicio}")
+    fim = ler_data(_formatar_data(data_fim, datetime.now().date()))
+    if inicio > fim:
+        raise ValueError("data_inicio deve ser anterior a data_fim.")
+
+    fatias: List[dict] = []
+    payloads = []
+    for tribunal in tribunais:
+        tribunal_codigo = _codigo_tribunal(tribunal)
+        for tipo in tipos:
+            tipo_codigo = _codigo_tipo(tipo)
+            for inicio_fatia, fim_fatia in _fatias(inicio, fim, dias_por_fatia):
+                fatias.append({
+                    "tribunal": DICT_TRIBUNAL_REVERSED.get(tribunal_codigo, str(tribunal_codigo)),
+                    "tipo": tipo.lower().strip(),
+                    "dataInicio": inicio_fatia.strftime('%d/%m/%Y'),
+                    "dataFim": fim_fatia.strftime('%d/%m/%Y'),
+                    "paginas": 1,
+                    "quantidade": 0,
+                    "segundos": 0.0,
+                })
+                payloads.append(partial(_payload_tribunal, tipo_codigo, tribunal_codigo,
+                                        inicio_fatia.strftime('%d.%m.%Y'), fim_fatia.strftime('%d.%m.%Y')))
+
+    print(f"Consultando {len(fatias)} listagens de publicações...")
+    paginas: List[List[list]] = [[] for _ in fatias]
 
-    url = "https://juridico.intranet.bb.com.br/paj/resources/app/v1/publicacao/listar/numeroCNJ"
-    response = post_api_navegador(driver, url, payload)
+    def buscar_em_levas(pedidos: List[tuple]):
+        # pedidos: (numero_fatia, posicao); devolve (numero_fatia, data) na mesma ordem, leva por leva
+        for inicio_leva in range(0, len(pedidos), paginas_por_leva):
+            leva = pedidos[inicio_leva:inicio_leva + paginas_por_leva]
+            comeco = time.monotonic()
+            respostas = batch_api_navegador(
+                driver,
+                [('POST', URL_LISTAR_TRIBUNAL, payloads[numero_fatia](posicao)) for numero_fatia, posicao in leva],
+                concurrency=concurrency,
+                campos=CAMPOS_LISTAGEM
+            )
+            duracao = time.monotonic() - comeco
+            for numero_fatia in {numero_fatia for numero_fatia, _ in leva}:
+                fatias[numero_fatia]["segundos"] += duracao
+            for (numero_fatia, _), resposta in zip(leva, respostas):
+                yield numero_fatia, _verificar_listagem(resposta)
+            del respostas
 
-    if response["statusCode"] != 200:
-        raise Exception(f"Erro ao listar publicações: {response.get('status', 'Erro desconhecido')}")
+    # Primeira etapa: a primeira página de cada listagem, que também informa o total
+    restantes = []
+    for numero_fatia, data in buscar_em_levas([(numero_fatia, 1) for numero_fatia in range(len(fatias))]):
+        paginas[numero_fatia].append(data.get("listaPublicacao", []))
+        for posicao in range(1 + TAMANHO_PAGINA, data.get("totalDePublicacoes", 0) + 1, TAMANHO_PAGINA):
+            restantes.append((numero_fatia, posicao))
 
-    lista_publicacao_raw = response.get("data", {}).get("listaPublicacao", [])
+    # Segunda etapa: as demais páginas de todas as listagens
+    for numero_fatia, data in buscar_em_levas(restantes):
+        paginas[numero_fatia].append(data.get("listaPublicacao", []))
+        fatias[numero_fatia]["paginas"] += 1
 
+    # Junta na ordem tribunal, estado, fatia e na ordem do servidor dentro de cada listagem
     lista_publicacao_processada: List[dict] = []
+    vistas = set()
+    for fatia, paginas_fatia in zip(fatias, paginas):
+        for pagina in paginas_fatia:
+            for publicacao in _processar_lista(pagina):
+                fatia["quantidade"] += 1
+                if publicacao["numeroPublicacaoJudicial"] in vistas:
+                    continue
+                vistas.add(publicacao["numeroPublicacaoJudicial"])
+                lista_publicacao_processada.append(publicacao)
+        fatia["segundos"] = round(fatia["segundos"], 3)
 
-    for pub in lista_publicacao_raw:
-        try:
-            publicacao = {
-                "codigoEstadoPublicacaoJudicial": dict_tipo_reversed.get(pub.get("codigoEstadoPublicacaoJudicial"), "Desconhecido"),
-                "codigoExternoProcessoInteresse": pub.get("codigoExternoProcessoInteresse", ""),
-                "codigoIdentificadorJornalOficial": dict_tribunal_reversed.get(pub.get("codigoIdentificadorJornalOficial"), "Desconhecido"),
-                "codigoUnidadeOrganizacionalRecebedor": pub.get("codigoUnidadeOrganizacionalRecebedor", 0),
-                "dataDivulgacao": pub.get("dataDivulgacao", ""),
-                "dataPublicacao": pub.get("dataPublicacao", ""),
-                "dataRecebimento": pub.get("dataRecebimento", ""),
-                "nomeEmpresaResponsavel": pub.get("nomeEmpresaResponsavel", ""),
-                "numeroProcesso": pub.get("numeroProcesso", 0),
-                "numeroProcessoCompleto": pub.get("numeroProcessoCompleto", ""),
-                "numeroProcessoPrincipal": pub.get("numeroProcessoPrincipal", 0),
-                "numeroPublicacaoJudicial": pub.get("numeroPublicacaoJudicial", 0),
-                "numeroVariacao": pub.get("numeroVariacao", 0),
-                "textoPublicacaoJudicial": pub.get("textoPublicacaoJudicial", ""),
-            }
-            lista_publicacao_processada.append(publicacao)
-        except Exception as e:
-            # Logar o erro e continuar com as demais publicações
-            print(f"Erro ao processar publicação: {e}")
-            continue
+    if indice is not None:
+        indice.guardar(lista_publicacao_processada)
 
-    resultado: PublicacoesResponse = {
+    print(f"Consulta concluída: {len(lista_publicacao_processada)} publicações em {len(fatias)} listagens.")
+
+    resultado: ConsultaPublicacoesResponse = {
         "quantidadeRegistro": len(lista_publicacao_processada),
-        "listaPublicacao": lista_publicacao_processada
+        "listaPublicacao": lista_publicacao_processada,
+        "fatias": fatias
     }
 
     return resultado
@@ -344,8 +553,7 @@ def detalhar_publicacao(driver: WebDriver, id_publicacao: int):
         "numeroPublicacaoJudicial": id_publicacao,
     }
     
-    url = "https://juridico.intranet.bb.com.br/paj/resources/app/v1/publicacao/detalhar"
-    return post_api_navegador(driver, url, payload)
+    return post_api_navegador(driver, URL_DETALHAR, payload)
 
 def emtratamento_publicacao(driver: WebDriver, id_publicacao: int):
     """
@@ -365,8 +573,51 @@ def emtratamento_publicacao(driver: WebDriver, id_publicacao: int):
         "numeroPublicacaoJudicial": id_publicacao,
     }
     
-    url = "https://juridico.intranet.bb.com.br/paj/resources/app/v1/publicacao/tratamento/emTratamento"
-    return post_api_navegador(driver, url, payload)
+    return post_api_navegador(driver, URL_EM_TRATAMENTO, payload)
+
+def estado_detalhe(resposta) -> Optional[int]:
+    """
+    Extrai o código do estado da resposta de detalhar_publicacao, ou None se ele não vier na resposta.
+    """
+    if not isinstance(resposta, dict) or resposta.get("statusCode") != 200:
+        return None
+    data = resposta.get("data")
+    if isinstance(data, list):
+        data = data[0] if data else None
+    if not isinstance(data, dict):
+        return None
+    codigo = data.get("codigoEstadoPublicacaoJudicial")
+    try:
+        return int(codigo)
+    except (TypeError, ValueError):
+        return None
+
+def aguardar_em_tratamento(driver: WebDriver, id_publicacao: int, tempo_maximo: float = 10) -> bool:
+    """
+    Espera a publicação passar para 'Em Tratamento', consultando o estado com espera crescente
+    (0,2 s, 0,4 s, ... até 2 s) em vez de esperar um tempo fixo.
+
+    :param driver: Instância do WebDriver do Selenium.
+    :param id_publicacao: ID da publicação.
+    :param tempo_maximo: Tempo máximo de espera, em segundos (padrão: 10).
+    :return: True se o estado foi confirmado; False se o tempo acabou ou se a resposta não informa o estado
+             (nesse caso, depois da espera fixa de ESPERA_SEM_ESTADO segundos).
+    """
+    limite = time.monotonic() + tempo_maximo
+    espera = 0.2
+    while True:
+        estado = estado_detalhe(detalhar_publicacao(driver, id_publicacao))
+        if estado == ESTADO_EM_TRATAMENTO:
+            return True
+        if estado is None:
+            print(f"Não foi possível ler o estado da publicação {id_publicacao}; aguardando {ESPERA_SEM_ESTADO} s.")
+            time.sleep(ESPERA_SEM_ESTADO)
+            return False
+        if time.monotonic() + espera > limite:
+            print(f"Publicação {id_publicacao} não passou para 'Em Tratamento' em {tempo_maximo} s.")
+            return False
+        time.sleep(espera)
+        espera = min(espera * 2, 2.0)
 
 def descartar_publicacao(driver: WebDriver, id_publicacao: int, mensagem: str):
     """
@@ -384,15 +635,14 @@ def descartar_publicacao(driver: WebDriver, id_publicacao: int, mensagem: str):
             raise ValueError("id_publicacao deve ser um inteiro.")
     
     emtratamento_publicacao(driver, id_publicacao)
-    time.sleep(1)
+    aguardar_em_tratamento(driver, id_publicacao)
 
     payload = {
         "numeroPublicacaoJudicial": id_publicacao,
         "textoJustificativaDescarte": mensagem,
     }
     
-    url = "https://juridico.intranet.bb.com.br/paj/resources/app/v1/publicacao/tratamento/descartar"
-    return post_api_navegador(driver, url, payload)
+    return post_api_navegador(driver, URL_DESCARTAR, payload)
 
 def descartar_publicacao_bbnaoparte(driver: WebDriver, id_publicacao: int):
     """
@@ -409,14 +659,13 @@ def descartar_publicacao_bbnaoparte(driver: WebDriver, id_publicacao: int):
             raise ValueError("id_publicacao deve ser um inteiro.")
         
     emtratamento_publicacao(driver, id_publicacao)
-    time.sleep(1)
+    aguardar_em_tratamento(driver, id_publicacao)
     
     payload = {
         "numeroPublicacaoJudicial": id_publicacao,
     }
     
-    url = "https://juridico.intranet.bb.com.br/paj/resources/app/v1/publicacao/tratamento/descartar/banco/nao/parte"
-    return post_api_navegador(driver, url, payload)
+    return post_api_navegador(driver, URL_DESCARTAR_BB_NAO_PARTE, payload)
 
 def indicar_publicacao(driver: WebDriver, id_publicacao: int, id_npj: Optional[int] = None, npj: Optional[str] = None):
     """
@@ -466,11 +715,240 @@ def indicar_publicacao(driver: WebDriver, id_publicacao: int, id_npj: Optional[i
     
     print("Colocando publicação em tratamento")
     emtratamento_publicacao(driver, id_publicacao)
-    time.sleep(1)
+    aguardar_em_tratamento(driver, id_publicacao)
     
     print("Indicando publicação")
-    url = "https://juridico.intranet.bb.com.br/paj/resources/app/v1/publicacao/tratamento/identificar"
-    return post_api_navegador(driver, url, payload)
+    return post_api_navegador(driver, URL_INDICAR, payload)
+
+# Ações aceitas por tratar_publicacoes_em_lote
+ACOES_TRATAMENTO = ('indicar', 'descartar', 'bbnaoparte')
+
+# Quantas vezes a transição final de uma publicação pode ser enviada no tratamento em lote.
+# Cada reenvio só acontece depois de conferir que a publicação continua 'Em Tratamento'.
+ENVIOS_TRATAMENTO_FINAL = 3
+
+def _resposta_ok(resposta) -> bool:
+    return isinstance(resposta, dict) and 'error' not in resposta and resposta.get("statusCode", 200) == 200
+
+def _normalizar_decisao(decisao: dict) -> dict:
+    acao = str(decisao.get("acao", "")).lower().strip()
+    if acao not in ACOES_TRATAMENTO:
+        raise ValueError(f"Ação inválida: {decisao.get('acao')}. Use uma de {ACOES_TRATAMENTO}.")
+    try:
+        id_publicacao = int(decisao["numeroPublicacaoJudicial"])
+    except (KeyError, TypeError, ValueError):
+        raise ValueError("numeroPublicacaoJudicial deve ser um inteiro.")
+
+    normalizada = {"numeroPublicacaoJudicial": id_publicacao, "acao": acao}
+    if acao == 'indicar':
+        id_npj, npj = decisao.get("id_npj"), decisao.get("npj")
+        if not id_npj and not npj:
+            raise ValueError(f"Publicação {id_publicacao}: deve ser fornecido o ID ou o NPJ do processo.")
+        if id_npj and npj:
+            raise ValueError(f"Publicação {id_publicacao}: deve ser fornecido apenas o ID ou o NPJ do processo.")
+        if id_npj:
+            try:
+                normalizada["id_npj"] = int(id_npj)
+            except ValueError:
+                raise ValueError("id_npj deve ser um inteiro.")
+        else:
+            npj = str(npj).replace("/", "").replace("-", "")
+            if len(npj) != 14:
+                raise ValueError("npj deve ter 14 caracteres, contendo ano, numero e variação.")
+            normalizada["npj"] = npj
+    elif acao == 'descartar':
+        if not decisao.get("mensagem"):
+            raise ValueError(f"Publicação {id_publicacao}: o descarte exige uma mensagem.")
+        normalizada["mensagem"] = decisao["mensagem"]
+    return normalizada
+
+def _requisicao_final(decisao: dict) -> tuple:
+    id_publicacao = decisao["numeroPublicacaoJudicial"]
+    if decisao["acao"] == 'indicar':
+        return ('POST', URL_INDICAR, {"numeroPublicacaoJudicial": id_publicacao, "numeroProcesso": decisao["id_npj"]})
+    if decisao["acao"] == 'descartar':
+        return ('POST', URL_DESCARTAR, {"numeroPublicacaoJudicial": id_publicacao, "textoJustificativaDescarte": decisao["mensagem"]})
+    return ('POST', URL_DESCARTAR_BB_NAO_PARTE, {"numeroPublicacaoJudicial": id_publicacao})
+
+def tratar_publicacoes_em_lote(driver: WebDriver, decisoes: List[DecisaoPublicacao], concurrency: int = 4,
+                               tempo_maximo: float = 30) -> List[ResultadoTratamento]:
+    """
+    Trata várias publicações de uma vez (indicar NPJ, descartar com mensagem ou descartar como 'BB não parte').
+
+    Em vez de uma publicação por vez com espera fixa de 1 s entre 'Em Tratamento' e a transição final:
+        1. os NPJs são resolvidos de uma vez, sem repetir consultas (get_processos_npj_lote);
+        2. todas as publicações são colocadas em tratamento em um único lote;
+        3. o estado das publicações é consultado em lote, com espera crescente, e cada rodada já envia
+           a transição final das publicações que chegaram em 'Em Tratamento'.
+
+    A transição final não é repetida às cegas pela política de retry: se o envio falhar de forma passageira,
+    o estado da publicação é consultado de novo na rodada seguinte. Se ela já saiu de 'Em Tratamento', o
+    tratamento foi aplicado; se continua 'Em Tratamento', a transição é reenviada (até ENVIOS_TRATAMENTO_FINAL vezes).
+
+    :param driver: Instância do WebDriver do Selenium.
+    :param decisoes: Lista de decisões, conforme o schema DecisaoPublicacao, ex:
+                     [{'numeroPublicacaoJudicial': 1, 'acao': 'indicar', 'npj': '2025/0019564-002'},
+                      {'numeroPublicacaoJudicial': 2, 'acao': 'descartar', 'mensagem': 'Publicação repetida'},
+                      {'numeroPublicacaoJudicial': 3, 'acao': 'bbnaoparte'}]
+    :param concurrency: Número máximo de requisições simultâneas (padrão: 4).
+    :param tempo_maximo: Tempo máximo de espera pelo estado 'Em Tratamento', em segundos (padrão: 30).
+                         Publicações que não forem confirmadas nesse tempo seguem para a transição final mesmo assim,
+                         como nas funções individuais.
+    :return: Lista de resultados na mesma ordem das decisões, conforme o schema ResultadoTratamento.
+    :raises ValueError: Se alguma decisão for inválida ou se houver duas decisões para a mesma publicação.
+    """
+    decisoes = [_normalizar_decisao(decisao) for decisao in decisoes]
+    ids = [decisao["numeroPublicacaoJudicial"] for decisao in decisoes]
+    if len(set(ids)) != len(ids):
+        raise ValueError("Há mais de uma decisão para a mesma publicação.")
+
+    resultados: List[Optional[ResultadoTratamento]] = [None] * len(decisoes)
+
+    def registrar(indice: int, resposta=None, erro: str = None):
+        resultados[indice] = {
+            "numeroPublicacaoJudicial": ids[indice],
+            "acao": decisoes[indice]["acao"],
+            "sucesso": erro is None,
+            "resposta": resposta,
+            "erro": erro,
+        }
+
+    # 1. NPJs das indicações, cada um consultado uma única vez
+    indicacoes = [i for i, decisao in enumerate(decisoes) if "npj" in decisao]
+    if indicacoes:
+        print(f"Resolvendo {len(set(decisoes[i]['npj'] for i in indicacoes))} NPJs...")
+        processos = get_processos_npj_lote(driver, [decisoes[i]["npj"] for i in indicacoes], concurrency)
+        for indice in indicacoes:
+            resposta = processos.get(decisoes[indice]["npj"]) or {}
+            ocorrencias = resposta.get("listaOcorrencia")
+            if not ocorrencias:
+                registrar(indice, erro=resposta.get("error") or f"NPJ {decisoes[indice]['npj']} não encontrado.")
+            else:
+                decisoes[indice]["id_npj"] = ocorrencias[0]["numeroProcesso"]
+
+    # 2. Todas as publicações em tratamento de uma vez
+    ativos = [i for i in range(len(decisoes)) if resultados[i] is None]
+    print(f"Colocando {len(ativos)} publicações em tratamento...")
+    respostas = batch_api_navegador(
+        driver,
+        [('POST', URL_EM_TRATAMENTO, {"numeroPublicacaoJudicial": ids[i]}) for i in ativos],
+        concurrency=concurrency
+    ) if ativos else []
+    inicio_tratamento = time.monotonic()
+    for indice, resposta in zip(ativos, respostas):
+        if not _resposta_ok(resposta):
+            registrar(indice, resposta, f"Erro ao colocar em tratamento: {resposta.get('status', resposta.get('error')) if isinstance(resposta, dict) else resposta}")
+
+    # 3. Consulta os estados e envia a transição final de quem já está em tratamento, rodada a rodada
+    aguardando = [i for i in ativos if resultados[i] is None]
+    envios = [0] * len(decisoes)
+    ultima_resposta = {}
+    limite = time.monotonic() + tempo_maximo
+    espera = 0.2
+    while aguardando:
+        detalhes = batch_api_navegador(
+            driver,
+            [('POST', URL_DETALHAR, {"numeroPublicacaoJudicial": ids[i]}) for i in aguardando],
+            concurrency=concurrency
+        )
+        prontos = []
+        incertos = []
+        for indice, detalhe in zip(aguardando, detalhes):
+            estado = estado_detalhe(detalhe)
+            if not envios[indice]:
+                # Sem o estado na resposta, segue só depois da espera fixa de antes
+                if estado == ESTADO_EM_TRATAMENTO or \
+                        (estado is None and time.monotonic() - inicio_tratamento >= ESPERA_SEM_ESTADO):
+                    prontos.append(indice)
+            elif estado == ESTADO_EM_TRATAMENTO:
+                # O envio anterior falhou e a publicação não mudou: é seguro reenviar
+                prontos.append(indice)
+            elif estado is not None:
+                # O envio anterior falhou na volta, mas o servidor aplicou o tratamento
+                registrar(indice, detalhe)
+            else:
+                incertos.append(indice)
+        if time.monotonic() >= limite:
+            atrasados = [i for i in aguardando if resultados[i] is None and i not in prontos and not envios[i]]
+            if atrasados:
+                print(f"{len(atrasados)} publicações não passaram para 'Em Tratamento' em {tempo_maximo} s; seguindo mesmo assim.")
+                prontos += atrasados
+            for indice in incertos:
+                resposta = ultima_resposta[indice]
+                registrar(indice, resposta, f"Erro no tratamento (não foi possível confirmar o estado): {resposta.get('status', resposta.get('error')) if isinstance(resposta, dict) else resposta}")
+
+        if prontos:
+            print(f"Enviando o tratamento final de {len(prontos)} publicações...")
+            finais = batch_api_navegador(driver, [_requisicao_final(decisoes[i]) for i in prontos],
+                                         concurrency=concurrency, max_attempts=1)
+            for indice, resposta in zip(prontos, finais):
+                envios[indice] += 1
+                if _resposta_ok(resposta):
+                    registrar(indice, resposta)
+                elif envios[indice] < ENVIOS_TRATAMENTO_FINAL and isinstance(resposta, dict) and \
+                        (resposta.get('falhaNavegador') or erro_retentavel(resposta)):
+                    # Pode ter sido aplicada: o estado é conferido na próxima rodada antes de reenviar
+                    ultima_resposta[indice] = resposta
+                else:
+                    registrar(indice, resposta, f"Erro no tratamento: {resposta.get('status', resposta.get('error')) if isinstance(resposta, dict) else resposta}")
+
+        aguardando = [i for i in aguardando if resultados[i] is None]
+        if aguardando:
+            time.sleep(espera)
+            espera = min(espera * 2, 2.0)
+
+    falhas = sum(1 for resultado in resultados if not resultado["sucesso"])
+    print(f"Tratamento em lote concluído: {len(resultados) - falhas} publicações tratadas, {falhas} com erro.")
+    return resultados
+
+URL_TOTALIZADORES = 'https://juridico.intranet.bb.com.br/paj/resources/app/v1/publicacao/totalizadores/listarTotalizadores'
+
+# Ordem em que o PAJ devolve os totalizadores; usada só quando o item não informa o próprio estado
+ORDEM_TOTALIZADORES = ('tratada', 'pendente', 'complementada', 'descartadabbnaoparte', 'descartada', 'emtratamento')
+
+# Rótulos devolvidos por consultar_tratamento_publicacoes
+ROTULOS_TOTALIZADORES = {
+    'tratada': "Tratada",
+    'pendente': "Pendente",
+    'complementada': "Complementada",
+    'descartadabbnaoparte': "Descartada banco não parte",
+    'descartada': "Descartada",
+    'emtratamento': "Em tratamento",
+}
+
+# Totais de dias encerrados, para quando o cache em disco não estiver configurado
+_totais_dia = {}
+
+# Máximo de dias (uma requisição cada) consultados em cada chamada a batch_api_navegador
+DIAS_POR_LEVA = 100
+
+def _totais_por_estado(data: list) -> Dict[str, int]:
+    """
+    Converte a lista de totalizadores do PAJ em {estado: quantidade}, pelo código do estado de cada item
+    (DICT_TIPO) e, se o item não trouxer o código, pela posição na lista.
+    """
+    totais: Dict[str, int] = {}
+    for posicao, item in enumerate(data or []):
+        estado = None
+        codigo = item.get("codigoEstadoPublicacaoJudicial")
+        if codigo is not None:
+            try:
+                estado = DICT_TIPO_REVERSED.get(int(codigo))
+            except (TypeError, ValueError):
+                estado = None
+        if estado is None and posicao < len(ORDEM_TOTALIZADORES):
+            estado = ORDEM_TOTALIZADORES[posicao]
+        if estado is None:
+            continue
+        totais[estado] = totais.get(estado, 0) + int(item.get("quantidadePublicacao") or 0)
+    return totais
+
+def _payload_totalizadores(data_inicial: str, data_final: str) -> dict:
+    return {
+        "codigoUnidadeOrganizacionalRecebedor": 18908,
+        "dataFimDivulgacao": data_final,
+        "dataInicioDivulgacao": data_inicial,
+    }
 
 def consultar_tratamento_publicacoes(driver, data_inicial, data_final):
     """
@@ -484,25 +962,93 @@ def consultar_tratamento_publicacoes(driver, data_inicial, data_final):
     data_inicial = data_inicial.replace('/', '.')
     data_final = data_final.replace('/', '.')
 
-    url = 'https://juridico.intranet.bb.com.br/paj/resources/app/v1/publicacao/totalizadores/listarTotalizadores'
-    
-    payload = {
-        "codigoUnidadeOrganizacionalRecebedor": 18908,
-        "dataFimDivulgacao": data_final,
-        "dataInicioDivulgacao": data_inicial,
-    }
+    response = post_api_navegador(driver, URL_TOTALIZADORES, _payload_totalizadores(data_inicial, data_final))
     
-    response = post_api_navegador(driver, url, payload)
+    totais = _totais_por_estado(response['data'])
     
-    data = response['data']
+    payload_result = {rotulo: totais.get(estado, 0) for estado, rotulo in ROTULOS_TOTALIZADORES.items()}
     
-    payload_result = {
-        "Tratada": data[0]['quantidadePublicacao'],
-        "Pendente": data[1]['quantidadePublicacao'],
-        "Complementada": data[2]['quantidadePublicacao'],
-        "Descartada banco não parte": data[3]['quantidadePublicacao'],
-        "Descartada": data[4]['quantidadePublicacao'],
-        "Em tratamento": data[5]['quantidadePublicacao'],
+    return payload_result
+
+def serie_tratamento_publicacoes(driver: WebDriver, data_inicial: Union[str, date], data_final: Union[str, date, None] = None,
+                                 concurrency: int = 8, dias_por_leva: int = DIAS_POR_LEVA) -> SerieTratamento:
+    """
+    Totais de publicações por estado, dia a dia, em um período de qualquer tamanho.
+
+    O período é dividido em dias e só os dias que ainda não estão em cache são consultados, em levas de no máximo
+    `dias_por_leva` dias por lote. Os dias encerrados de cada leva vão para o cache antes da leva seguinte.
+    Um dia passado sem publicações pendentes ou em tratamento está encerrado: os totais dele não mudam mais e ficam
+    em cache para sempre (no CacheProcessos configurado, ou em memória). Hoje e os dias com publicações em aberto
+    são consultados de novo a cada chamada. Em execuções seguintes, um relatório trimestral faz só algumas requisições.
+
+    :param driver: Instância do WebDriver do Selenium.
+    :param data_inicial: Primeiro dia ('dd/mm/aaaa', 'dd.mm.aaaa' ou date).
+    :param data_final: (Opcional) Último dia. Padrão: hoje.
+    :param concurrency: Número máximo de requisições simultâneas (padrão: 8).
+    :param dias_por_leva: Máximo de dias consultados por lote (padrão: DIAS_POR_LEVA).
+    :return: Dicionário conforme o schema SerieTratamento, com os totais de cada dia e do período por estado (chaves de DICT_TIPO).
+    :raises Exception: Se a consulta de algum dia falhar.
+
+    :example:
+        >>> serie = serie_tratamento_publicacoes(driver, '01/01/2025', '31/03/2025')
+        >>> serie['total']['pendente'], serie['dias']['15/01/2025']['tratada']
+    """
+    hoje = datetime.now().date()
+    inicio = ler_data(_formatar_data(data_inicial, hoje))
+    fim = ler_data(_formatar_data(data_final, hoje))
+    if inicio > fim:
+        raise ValueError("data_inicial deve ser anterior a data_final.")
+    if dias_por_leva < 1:
+        raise ValueError("dias_por_leva deve ser maior que zero.")
+
+    cache = cache_processos()
+    dias = [inicio + timedelta(days=i) for i in range((fim - inicio).days + 1)]
+    totais_dias: Dict[str, Dict[str, int]] = {}
+    faltantes = []
+    for dia in dias:
+        chave = dia.strftime('%d.%m.%Y')
+        totais = _totais_dia.get(chave)
+        if totais is None and cache is not None:
+            totais = cache.obter('totais_dia', chave)
+        if totais is None:
+            faltantes.append(dia)
+        else:
+            totais_dias[dia.strftime('%d/%m/%Y')] = totais
+
+    if faltantes:
+        print(f"Consultando os totais de {len(faltantes)} de {len(dias)} dias...")
+    for inicio_leva in range(0, len(faltantes), dias_por_leva):
+        leva = faltantes[inicio_leva:inicio_leva + dias_por_leva]
+        respostas = batch_api_navegador(
+            driver,
+            [('POST', URL_TOTALIZADORES, _payload_totalizadores(dia.strftime('%d.%m.%Y'), dia.strftime('%d.%m.%Y'))) for dia in leva],
+            concurrency=concurrency
+        )
+        for dia, resposta in zip(leva, respostas):
+            if not _resposta_ok(resposta):
+                status = resposta.get('status', resposta.get('error', 'Erro desconhecido')) if isinstance(resposta, dict) else resposta
+                raise Exception(f"Erro ao consultar os totais de {dia.strftime('%d/%m/%Y')}: {status}")
+            totais = _totais_por_estado(resposta.get('data'))
+            totais_dias[dia.strftime('%d/%m/%Y')] = totais
+            # Só dias passados sem nada em aberto estão encerrados
+            if dia < hoje and not totais.get('pendente') and not totais.get('emtratamento'):
+                chave = dia.strftime('%d.%m.%Y')
+                _totais_dia[chave] = totais
+                if cache is not None:
+                    cache.guardar('totais_dia', chave, totais)
+
+    total: Dict[str, int] = {}
+    dias_ordenados: Dict[str, Dict[str, int]] = {}
+    for dia in dias:
+        rotulo = dia.strftime('%d/%m/%Y')
+        dias_ordenados[rotulo] = totais_dias[rotulo]
+        for estado, quantidade in totais_dias[rotulo].items():
+            total[estado] = total.get(estado, 0) + quantidade
+
+    resultado: SerieTratamento = {
+        "dias": dias_ordenados,
+        "total": total,
+        "requisicoes": len(faltantes),
     }
-    
-    return payload_result
\ No newline at end of file
+
+    return resultado
@@ -0,0 +1,240 @@
+import random
+import re
+import threading
+import time
+from urllib.parse import urlsplit
+
+# Status HTTP que indicam falha passageira: vale a pena tentar de novo
+STATUS_RETENTAVEIS = {408, 425, 429, 500, 502, 503, 504}
+
+# Mensagens de erro determinísticas: repetir a requisição dá o mesmo resultado
+ERROS_FATAIS = (
+    'Resposta não está no formato JSON',
+)
+
+def erro_retentavel(erro) -> bool:
+    """
+    Classifica uma falha como passageira (vale tentar de novo) ou fatal.
+
+    :param erro: Exceção levantada ou resultado {'error': ..., 'status': ...} retornado pela requisição.
+    :return: True se a requisição deve ser repetida.
+    :example: erro_retentavel({'error': 'Not Found', 'status': 404}) -> False
+    """
+    if isinstance(erro, (ValueError, TypeError, KeyError)):
+        # Erro de programação ou de dados: não muda na próxima tentativa
+        return False
+    if isinstance(erro, dict):
+        status = erro.get('status')
+        if status:
+            return status in STATUS_RETENTAVEIS or status >= 500
+        mensagem = str(erro.get('error', ''))
+        return not any(fatal in mensagem for fatal in ERROS_FATAIS)
+    # Demais exceções (rede, timeout do WebDriver, página recarregando) são passageiras
+    return True
+
+def endpoint_da_url(api_url: str) -> str:
+    """
+    Retorna o endpoint de uma URL, sem a query string e com os IDs numéricos trocados por {id}.
+    Todas as URLs de um mesmo endpoint compartilham o mesmo circuito.
+
+    :example: endpoint_da_url('https://.../processo/consulta/20250019564') -> 'juridico.intranet.bb.com.br/.../processo/consulta/{id}'
+    """
+    partes = urlsplit(api_url)
+    return partes.netloc + re.sub(r'/\d+(?=/|$)', '/{id}', partes.path)
+
+class OrcamentoRetry:
+    """
+    Orçamento global de novas tentativas, compartilhado por todas as requisições.
+
+    Cada requisição nova deposita `proporcao` de ficha e cada nova tentativa gasta uma ficha inteira,
+    então, em regime, as novas tentativas ficam limitadas a essa proporção do tráfego. Quando o PAJ cai,
+    o orçamento se esgota e as falhas voltam na hora, em vez de multiplicar a carga.
+    """
+
+    def __init__(self, proporcao: float = 0.2, minimo: float = 10, maximo: float = 100):
+        """
+        :param proporcao: Fichas depositadas por requisição nova (padrão: 0.2, ou seja, 20% de novas tentativas).
+        :param minimo: Fichas disponíveis no início, para permitir novas tentativas com pouco tráfego.
+        :param maximo: Máximo de fichas acumuladas.
+        """
+        self.proporcao = proporcao
+        self.maximo = maximo
+        self._fichas = float(minimo)
+        self._trava = threading.Lock()
+
+    def registrar_requisicao(self):
+        with self._trava:
+            self._fichas = min(self.maximo, self._fichas + self.proporcao)
+
+    def gastar(self) -> bool:
+        """
+        Tenta gastar uma ficha para uma nova tentativa.
+
+        :return: True se a nova tentativa está autorizada.
+        """
+        with self._trava:
+            if self._fichas < 1:
+                return False
+            self._fichas -= 1
+            return True
+
+class Circuito:
+    """
+    Disjuntor de um endpoint. Depois de `limiar` falhas passageiras seguidas o circuito abre e as
+    requisições falham na hora por `tempo_aberto` segundos; depois disso uma única requisição de teste
+    é liberada (meio-aberto) e o resultado dela fecha ou reabre o circuito.
+    """
+
+    def __init__(self, endpoint: str, limiar: int = 5, tempo_aberto: float = 30.0):
+        self.endpoint = endpoint
+        self.limiar = limiar
+        self.tempo_aberto = tempo_aberto
+        self.estado = 'fechado'
+        self.falhas = 0
+        self._aberto_ate = 0.0
+        self._trava = threading.Lock()
+
+    def permitir(self) -> bool:
+        """
+        :return: True se a requisição pode ser feita agora.
+        """
+        with self._trava:
+            if self.estado == 'fechado':
+                return True
+            if self.estado == 'aberto' and time.monotonic() >= self._aberto_ate:
+                self.estado = 'meio-aberto'
+                return True
+            return False
+
+    def sucesso(self):
+        with self._trava:
+            if self.estado != 'fechado':
+                print(f"Circuito de {self.endpoint} fechado: endpoint voltou a responder.")
+            self.estado = 'fechado'
+            self.falhas = 0
+
+    def falha(self):
+        with self._trava:
+            self.falhas += 1
+            if self.estado == 'meio-aberto' or self.falhas >= self.limiar:
+                if self.estado != 'aberto':
+                    print(f"Circuito de {self.endpoint} aberto por {self.tempo_aberto:.0f}s após {self.falhas} falhas.")
+                self.estado = 'aberto'
+                self._aberto_ate = time.monotonic() + self.tempo_aberto
+
+class PoliticaRetry:
+    """
+    Política de novas tentativas compartilhada pelas funções de requisição de DijurLib.api.
+
+    Combina a classificação de erros (erro_retentavel), espera exponencial com jitter, o orçamento global
+    de novas tentativas (OrcamentoRetry) e um disjuntor por endpoint (Circuito).
+
+    Exemplo de uso:
+        >>> configurar_retry(PoliticaRetry(espera_base=1.0, limiar_circuito=3))
+    """
+
+    def __init__(self, espera_base: float = 0.5, espera_maxima: float = 30.0, orcamento: OrcamentoRetry = None,
+                 limiar_circuito: int = 5, tempo_aberto: float = 30.0):
+        """
+        :param espera_base: Espera, em segundos, antes da segunda tentativa; dobra a cada tentativa (padrão: 0.5).
+        :param espera_maxima: Espera máxima entre tentativas, em segundos (padrão: 30).
+        :param orcamento: (Opcional) Orçamento global de novas tentativas. Se None, usa OrcamentoRetry().
+        :param limiar_circuito: Falhas seguidas que abrem o circuito de um endpoint (padrão: 5).
+        :param tempo_aberto: Tempo, em segundos, que o circuito fica aberto antes do teste (padrão: 30).
+        """
+        self.espera_base = espera_base
+        self.espera_maxima = espera_maxima
+        self.orcamento = orcamento or OrcamentoRetry()
+        self.limiar_circuito = limiar_circuito
+        self.tempo_aberto = tempo_aberto
+        self._circuitos = {}
+        self._trava = threading.Lock()
+
+    def circuito(self, api_url: str) -> Circuito:
+        """
+        Retorna o circuito do endpoint da URL.
+        """
+        endpoint = endpoint_da_url(api_url)
+        with self._trava:
+            circuito = self._circuitos.get(endpoint)
+            if circuito is None:
+                circuito = self._circuitos[endpoint] = Circuito(endpoint, self.limiar_circuito, self.tempo_aberto)
+            return circuito
+
+    def espera(self, tentativa: int) -> float:
+        """
+        Tempo de espera antes da próxima tentativa ("full jitter": sorteado entre zero e o teto exponencial).
+
+        :param tentativa: Número da tentativa que acabou de falhar, começando em 0.
+        """
+        return random.uniform(0, min(self.espera_maxima, self.espera_base * 2 ** tentativa))
+
+    def executar(self, api_url: str, funcao, max_tentativas: int = 3, descricao: str = 'requisição'):
+        """
+        Executa uma requisição aplicando a política.
+
+        :param api_url: URL da requisição (define o circuito).
+        :param funcao: Função sem argumentos que faz uma tentativa e retorna o resultado ({'error': ...} em caso de falha).
+        :param max_tentativas: Número máximo de tentativas (padrão: 3).
+        :param descricao: Nome da requisição usado nas mensagens (ex: 'requisição GET').
+        :return: Resultado da última tentativa; {'error': ...} se todas falharem ou se o circuito estiver aberto.
+        """
+        circuito = self.circuito(api_url)
+        self.orcamento.registrar_requisicao()
+        resultado = None
+        for tentativa in range(max_tentativas):
+            if not circuito.permitir():
+                print(f"Circuito de {circuito.endpoint} aberto: {descricao} não enviada.")
+                return {'error': f'Circuito aberto para {circuito.endpoint}', 'circuitoAberto': True}
+
+            print(f"Iniciando {descricao} - tentativa {tentativa + 1}...")
+            try:
+                resultado = funcao()
+                if resultado is None:
+                    resultado = {'error': 'Nenhuma resposta recebida'}
+                retentavel = erro_retentavel(resultado) if 'error' in resultado else False
+            except Exception as e:
+                print(f"Ocorreu um erro ao fazer a {descricao}:", e)
+                resultado = {'error': str(e)}
+                retentavel = erro_retentavel(e)
+
+            if 'error' not in resultado:
+                circuito.sucesso()
+                return resultado
+
+            print(f"Erro na {descricao}: {resultado['error']}")
+            if not retentavel:
+                # O endpoint respondeu; a falha é da requisição, não do PAJ
+                circuito.sucesso()
+                print("Erro não recuperável, sem novas tentativas.")
+                return resultado
+
+            circuito.falha()
+            if tentativa + 1 >= max_tentativas or circuito.estado == 'aberto':
+                break
+            if not self.orcamento.gastar():
+                print("Orçamento de novas tentativas esgotado.")
+                break
+            espera = self.espera(tentativa)
+            print(f"Tentando novamente em {espera:.1f} segundos...")
+            time.sleep(espera)
+
+        print("Número máximo de tentativas alcançado.")
+        return resultado
+
+_politica = PoliticaRetry()
+
+def configurar_retry(politica: PoliticaRetry):
+    """
+    Substitui a política de novas tentativas usada pelas funções de DijurLib.api.
+
+    :param politica: Instância de PoliticaRetry.
+    """
+    global _politica
+    _politica = politica
+
+def politica_retry() -> PoliticaRetry:
+    """
+    Retorna a política de novas tentativas em uso.
+    """
+    return _politica
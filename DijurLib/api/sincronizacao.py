@@ -0,0 +1,215 @@
+from __future__ import annotations
+
+import json
+import os
+import tempfile
+from datetime import date, datetime, timedelta
+from typing import TYPE_CHECKING, Iterable, List, Union
+
+if TYPE_CHECKING:
+    from selenium.webdriver.remote.webdriver import WebDriver
+
+from .base import batch_api_navegador
+from .publicacoes import iter_publicacoes, ler_data, URL_DETALHAR, DICT_TIPO_REVERSED, estado_detalhe
+from ..utils.schema.schemaPublicacoes import EventoPublicacao
+
+# Estados em que a publicação ainda pode mudar; as demais só mudam saindo de um destes
+ESTADOS_ABERTOS = ('pendente', 'emtratamento')
+
+# Estados acompanhados por padrão
+ESTADOS_SINCRONIZADOS = ('pendente', 'emtratamento', 'tratada', 'descartada', 'descartadabbnaoparte')
+
+# Publicações chegam ao banco alguns dias depois da divulgação. A janela volta, a partir da marca d'água
+# (maior dataDivulgacao vista), o maior entre esta margem (a janela fixa de listar_publicacoes) e o maior
+# atraso entre divulgação e recebimento já observado no tribunal/estado
+MARGEM_DIAS = 5
+
+# Publicações fechadas são esquecidas depois deste prazo (contado da divulgação)
+RETENCAO_DIAS = 30
+
+class EstadoSincronizacao:
+    """
+    Arquivo JSON com a marca d'água de cada tribunal/estado e o último estado conhecido das publicações.
+
+    A marca d'água fica na dataDivulgacao, o campo pelo qual a listagem do PAJ é filtrada, junto com o maior
+    atraso (em dias) entre divulgação e recebimento já visto.
+
+    Formato:
+        {
+            "marcas": {"stj|pendente": {"dataDivulgacao": "2025-05-01", "atrasoDias": 3, "sincronizadoEm": "..."}},
+            "publicacoes": {"stj": {"123": {"estado": "pendente", "dataDivulgacao": "2025-05-01"}}}
+        }
+    """
+
+    def __init__(self, caminho: str):
+        """
+        :param caminho: Caminho do arquivo JSON. É criado na primeira gravação.
+        """
+        self.caminho = caminho
+        self.dados = {'marcas': {}, 'publicacoes': {}}
+        if os.path.exists(caminho):
+            with open(caminho, 'r', encoding='utf-8') as f:
+                self.dados = json.load(f)
+            self.dados.setdefault('marcas', {})
+            self.dados.setdefault('publicacoes', {})
+
+    def marca(self, tribunal: str, tipo: str) -> dict:
+        """
+        Retorna a marca d'água de um tribunal/estado, ou None se ele nunca foi sincronizado.
+        """
+        return self.dados['marcas'].get(f'{tribunal}|{tipo}')
+
+    def atualizar_marca(self, tribunal: str, tipo: str, data_divulgacao: date, data_recebimento: date):
+        chave = f'{tribunal}|{tipo}'
+        marca = self.dados['marcas'].get(chave) or {}
+        if data_divulgacao is not None:
+            atual = marca.get('dataDivulgacao')
+            marca['dataDivulgacao'] = max(atual, data_divulgacao.isoformat()) if atual else data_divulgacao.isoformat()
+            if data_recebimento is not None:
+                marca['atrasoDias'] = max(marca.get('atrasoDias', 0), (data_recebimento - data_divulgacao).days)
+        marca['sincronizadoEm'] = datetime.now().isoformat(timespec='seconds')
+        self.dados['marcas'][chave] = marca
+
+    def publicacoes(self, tribunal: str) -> dict:
+        """
+        Retorna {numeroPublicacaoJudicial (texto): {'estado': ..., 'dataDivulgacao': ...}} das publicações conhecidas do tribunal.
+        """
+        return self.dados['publicacoes'].setdefault(tribunal, {})
+
+    def limpar(self, hoje: date):
+        """
+        Esquece as publicações fechadas divulgadas há mais de RETENCAO_DIAS dias.
+        """
+        limite = (hoje - timedelta(days=RETENCAO_DIAS)).isoformat()
+        for conhecidas in self.dados['publicacoes'].values():
+            for numero in [n for n, p in conhecidas.items()
+                           if p['estado'] not in ESTADOS_ABERTOS and (p.get('dataDivulgacao') or '') < limite]:
+                del conhecidas[numero]
+
+    def salvar(self):
+        """
+        Grava o arquivo por um temporário único na mesma pasta, trocado de uma vez: o estado não se corrompe
+        se o processo cair no meio, e duas gravações simultâneas não usam o mesmo temporário.
+        """
+        descritor, caminho_temporario = tempfile.mkstemp(dir=os.path.dirname(self.caminho) or '.', suffix='.tmp')
+        try:
+            with os.fdopen(descritor, 'w', encoding='utf-8') as f:
+                json.dump(self.dados, f, ensure_ascii=False)
+            os.replace(caminho_temporario, self.caminho)
+        except BaseException:
+            if os.path.exists(caminho_temporario):
+                os.remove(caminho_temporario)
+            raise
+
+def _inicio_janela(estado: EstadoSincronizacao, tribunal: str, tipo: str, hoje: date) -> date:
+    marca = estado.marca(tribunal, tipo)
+    if marca is None or not marca.get('dataDivulgacao'):
+        # Primeira sincronização: mesma janela de listar_publicacoes
+        return hoje - timedelta(days=5)
+    margem = max(MARGEM_DIAS, marca.get('atrasoDias', 0))
+    inicio = date.fromisoformat(marca['dataDivulgacao']) - timedelta(days=margem)
+    # Uma publicação só sai deste estado se estiver nele: a janela cobre a mais antiga que conhecemos aqui.
+    # Publicações abertas de outros estados não alargam esta listagem
+    abertas = [p['dataDivulgacao'] for p in estado.publicacoes(tribunal).values()
+               if p['estado'] == tipo and p['estado'] in ESTADOS_ABERTOS and p.get('dataDivulgacao')]
+    if abertas:
+        inicio = min(inicio, date.fromisoformat(min(abertas)))
+    return min(inicio, hoje)
+
+def sincronizar_publicacoes(driver: WebDriver, tribunal: str, tipos: Iterable[str] = ESTADOS_SINCRONIZADOS,
+                            caminho: str = 'sincronizacao_publicacoes_{tribunal}.json',
+                            data_inicio: Union[str, date, None] = None, data_fim: Union[str, date, None] = None,
+                            concurrency: int = 4) -> List[EventoPublicacao]:
+    """
+    Sincroniza as publicações de um tribunal com o estado salvo em disco e retorna só o que mudou desde a última chamada.
+
+    Para cada estado, a janela de divulgação começa na marca d'água (maior dataDivulgacao já vista, menos
+    MARGEM_DIAS ou o maior atraso de recebimento observado) ou na publicação aberta mais antiga conhecida naquele
+    estado, em vez dos 5 dias fixos de listar_publicacoes. Em um polling frequente, cada chamada lê só algumas
+    dezenas de publicações.
+
+    Eventos retornados:
+        - 'inclusao': publicação nunca vista antes.
+        - 'transicao': publicação conhecida que apareceu em outro estado (ex: de 'pendente' para 'tratada').
+          Uma publicação que sumiu do estado em que estava sem aparecer nas janelas lidas tem o estado atual
+          consultado com detalhar_publicacao ('para' None se ele não puder ser obtido).
+
+    :param driver: Instância do WebDriver do Selenium.
+    :param tribunal: Tribunal de origem (ex: 'stf', 'stj', 'tst').
+    :param tipos: Estados a sincronizar (padrão: ESTADOS_SINCRONIZADOS).
+    :param caminho: Arquivo JSON com as marcas d'água; '{tribunal}' é trocado pelo tribunal, para que tribunais
+                    sincronizados ao mesmo tempo não gravem no mesmo arquivo (padrão: 'sincronizacao_publicacoes_{tribunal}.json').
+    :param data_inicio: (Opcional) Força o início da janela ('dd/mm/aaaa', 'dd.mm.aaaa' ou date), ex: para reprocessar um período.
+    :param data_fim: (Opcional) Fim da janela. Padrão: hoje.
+    :param concurrency: Número máximo de páginas buscadas ao mesmo tempo (padrão: 4).
+    :return: Lista de eventos, conforme o schema EventoPublicacao.
+
+    :example:
+        >>> for evento in sincronizar_publicacoes(driver, 'stj'):
+        ...     if evento['evento'] == 'inclusao':
+        ...         print(evento['publicacao']['numeroPublicacaoJudicial'])
+    """
+    tribunal = tribunal.lower().strip()
+    tipos = [tipo.lower().strip() for tipo in tipos]
+    hoje = datetime.now().date()
+    estado = EstadoSincronizacao(caminho.replace('{tribunal}', tribunal))
+    conhecidas = estado.publicacoes(tribunal)
+
+    eventos: List[EventoPublicacao] = []
+    vistas = {}  # numero -> estado em que apareceu nesta sincronização
+    janelas = {}
+
+    for tipo in tipos:
+        inicio = ler_data(data_inicio) if data_inicio is not None else _inicio_janela(estado, tribunal, tipo, hoje)
+        janelas[tipo] = inicio
+        lidas = 0
+        for publicacao in iter_publicacoes(driver, tipo, tribunal, concurrency, data_inicio=inicio, data_fim=data_fim):
+            lidas += 1
+            numero = publicacao['numeroPublicacaoJudicial']
+            chave = str(numero)
+            vistas[chave] = tipo
+            divulgacao = ler_data(publicacao['dataDivulgacao'])
+            estado.atualizar_marca(tribunal, tipo, divulgacao, ler_data(publicacao['dataRecebimento']))
+
+            anterior = conhecidas.get(chave)
+            if anterior is None:
+                eventos.append({'evento': 'inclusao', 'numeroPublicacaoJudicial': numero, 'de': None, 'para': tipo, 'publicacao': publicacao})
+            elif anterior['estado'] != tipo:
+                eventos.append({'evento': 'transicao', 'numeroPublicacaoJudicial': numero, 'de': anterior['estado'], 'para': tipo, 'publicacao': publicacao})
+            else:
+                continue
+            conhecidas[chave] = {'estado': tipo, 'dataDivulgacao': divulgacao.isoformat() if divulgacao else None}
+        print(f"Sincronização {tribunal}/{tipo}: {lidas} publicações lidas desde {inicio.strftime('%d/%m/%Y')}.")
+
+    # Publicações que estavam em um estado sincronizado, dentro da janela lida, e não apareceram em lugar nenhum
+    sumidas = []
+    for chave, anterior in conhecidas.items():
+        tipo = anterior['estado']
+        if chave in vistas or tipo not in janelas or not anterior.get('dataDivulgacao'):
+            continue
+        if date.fromisoformat(anterior['dataDivulgacao']) < janelas[tipo]:
+            continue
+        if data_fim is not None and date.fromisoformat(anterior['dataDivulgacao']) > ler_data(data_fim):
+            continue
+        sumidas.append(chave)
+
+    # A janela de cada estado só cobre as publicações dele: o novo estado das que sumiram vem do detalhamento
+    detalhes = batch_api_navegador(
+        driver,
+        [('POST', URL_DETALHAR, {"numeroPublicacaoJudicial": int(chave)}) for chave in sumidas],
+        concurrency=concurrency
+    ) if sumidas else []
+    for chave, detalhe in zip(sumidas, detalhes):
+        anterior = conhecidas[chave]
+        codigo = estado_detalhe(detalhe)
+        para = DICT_TIPO_REVERSED.get(codigo) if codigo is not None else None
+        if para == anterior['estado']:
+            # Ainda no mesmo estado (a listagem atrasou): nada mudou
+            continue
+        eventos.append({'evento': 'transicao', 'numeroPublicacaoJudicial': int(chave), 'de': anterior['estado'], 'para': para, 'publicacao': None})
+        anterior['estado'] = para
+
+    estado.limpar(hoje)
+    estado.salvar()
+    print(f"Sincronização {tribunal}: {len(eventos)} eventos.")
+    return eventos
@@ -0,0 +1,164 @@
+import threading
+import time
+
+def autenticacao_expirada(resultado) -> bool:
+    """
+    Verifica se o resultado de uma requisição indica que a sessão do PAJ expirou
+    (401/403, ou redirecionamento para a página de login detectado pela biblioteca JS).
+
+    :param resultado: Resultado {'error': ..., 'status': ...} retornado pela requisição.
+    """
+    return isinstance(resultado, dict) and 'error' in resultado and resultado.get('status') in (401, 403)
+
+class SupervisorSessao:
+    """
+    Mantém a sessão do PAJ viva durante lotes longos.
+
+    - Uma thread em segundo plano consulta o usuário atual a cada `intervalo_keepalive` segundos.
+    - Quando uma requisição de api/base.py recebe resposta de sessão expirada, o supervisor refaz o login
+      (sessão salva em disco, se houver, ou chave e senha) e a requisição é repetida.
+
+    Exemplo de uso:
+        >>> driver, wait = iniciar_navegador(headless=True)
+        >>> login_com_chave(driver, wait, chave, senha)
+        >>> with SupervisorSessao(driver, chave=chave, senha=senha):
+        ...     for npj in lista_npj:
+        ...         npj_dados_processo(driver, npj)
+    """
+
+    def __init__(self, driver, chave: str = None, senha: str = None, caminho_sessao: str = None,
+                 senha_arquivo: str = None, intervalo_keepalive: float = 300, wait_time: int = 30):
+        """
+        :param driver: Instância do WebDriver do Selenium ou SessaoPAJ usada pelo lote.
+        :param chave: (Opcional) Chave do usuário para refazer o login.
+        :param senha: (Opcional) Senha do usuário para refazer o login.
+        :param caminho_sessao: (Opcional) Arquivo de sessão (ver portal.sessao); é lido antes de refazer o login e regravado depois.
+        :param senha_arquivo: (Opcional) Senha do arquivo de sessão.
+        :param intervalo_keepalive: Intervalo entre as consultas de keepalive, em segundos (padrão: 300). None desativa.
+        :param wait_time: Tempo máximo de espera usado no login.
+        """
+        self.driver = driver
+        self.chave = chave
+        self.senha = senha
+        self.caminho_sessao = caminho_sessao
+        self.senha_arquivo = senha_arquivo
+        self.intervalo_keepalive = intervalo_keepalive
+        self.wait_time = wait_time
+        self.relogins = 0
+        self._ultimos_logins = {}
+        self._trava = threading.RLock()
+        self._em_andamento = False
+        self._parar = threading.Event()
+        self._thread = None
+
+    def iniciar(self):
+        """
+        Ativa o supervisor para as funções de DijurLib.api e inicia o keepalive.
+        """
+        configurar_supervisor(self)
+        if self.intervalo_keepalive:
+            self._parar.clear()
+            self._thread = threading.Thread(target=self._keepalive, name='dijur-keepalive', daemon=True)
+            self._thread.start()
+        return self
+
+    def parar(self):
+        """
+        Para o keepalive e desativa o supervisor.
+        """
+        self._parar.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        if supervisor_sessao() is self:
+            configurar_supervisor(None)
+
+    def __enter__(self):
+        return self.iniciar()
+
+    def __exit__(self, *args):
+        self.parar()
+
+    def _keepalive(self):
+        from ..portal.sessao import sessao_valida
+
+        while not self._parar.wait(self.intervalo_keepalive):
+            try:
+                # Se a sessão tiver expirado, a própria consulta aciona reautenticar
+                if sessao_valida(self.driver):
+                    print("Keepalive: sessão do PAJ ativa.")
+            except Exception as e:
+                print("Keepalive: erro ao verificar a sessão:", e)
+
+    def reautenticar(self, driver=None) -> bool:
+        """
+        Refaz a autenticação do navegador. Chamadas simultâneas de várias threads resultam em um único login.
+
+        :param driver: (Opcional) Driver que recebeu a resposta de sessão expirada. Se None, usa o driver do supervisor.
+        :return: True se a sessão foi renovada (ou acabou de ser renovada por outra thread).
+        :raises Exception: Se não houver sessão salva válida nem credenciais para o login.
+        """
+        from ..portal.login import login_com_chave
+        from ..portal.sessao import carregar_sessao, aplicar_sessao, salvar_sessao, sessao_valida
+        from selenium.webdriver.support.ui import WebDriverWait
+        from .transporte import SessaoPAJ
+        from .cliente_js import trava_navegador
+
+        driver = driver or self.driver
+        navegador = getattr(driver, 'driver', driver)
+        with self._trava:
+            if self._em_andamento:
+                # Requisição feita pelo próprio login (ex: verificação da sessão salva)
+                return False
+            # Outra thread acabou de renovar a sessão deste navegador
+            if time.monotonic() - self._ultimos_logins.get(id(navegador), 0.0) < 30:
+                return True
+
+            self._em_andamento = True
+            # O login navega com o mesmo WebDriver: segura a trava do navegador para que nenhuma outra thread
+            # (ex: o keepalive ou um lote em andamento) envie comandos a ele no meio da renovação
+            try:
+                with trava_navegador(navegador):
+                    print("Sessão do PAJ expirada, renovando...")
+                    renovada = False
+                    if self.caminho_sessao:
+                        # Outro processo pode ter renovado o arquivo de sessão
+                        dados = carregar_sessao(self.caminho_sessao, self.senha_arquivo)
+                        if dados is not None:
+                            aplicar_sessao(navegador, dados)
+                            renovada = sessao_valida(navegador)
+
+                    if not renovada:
+                        if not (self.chave and self.senha):
+                            raise Exception("Sessão do PAJ expirada e nenhuma credencial disponível para refazer o login.")
+                        login_com_chave(navegador, WebDriverWait(navegador, self.wait_time), self.chave, self.senha)
+                        if self.caminho_sessao:
+                            salvar_sessao(navegador, self.caminho_sessao, self.senha_arquivo)
+
+                    for alvo in (driver, self.driver):
+                        if isinstance(alvo, SessaoPAJ):
+                            alvo.atualizar_cookies()
+
+                    self.relogins += 1
+                    self._ultimos_logins[id(navegador)] = time.monotonic()
+                    print("Sessão do PAJ renovada.")
+                    return True
+            finally:
+                self._em_andamento = False
+
+_supervisor = None
+
+def configurar_supervisor(supervisor: SupervisorSessao):
+    """
+    Ativa o supervisor consultado pelas funções de api/base.py quando a sessão expira.
+
+    :param supervisor: Instância de SupervisorSessao, ou None para desativar.
+    """
+    global _supervisor
+    _supervisor = supervisor
+
+def supervisor_sessao() -> SupervisorSessao:
+    """
+    Retorna o supervisor configurado, ou None.
+    """
+    return _supervisor
@@ -0,0 +1,152 @@
+from __future__ import annotations
+
+import threading
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    import requests
+    from selenium.webdriver.remote.webdriver import WebDriver
+
+from .cliente_js import trava_navegador
+from ..utils.decodificador import carregar_json
+
+def sessao_expirada(response: requests.Response) -> bool:
+    """
+    Verifica se a resposta indica que a sessão autenticada do PAJ expirou.
+    O PAJ responde 401/403 ou redireciona para a página de login quando os cookies deixam de valer.
+
+    :param response: Resposta obtida pela sessão HTTP.
+    :return: True se a sessão expirou, False caso contrário.
+    """
+    if response.status_code in (401, 403):
+        return True
+    if response.is_redirect:
+        return True
+    content_type = response.headers.get('Content-Type', '')
+    return 'text/html' in content_type and '/paj/resources/' in response.url
+
+class SessaoPAJ:
+    """
+    Transporte HTTP que reaproveita os cookies autenticados de um WebDriver.
+
+    As requisições para os endpoints do PAJ são feitas por uma requests.Session com pool de conexões
+    keep-alive, sem passar pelo execute_async_script. Quando a sessão expira, os cookies são recolhidos
+    novamente do navegador; se ainda assim não funcionar, as funções de DijurLib.api voltam a usar o navegador.
+
+    Uma instância pode ser passada no lugar do driver para qualquer função de DijurLib.api.
+
+    Exemplo de uso:
+        >>> driver, wait = iniciar_navegador()
+        >>> login_com_chave(driver, wait, chave, senha)
+        >>> sessao = SessaoPAJ(driver)
+        >>> get_processos_npj(sessao, '20250019564002')
+    """
+
+    def __init__(self, driver: WebDriver, pool_maxsize: int = 10, timeout: int = 60):
+        """
+        :param driver: Instância do WebDriver do Selenium já autenticada no PAJ.
+        :param pool_maxsize: Número máximo de conexões mantidas abertas (padrão: 10).
+        :param timeout: Tempo máximo de espera por resposta, em segundos (padrão: 60).
+        """
+        # requests só é carregado quando uma sessão HTTP é de fato criada
+        import requests
+        from requests.adapters import HTTPAdapter
+
+        self.driver = driver
+        self.timeout = timeout
+        # Serializa a troca dos cookies entre as threads de um lote; a versão conta as trocas já feitas
+        self._trava_cookies = threading.Lock()
+        self._versao_cookies = 0
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_maxsize)
+        self.session.mount('https://', adapter)
+        self.session.headers.update({'Accept': 'application/json, text/plain, */*'})
+        self.atualizar_cookies()
+
+    def __getattr__(self, nome):
+        # Qualquer uso direto do driver (ex: execute_async_script) continua funcionando pelo navegador
+        if nome == 'driver':
+            raise AttributeError(nome)
+        return getattr(self.driver, nome)
+
+    def atualizar_cookies(self, versao: int = None):
+        """
+        Copia os cookies e o User-Agent atuais do navegador para a sessão HTTP.
+
+        O novo conjunto de cookies é montado à parte e trocado de uma vez, então as requisições em andamento
+        em outras threads continuam com o conjunto anterior. O navegador é lido com trava_navegador, para não
+        colidir com um novo login feito pelo supervisor.
+
+        :param versao: (Opcional) Versão dos cookies com que a requisição expirou (ver enviar). Se outra thread
+                       já trocou os cookies desde então, não recolhe de novo.
+        """
+        from requests.cookies import RequestsCookieJar
+
+        # Ordem fixa das travas (navegador, depois cookies): o supervisor chama este método segurando a do navegador
+        with trava_navegador(self.driver), self._trava_cookies:
+            if versao is not None and versao != self._versao_cookies:
+                return
+            cookies = RequestsCookieJar()
+            for cookie in self.driver.get_cookies():
+                cookies.set(
+                    cookie['name'],
+                    cookie['value'],
+                    domain=cookie.get('domain'),
+                    path=cookie.get('path', '/')
+                )
+            user_agent = self.driver.execute_script('return navigator.userAgent;')
+            self.session.cookies = cookies
+            self.session.headers['User-Agent'] = user_agent
+            self._versao_cookies += 1
+
+    def enviar(self, metodo: str, api_url: str, payload: dict = None, stream: bool = False):
+        """
+        Envia a requisição pela sessão HTTP, recolhendo os cookies do navegador uma vez se a sessão tiver expirado.
+
+        :param metodo: Método HTTP ('GET', 'POST' ou 'PUT').
+        :param api_url: URL da API a ser acessada.
+        :param payload: Dicionário com os dados enviados no corpo da requisição (opcional).
+        :param stream: Se True, o corpo da resposta não é lido de uma vez (ver requests.Response.iter_content).
+        :return: requests.Response, ou None se a sessão continuar expirada.
+        """
+        for tentativa in range(2):
+            versao = self._versao_cookies
+            response = self.session.request(
+                metodo,
+                api_url,
+                json=payload,
+                timeout=self.timeout,
+                allow_redirects=False,
+                stream=stream
+            )
+            if not sessao_expirada(response):
+                return response
+            response.close()
+            if tentativa == 0:
+                print("Sessão HTTP expirada, recolhendo cookies do navegador...")
+                self.atualizar_cookies(versao)
+        return None
+
+    def requisitar(self, metodo: str, api_url: str, payload: dict = None, aceitar_texto: bool = False):
+        """
+        Faz uma requisição autenticada pela sessão HTTP e devolve o resultado no mesmo formato do fetch feito no navegador.
+
+        :param metodo: Método HTTP ('GET', 'POST' ou 'PUT').
+        :param api_url: URL da API a ser acessada.
+        :param payload: Dicionário com os dados enviados no corpo da requisição (opcional).
+        :param aceitar_texto: Se True, respostas que não são JSON voltam como {'rawText': texto}.
+        :return: JSON obtido da API, {'rawText': ...}, {'error': ..., 'status': ...} ou None se a sessão expirou.
+        """
+        response = self.enviar(metodo, api_url, payload)
+        if response is None:
+            return None
+
+        if not response.ok:
+            return {'error': f'Network response was not ok: {response.reason}', 'status': response.status_code}
+
+        try:
+            return carregar_json(response.content)
+        except ValueError:
+            if aceitar_texto:
+                return {'rawText': response.text}
+            return {'error': 'Resposta não está no formato JSON'}
@@ -0,0 +1,30 @@
+"""
+Login e sessão no portal do PAJ.
+"""
+import importlib
+
+# Nome público -> submódulo onde ele é definido. Os submódulos só são importados no primeiro acesso (PEP 562).
+_EXPORTS = {
+    'is_element_present': 'login',
+    'login_com_chave': 'login',
+    'login_manual': 'login',
+    'salvar_sessao': 'sessao',
+    'carregar_sessao': 'sessao',
+    'aplicar_sessao': 'sessao',
+    'sessao_valida': 'sessao',
+    'iniciar_sessao': 'sessao',
+}
+
+__all__ = list(_EXPORTS)
+
+def __getattr__(nome):
+    modulo = _EXPORTS.get(nome)
+    if modulo is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {nome!r}")
+    valor = getattr(importlib.import_module(f'.{modulo}', __name__), nome)
+    # Guarda no módulo para que os próximos acessos não passem mais por aqui
+    globals()[nome] = valor
+    return valor
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -1,12 +1,10 @@
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support import expected_conditions as EC
-from selenium.common.exceptions import NoSuchElementException
 import time
 
-from ..utils.navegador import iniciar_navegador
+from ..utils.navegador import iniciar_navegador, aplicar_cookies
 
 # Função para verificar se um elemento está presente ou não na página.
 def is_element_present(driver, how, what): 
+    from selenium.common.exceptions import NoSuchElementException
     try: driver.find_element(by=how, value=what)
     except NoSuchElementException as e: return False
     return True
@@ -21,7 +19,11 @@ def login_com_chave(driver, wait, chave, senha):
     :param chave: Chave de acesso do usuário.
     :param senha: Senha de acesso do usuário.
     :return: None
+    :raises Exception: Se o login não for concluído (o navegador continua aberto para nova tentativa).
     """
+    from selenium.webdriver.common.by import By
+    from selenium.webdriver.support import expected_conditions as EC
+
     driver.get('https://juridico.intranet.bb.com.br/paj/app/')
     try:
         # Aguarda até que o campo de usuário esteja presente
@@ -42,8 +44,7 @@ def login_com_chave(driver, wait, chave, senha):
         print("Login realizado com sucesso.")
     except Exception as e:
         print("Ocorreu um erro durante o login:", e)
-        driver.quit()
-        exit()
+        raise Exception(f"Erro durante o login: {e}") from e
         
 def login_manual(driver, headless=False):
     """
@@ -53,6 +54,8 @@ def login_manual(driver, headless=False):
     :param headless: Define se o navegador vai ficar em modo headless ou não (default: False, PS: Demora mais para iniciar o programa).
     :return: Caso headless seja True, retorna o driver e o wait para serem usados no programa, caso contrário, retorna None.
     """
+    from selenium.webdriver.common.by import By
+
     driver.get('https://juridico.intranet.bb.com.br/paj/app/')
     
     while not is_element_present(driver, By.XPATH, "//*[contains(text(), 'Portal Jurídico')]"):
@@ -65,13 +68,7 @@ def login_manual(driver, headless=False):
         
         driver, wait = iniciar_navegador(True)
         
-        driver.get('https://juridico.intranet.bb.com.br/paj/app/')
-        
-        for cookie in cookies:
-            if 'juridico' in cookie['domain']:
-                driver.get('https://juridico.intranet.bb.com.br/paj/app/')
-                while 'juridico.intranet.bb.com.br' not in driver.current_url:
-                    time.sleep(0.1)
-            driver.add_cookie(cookie)
+        # Abre a página do PAJ uma vez, adiciona todos os cookies e recarrega
+        aplicar_cookies(driver, cookies)
             
         return driver, wait
\ No newline at end of file
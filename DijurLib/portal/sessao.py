@@ -0,0 +1,158 @@
+import base64
+import hashlib
+import json
+import os
+import tempfile
+import time
+
+try:
+    from cryptography.fernet import Fernet, InvalidToken
+except ImportError:
+    Fernet = None
+
+from .login import login_com_chave, login_manual
+from ..api.transporte import SessaoPAJ
+from ..api.helpers import get_logged_user
+from ..api.cache import invalidar_cache
+from ..utils.navegador import iniciar_navegador, aplicar_cookies, URL_PAJ
+
+# Cabeçalho do arquivo de sessão, seguido do salt (16 bytes) e do conteúdo cifrado
+_CABECALHO = b'DIJURSESSAO1'
+_ITERACOES_PBKDF2 = 390000
+VARIAVEL_CHAVE = 'DIJUR_CHAVE_SESSAO'
+
+def _fernet(senha_arquivo: str, salt: bytes):
+    if Fernet is None:
+        raise ImportError("O arquivo de sessão é cifrado com o pacote cryptography (pip install DijurLib[sessao]).")
+    senha_arquivo = senha_arquivo or os.environ.get(VARIAVEL_CHAVE)
+    if not senha_arquivo:
+        raise ValueError(f"Informe senha_arquivo ou defina a variável de ambiente {VARIAVEL_CHAVE}.")
+    chave = hashlib.pbkdf2_hmac('sha256', senha_arquivo.encode('utf-8'), salt, _ITERACOES_PBKDF2)
+    return Fernet(base64.urlsafe_b64encode(chave))
+
+def salvar_sessao(driver, caminho: str, senha_arquivo: str = None):
+    """
+    Grava em disco, cifrados, os cookies e o localStorage/sessionStorage do navegador autenticado.
+
+    :param driver: Instância do WebDriver do Selenium já autenticada no PAJ.
+    :param caminho: Caminho do arquivo de sessão.
+    :param senha_arquivo: (Opcional) Senha usada para cifrar o arquivo. Se None, usa a variável de ambiente DIJUR_CHAVE_SESSAO.
+    """
+    armazenamento = driver.execute_script(
+        "return {local: Object.assign({}, window.localStorage), sessao: Object.assign({}, window.sessionStorage)};"
+    )
+    dados = {
+        'cookies': driver.get_cookies(),
+        'localStorage': armazenamento.get('local', {}),
+        'sessionStorage': armazenamento.get('sessao', {}),
+        'salvo_em': time.time(),
+    }
+    salt = os.urandom(16)
+    conteudo = _fernet(senha_arquivo, salt).encrypt(json.dumps(dados).encode('utf-8'))
+
+    # Temporário único na mesma pasta: outro processo pode estar renovando o mesmo arquivo ao mesmo tempo.
+    # mkstemp cria o arquivo só para o dono, o que convém a um arquivo com cookies de sessão.
+    descritor, caminho_temporario = tempfile.mkstemp(dir=os.path.dirname(caminho) or '.', suffix='.tmp')
+    try:
+        with os.fdopen(descritor, 'wb') as f:
+            f.write(_CABECALHO + salt + conteudo)
+        os.replace(caminho_temporario, caminho)
+    except BaseException:
+        if os.path.exists(caminho_temporario):
+            os.remove(caminho_temporario)
+        raise
+    print("Sessão salva.")
+
+def carregar_sessao(caminho: str, senha_arquivo: str = None) -> dict:
+    """
+    Lê o arquivo de sessão gravado por salvar_sessao.
+
+    :param caminho: Caminho do arquivo de sessão.
+    :param senha_arquivo: (Opcional) Senha do arquivo. Se None, usa a variável de ambiente DIJUR_CHAVE_SESSAO.
+    :return: Dicionário com cookies, localStorage, sessionStorage e salvo_em, ou None se o arquivo não existir
+             ou não puder ser lido com a senha informada.
+    """
+    if not os.path.exists(caminho):
+        return None
+    with open(caminho, 'rb') as f:
+        bruto = f.read()
+    if not bruto.startswith(_CABECALHO):
+        print("Arquivo de sessão em formato desconhecido.")
+        return None
+    salt = bruto[len(_CABECALHO):len(_CABECALHO) + 16]
+    fernet = _fernet(senha_arquivo, salt)
+    try:
+        conteudo = fernet.decrypt(bruto[len(_CABECALHO) + 16:])
+    except InvalidToken:
+        print("Não foi possível decifrar o arquivo de sessão (senha incorreta ou arquivo corrompido).")
+        return None
+    return json.loads(conteudo)
+
+def aplicar_sessao(driver, dados: dict):
+    """
+    Carrega uma sessão salva em um navegador novo ou em uma SessaoPAJ.
+
+    :param driver: Instância do WebDriver do Selenium ou SessaoPAJ.
+    :param dados: Sessão obtida com carregar_sessao.
+    """
+    if isinstance(driver, SessaoPAJ):
+        # Sessão HTTP: basta trocar os cookies, sem abrir página nenhuma
+        for cookie in dados['cookies']:
+            driver.session.cookies.set(cookie['name'], cookie['value'], domain=cookie.get('domain'), path=cookie.get('path', '/'))
+        return
+
+    aplicar_cookies(driver, dados['cookies'])
+    driver.execute_script(
+        "for (const [k, v] of Object.entries(arguments[0])) { window.localStorage.setItem(k, v); }"
+        "for (const [k, v] of Object.entries(arguments[1])) { window.sessionStorage.setItem(k, v); }",
+        dados.get('localStorage', {}),
+        dados.get('sessionStorage', {})
+    )
+    driver.get(URL_PAJ)
+
+def sessao_valida(driver) -> bool:
+    """
+    Verifica com uma única consulta leve (get_logged_user) se o navegador está autenticado no PAJ.
+
+    :param driver: Instância do WebDriver do Selenium ou SessaoPAJ.
+    :return: True se a sessão está válida.
+    """
+    # O usuário atual pode estar no cache de respostas; a verificação precisa ir ao PAJ
+    invalidar_cache(padrao='get-current-user')
+    usuario = get_logged_user(driver)
+    return bool(usuario) and 'error' not in usuario
+
+def iniciar_sessao(caminho: str, chave: str = None, senha: str = None, senha_arquivo: str = None, headless: bool = True, wait_time: int = 30):
+    """
+    Abre um navegador autenticado no PAJ reaproveitando a sessão salva em disco.
+    O login completo só é feito quando não há sessão salva ou quando ela não vale mais; nesse caso a sessão nova é salva.
+
+    :param caminho: Caminho do arquivo de sessão.
+    :param chave: (Opcional) Chave do usuário para o login com chave e senha.
+    :param senha: (Opcional) Senha do usuário. Sem chave e senha, o login é manual (o navegador abre visível).
+    :param senha_arquivo: (Opcional) Senha do arquivo de sessão. Se None, usa a variável de ambiente DIJUR_CHAVE_SESSAO.
+    :param headless: Se True, o navegador é iniciado em modo headless.
+    :param wait_time: Tempo máximo de espera para localizar elementos na página.
+    :return: Instância do WebDriver do Selenium e wait.
+    """
+    dados = carregar_sessao(caminho, senha_arquivo)
+    if dados is not None:
+        driver, wait = iniciar_navegador(headless, wait_time)
+        aplicar_sessao(driver, dados)
+        if sessao_valida(driver):
+            print("Sessão salva reaproveitada, login não necessário.")
+            return driver, wait
+        print("Sessão salva expirada, fazendo login...")
+        driver.quit()
+
+    if chave and senha:
+        driver, wait = iniciar_navegador(headless, wait_time)
+        login_com_chave(driver, wait, chave, senha)
+    else:
+        driver, wait = iniciar_navegador(False, wait_time)
+        resultado = login_manual(driver, headless)
+        if headless:
+            driver, wait = resultado
+
+    salvar_sessao(driver, caminho, senha_arquivo)
+    return driver, wait
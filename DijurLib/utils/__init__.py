@@ -0,0 +1,47 @@
+"""
+Utilitários do DijurLib: navegador, pool de navegadores, caches, índice de publicações, registros compactos e armazém de documentos.
+"""
+import importlib
+
+# Nome público -> submódulo onde ele é definido. Os submódulos só são importados no primeiro acesso (PEP 562).
+_EXPORTS = {
+    'ArmazemDocumentos': 'armazem',
+    'configurar_armazem_padrao': 'armazem',
+    'armazem_padrao': 'armazem',
+    'CacheProcessos': 'cache_processos',
+    'configurar_cache_processos': 'cache_processos',
+    'invalidar_cache_processos': 'cache_processos',
+    'PublicacaoCompacta': 'compacto',
+    'AndamentoCompacto': 'compacto',
+    'compactar_publicacoes': 'compacto',
+    'compactar_andamentos': 'compacto',
+    'carregar_json': 'decodificador',
+    'decodificador_ativo': 'decodificador',
+    'hello': 'helpers',
+    'helpDijurApi': 'helpers',
+    'pje_exemplo': 'helpers',
+    'IndicePublicacoes': 'indice_publicacoes',
+    'iniciar_navegador': 'navegador',
+    'aplicar_cookies': 'navegador',
+    'navegador_saudavel': 'pool',
+    'DriverPool': 'pool',
+    'palavras_normalizadas': 'regras',
+    'AutomatoPalavras': 'regras',
+    'MotorRegras': 'regras',
+    'remover_acentos': 'texto',
+    'normalizar_texto': 'texto',
+}
+
+__all__ = list(_EXPORTS)
+
+def __getattr__(nome):
+    modulo = _EXPORTS.get(nome)
+    if modulo is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {nome!r}")
+    valor = getattr(importlib.import_module(f'.{modulo}', __name__), nome)
+    # Guarda no módulo para que os próximos acessos não passem mais por aqui
+    globals()[nome] = valor
+    return valor
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
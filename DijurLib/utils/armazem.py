@@ -0,0 +1,222 @@
+import hashlib
+import os
+import shutil
+import sqlite3
+import tempfile
+import threading
+import time
+
+class ArmazemDocumentos:
+    """
+    Armazém local de documentos do PAJ endereçado por conteúdo.
+
+    Cada arquivo é guardado uma única vez em objetos/<sha256[:2]>/<sha256>, e um índice SQLite liga
+    cada id_documento ao hash do conteúdo. Quando o tamanho total passa de limite_bytes, os objetos
+    usados há mais tempo são removidos (LRU).
+
+    Os objetos são entregues ao caminho do chamador por hard link quando possível (mesmo disco), ou por cópia.
+    Como o hard link compartilha o conteúdo com o armazém, não altere os arquivos entregues no lugar:
+    grave uma cópia nova.
+
+    Exemplo de uso:
+        >>> armazem = ArmazemDocumentos('C:/dijur/armazem', limite_bytes=20 * 1024 ** 3)
+        >>> baixar_documento(driver, '123456', 'C:/saida/peticao', armazem=armazem)
+    """
+
+    def __init__(self, diretorio: str, limite_bytes: int = None):
+        """
+        :param diretorio: Pasta onde ficam os objetos e o índice.
+        :param limite_bytes: (Opcional) Tamanho máximo do armazém em bytes. Se None, não há remoção automática.
+        """
+        self.diretorio = diretorio
+        self.limite_bytes = limite_bytes
+        self._trava = threading.Lock()
+        os.makedirs(os.path.join(diretorio, 'objetos'), exist_ok=True)
+        self._conexao = sqlite3.connect(os.path.join(diretorio, 'indice.sqlite3'), check_same_thread=False)
+        with self._conexao:
+            self._conexao.executescript("""
+                CREATE TABLE IF NOT EXISTS objetos (
+                    sha256 TEXT PRIMARY KEY,
+                    tamanho INTEGER NOT NULL,
+                    ultimo_acesso REAL NOT NULL
+                );
+                CREATE TABLE IF NOT EXISTS documentos (
+                    id_documento TEXT PRIMARY KEY,
+                    sha256 TEXT NOT NULL REFERENCES objetos(sha256),
+                    content_type TEXT
+                );
+                CREATE INDEX IF NOT EXISTS idx_documentos_sha256 ON documentos(sha256);
+            """)
+
+    def caminho_objeto(self, sha256: str) -> str:
+        """
+        Retorna o caminho do objeto com o hash informado dentro do armazém.
+        """
+        return os.path.join(self.diretorio, 'objetos', sha256[:2], sha256)
+
+    def buscar(self, id_documento: str) -> dict:
+        """
+        Procura um documento no armazém.
+
+        :param id_documento: ID do documento no PAJ.
+        :return: Dicionário com sha256, tamanho, contentType e caminho do objeto, ou None se não estiver no armazém.
+        """
+        with self._trava:
+            linha = self._conexao.execute(
+                "SELECT d.sha256, o.tamanho, d.content_type FROM documentos d "
+                "JOIN objetos o ON o.sha256 = d.sha256 WHERE d.id_documento = ?",
+                (str(id_documento),)
+            ).fetchone()
+            if linha is None:
+                return None
+            sha256, tamanho, content_type = linha
+            caminho = self.caminho_objeto(sha256)
+            if not os.path.exists(caminho):
+                # Objeto apagado por fora do armazém: esquece o registro
+                self._remover_objeto(sha256)
+                return None
+            with self._conexao:
+                self._conexao.execute("UPDATE objetos SET ultimo_acesso = ? WHERE sha256 = ?", (time.time(), sha256))
+        return {'sha256': sha256, 'tamanho': tamanho, 'contentType': content_type, 'caminho': caminho}
+
+    def guardar_arquivo(self, id_documento: str, caminho_arquivo: str, content_type: str = None, sha256: str = None) -> dict:
+        """
+        Guarda no armazém uma cópia de um arquivo já baixado. O arquivo original continua no lugar.
+
+        :param id_documento: ID do documento no PAJ.
+        :param caminho_arquivo: Caminho do arquivo a guardar.
+        :param content_type: Content-Type retornado pelo PAJ.
+        :param sha256: (Opcional) Hash já calculado do arquivo, para não ler o arquivo de novo.
+        :return: Registro do documento, como em buscar.
+        """
+        if sha256 is None:
+            hash_arquivo = hashlib.sha256()
+            with open(caminho_arquivo, 'rb') as f:
+                for bloco in iter(lambda: f.read(1024 * 1024), b''):
+                    hash_arquivo.update(bloco)
+            sha256 = hash_arquivo.hexdigest()
+
+        destino = self.caminho_objeto(sha256)
+        if not os.path.exists(destino):
+            with open(caminho_arquivo, 'rb') as origem:
+                _gravar_atomico(destino, lambda f: shutil.copyfileobj(origem, f))
+        return self._registrar(id_documento, sha256, os.path.getsize(destino), content_type)
+
+    def guardar_bytes(self, id_documento: str, dados: bytes, content_type: str = None) -> dict:
+        """
+        Guarda no armazém o conteúdo de um documento já em memória.
+
+        :param id_documento: ID do documento no PAJ.
+        :param dados: Conteúdo do documento.
+        :param content_type: Content-Type retornado pelo PAJ.
+        :return: Registro do documento, como em buscar.
+        """
+        sha256 = hashlib.sha256(dados).hexdigest()
+        destino = self.caminho_objeto(sha256)
+        if not os.path.exists(destino):
+            _gravar_atomico(destino, lambda f: f.write(dados))
+        return self._registrar(id_documento, sha256, len(dados), content_type)
+
+    def materializar(self, sha256: str, caminho_destino: str):
+        """
+        Coloca o objeto no caminho do chamador, por hard link quando possível ou por cópia.
+
+        :param sha256: Hash do objeto.
+        :param caminho_destino: Caminho (incluindo o nome do arquivo) onde o documento deve aparecer.
+        """
+        if os.path.exists(caminho_destino):
+            os.remove(caminho_destino)
+        _vincular_ou_copiar(self.caminho_objeto(sha256), caminho_destino)
+
+    def tamanho_total(self) -> int:
+        """
+        Retorna o tamanho total dos objetos guardados, em bytes.
+        """
+        with self._trava:
+            return self._conexao.execute("SELECT COALESCE(SUM(tamanho), 0) FROM objetos").fetchone()[0]
+
+    def _registrar(self, id_documento: str, sha256: str, tamanho: int, content_type: str) -> dict:
+        with self._trava:
+            with self._conexao:
+                self._conexao.execute(
+                    "INSERT INTO objetos (sha256, tamanho, ultimo_acesso) VALUES (?, ?, ?) "
+                    "ON CONFLICT(sha256) DO UPDATE SET ultimo_acesso = excluded.ultimo_acesso",
+                    (sha256, tamanho, time.time())
+                )
+                self._conexao.execute(
+                    "INSERT OR REPLACE INTO documentos (id_documento, sha256, content_type) VALUES (?, ?, ?)",
+                    (str(id_documento), sha256, content_type)
+                )
+            self._liberar_espaco(manter=sha256)
+        return {'sha256': sha256, 'tamanho': tamanho, 'contentType': content_type, 'caminho': self.caminho_objeto(sha256)}
+
+    def _liberar_espaco(self, manter: str = None):
+        # Remove os objetos usados há mais tempo até o armazém caber no limite
+        if self.limite_bytes is None:
+            return
+        total = self._conexao.execute("SELECT COALESCE(SUM(tamanho), 0) FROM objetos").fetchone()[0]
+        if total <= self.limite_bytes:
+            return
+        for sha256, tamanho in self._conexao.execute(
+            "SELECT sha256, tamanho FROM objetos ORDER BY ultimo_acesso"
+        ).fetchall():
+            if total <= self.limite_bytes:
+                break
+            if sha256 == manter:
+                continue
+            self._remover_objeto(sha256)
+            total -= tamanho
+
+    def _remover_objeto(self, sha256: str):
+        caminho = self.caminho_objeto(sha256)
+        if os.path.exists(caminho):
+            os.remove(caminho)
+        with self._conexao:
+            self._conexao.execute("DELETE FROM documentos WHERE sha256 = ?", (sha256,))
+            self._conexao.execute("DELETE FROM objetos WHERE sha256 = ?", (sha256,))
+
+def _gravar_atomico(destino: str, escrever):
+    """
+    Grava um objeto em um arquivo temporário único na mesma pasta e o troca pelo destino.
+    Duas threads guardando o mesmo conteúdo usam temporários diferentes; a última troca vence, com o mesmo conteúdo.
+
+    :param destino: Caminho final do objeto.
+    :param escrever: Função que recebe o arquivo temporário aberto em modo binário e escreve o conteúdo.
+    """
+    pasta = os.path.dirname(destino)
+    os.makedirs(pasta, exist_ok=True)
+    descritor, temporario = tempfile.mkstemp(dir=pasta, suffix='.tmp')
+    try:
+        with os.fdopen(descritor, 'wb') as f:
+            escrever(f)
+        # mkstemp cria o arquivo só para o dono; os objetos são materializados por hard link no caminho do usuário
+        os.chmod(temporario, 0o644)
+        os.replace(temporario, destino)
+    except BaseException:
+        if os.path.exists(temporario):
+            os.remove(temporario)
+        raise
+
+def _vincular_ou_copiar(origem: str, destino: str):
+    try:
+        os.link(origem, destino)
+    except OSError:
+        # Discos diferentes ou sistema de arquivos sem hard link
+        shutil.copyfile(origem, destino)
+
+_armazem_padrao = None
+
+def configurar_armazem_padrao(armazem: ArmazemDocumentos):
+    """
+    Define o armazém consultado pelas funções de download quando nenhum é informado.
+
+    :param armazem: Instância de ArmazemDocumentos, ou None para desativar.
+    """
+    global _armazem_padrao
+    _armazem_padrao = armazem
+
+def armazem_padrao() -> ArmazemDocumentos:
+    """
+    Retorna o armazém configurado por configurar_armazem_padrao, ou None.
+    """
+    return _armazem_padrao
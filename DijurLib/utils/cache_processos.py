@@ -0,0 +1,156 @@
+import json
+import sqlite3
+import threading
+import time
+
+from .decodificador import carregar_json
+
+# Validade (em segundos) de cada tipo de registro guardado
+VALIDADES_PADRAO = {
+    'npj': 7 * 24 * 3600,             # get_processos_npj: NPJ -> processos e variações
+    'numero_processo': 24 * 3600,     # get_processo_numerodoprocesso: número externo -> processos
+    'numeros': 24 * 3600,             # npj_dados_numeros: idNpj -> UF, CNJ, publicação e outros números
+    'totais_dia': float('inf'),       # serie_tratamento_publicacoes: totais de um dia já encerrado não mudam mais
+}
+
+class CacheProcessos:
+    """
+    Cache em disco (SQLite) dos metadados de processos consultados no PAJ, mantido entre execuções.
+
+    O banco usa o modo WAL, então vários processos podem ler e gravar no mesmo arquivo ao mesmo tempo.
+    Cada registro guarda o momento em que foi obtido; registros mais velhos que a validade do seu tipo
+    são ignorados e buscados de novo no PAJ.
+
+    Exemplo de uso:
+        >>> configurar_cache_processos(CacheProcessos('C:/dijur/processos.sqlite3'))
+        >>> get_processos_npj(driver, '2025/0019564-002')  # a segunda execução do dia não vai ao PAJ
+    """
+
+    def __init__(self, caminho: str, validades: dict = None):
+        """
+        :param caminho: Caminho do arquivo SQLite.
+        :param validades: (Opcional) Dicionário {tipo: validade em segundos}, sobrepondo VALIDADES_PADRAO.
+        """
+        self.caminho = caminho
+        self.validades = {**VALIDADES_PADRAO, **(validades or {})}
+        self._trava = threading.Lock()
+        self._conexao = sqlite3.connect(caminho, timeout=30, check_same_thread=False)
+        with self._conexao:
+            self._conexao.execute("PRAGMA journal_mode=WAL")
+            self._conexao.execute("PRAGMA synchronous=NORMAL")
+            self._conexao.execute("""
+                CREATE TABLE IF NOT EXISTS registros (
+                    tipo TEXT NOT NULL,
+                    chave TEXT NOT NULL,
+                    dados TEXT NOT NULL,
+                    obtido_em REAL NOT NULL,
+                    PRIMARY KEY (tipo, chave)
+                )
+            """)
+
+    def obter(self, tipo: str, chave, validade: float = None):
+        """
+        Retorna o registro guardado, ou None se ele não existir ou estiver vencido.
+
+        :param tipo: Tipo do registro (ex: 'npj', 'numero_processo', 'numeros').
+        :param chave: Chave consultada (NPJ, número do processo ou idNpj).
+        :param validade: (Opcional) Validade em segundos para esta consulta. Se None, usa a validade do tipo.
+        """
+        if validade is None:
+            validade = self.validades.get(tipo, 0)
+        with self._trava:
+            linha = self._conexao.execute(
+                "SELECT dados, obtido_em FROM registros WHERE tipo = ? AND chave = ?",
+                (tipo, str(chave))
+            ).fetchone()
+        if linha is None or time.time() - linha[1] > validade:
+            return None
+        return carregar_json(linha[0])
+
+    def guardar(self, tipo: str, chave, dados):
+        """
+        Guarda (ou substitui) um registro.
+
+        :param tipo: Tipo do registro.
+        :param chave: Chave do registro.
+        :param dados: Dados já tratados pela função de consulta (precisam ser serializáveis em JSON).
+        """
+        with self._trava:
+            with self._conexao:
+                self._conexao.execute(
+                    "INSERT OR REPLACE INTO registros (tipo, chave, dados, obtido_em) VALUES (?, ?, ?, ?)",
+                    (tipo, str(chave), json.dumps(dados, ensure_ascii=False), time.time())
+                )
+
+    def invalidar(self, id_npj: int = None, tipo: str = None):
+        """
+        Descarta registros.
+
+        :param id_npj: (Opcional) Descarta os registros do NPJ (inclusive das variações, cuja chave começa pelo ID).
+        :param tipo: (Opcional) Descarta somente os registros deste tipo.
+        Sem argumentos, descarta tudo.
+        """
+        condicoes, parametros = [], []
+        if id_npj is not None:
+            condicoes.append("(chave = ? OR chave LIKE ?)")
+            parametros += [str(id_npj), f"{id_npj}%"]
+        if tipo is not None:
+            condicoes.append("tipo = ?")
+            parametros.append(tipo)
+        sql = "DELETE FROM registros"
+        if condicoes:
+            sql += " WHERE " + " AND ".join(condicoes)
+        with self._trava:
+            with self._conexao:
+                self._conexao.execute(sql, parametros)
+
+    def limpar_vencidos(self) -> int:
+        """
+        Remove do arquivo os registros vencidos.
+
+        :return: Quantidade de registros removidos.
+        """
+        agora = time.time()
+        removidos = 0
+        with self._trava:
+            with self._conexao:
+                for tipo, validade in self.validades.items():
+                    removidos += self._conexao.execute(
+                        "DELETE FROM registros WHERE tipo = ? AND obtido_em < ?", (tipo, agora - validade)
+                    ).rowcount
+        return removidos
+
+    def fechar(self):
+        """
+        Fecha a conexão com o arquivo.
+        """
+        with self._trava:
+            self._conexao.close()
+
+_cache_processos = None
+
+def configurar_cache_processos(cache: CacheProcessos):
+    """
+    Ativa o cache em disco consultado por get_processos_npj, get_processo_numerodoprocesso, npj_dados_numeros
+    e serie_tratamento_publicacoes.
+
+    :param cache: Instância de CacheProcessos, ou None para desativar.
+    """
+    global _cache_processos
+    _cache_processos = cache
+
+def cache_processos() -> CacheProcessos:
+    """
+    Retorna o cache configurado por configurar_cache_processos, ou None.
+    """
+    return _cache_processos
+
+def invalidar_cache_processos(id_npj: int = None, tipo: str = None):
+    """
+    Descarta registros do cache configurado (não faz nada se o cache estiver desativado).
+
+    :param id_npj: (Opcional) ID do NPJ alterado.
+    :param tipo: (Opcional) Tipo de registro a descartar.
+    """
+    if _cache_processos is not None:
+        _cache_processos.invalidar(id_npj=id_npj, tipo=tipo)
@@ -0,0 +1,129 @@
+import sys
+from typing import Iterable, List
+
+from .schema.schemaPublicacoes import Publicacao
+from .schema.schemaNpjAndamentos import Andamento
+
+class _RegistroCompacto:
+    """
+    Base dos registros compactos: um atributo por campo do schema (__slots__, sem dicionário por instância).
+    Aceita também a leitura como dicionário (registro['campo'], registro.get('campo')), então funções como
+    filtrar_andamentos e MotorRegras.avaliar funcionam sem conversão.
+    """
+    __slots__ = ()
+    _CAMPOS: tuple = ()
+    # Campos de texto que se repetem muito entre registros (códigos, nomes de tribunal, datas):
+    # guardados com sys.intern, para que todos os registros apontem para a mesma string
+    _INTERNADOS: frozenset = frozenset()
+
+    def __init__(self, dados: dict):
+        """
+        :param dados: Registro no formato do schema (campos ausentes ficam None; campos fora do schema são descartados).
+        """
+        internados = self._INTERNADOS
+        for campo in self._CAMPOS:
+            valor = dados.get(campo)
+            if campo in internados and type(valor) is str:
+                valor = sys.intern(valor)
+            setattr(self, campo, valor)
+
+    def __getitem__(self, campo: str):
+        if campo not in self._CAMPOS:
+            raise KeyError(campo)
+        return getattr(self, campo)
+
+    def get(self, campo: str, padrao=None):
+        if campo not in self._CAMPOS:
+            return padrao
+        return getattr(self, campo)
+
+    def keys(self) -> tuple:
+        return self._CAMPOS
+
+    def __contains__(self, campo: str) -> bool:
+        return campo in self._CAMPOS
+
+    def para_dict(self) -> dict:
+        """
+        Converte o registro de volta para dicionário, no formato do schema.
+        """
+        return {campo: getattr(self, campo) for campo in self._CAMPOS}
+
+    def __eq__(self, outro) -> bool:
+        if type(outro) is not type(self):
+            return NotImplemented
+        return all(getattr(self, campo) == getattr(outro, campo) for campo in self._CAMPOS)
+
+    __hash__ = None
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({self.para_dict()!r})"
+
+class PublicacaoCompacta(_RegistroCompacto):
+    """
+    Publicação com os mesmos campos do schema Publicacao, em __slots__.
+
+    Exemplo de uso:
+        >>> publicacoes = listar_publicacoes(driver, 'todas', 'stj', compacto=True)['listaPublicacao']
+        >>> publicacoes[0].numeroPublicacaoJudicial
+        >>> publicacoes[0]['textoPublicacaoJudicial']
+        >>> publicacoes[0].para_dict()
+    """
+    _CAMPOS = tuple(Publicacao.__annotations__)
+    __slots__ = _CAMPOS
+    _INTERNADOS = frozenset((
+        'codigoEstadoPublicacaoJudicial',
+        'codigoIdentificadorJornalOficial',
+        'dataDivulgacao',
+        'dataPublicacao',
+        'dataRecebimento',
+        'nomeEmpresaResponsavel',
+    ))
+
+class AndamentoCompacto(_RegistroCompacto):
+    """
+    Andamento com os mesmos campos do schema Andamento, em __slots__.
+
+    Exemplo de uso:
+        >>> andamentos = listar_andamentos(driver, 123456789, compacto=True)
+        >>> filtrar_andamentos(andamentos, 'PETICAO')
+        >>> [andamento.para_dict() for andamento in andamentos]
+    """
+    _CAMPOS = tuple(Andamento.__annotations__)
+    __slots__ = _CAMPOS
+    _INTERNADOS = frozenset((
+        'textoTipoAndamento',
+        'textoTipoCategoriaAndamento',
+        'textoGrupoTipoAndamento',
+        'codigoTipoSolicitanteAndamento',
+        'textoTipoSolicitanteAndamento',
+        'dataAndamento',
+        'codigoUsuarioResponsavelAtualizacao',
+        'codigoUsuarioResponsavelAndamento',
+        'indicadorAndamentoCompleto',
+        'indicadorRegistroAtivo',
+        'indicadorDocumentoDigitalizado',
+        'indicadorControleMensagemInterno',
+        'indicadorIncentivoJuridicoNegocial',
+        'indicadorDocumentoDigitalizadoMigrado',
+        'textoTag',
+    ))
+
+def compactar_publicacoes(publicacoes: Iterable[Publicacao]) -> List[PublicacaoCompacta]:
+    """
+    Converte publicações (no formato do schema Publicacao) em PublicacaoCompacta.
+    Aceita também o gerador de iter_publicacoes, sem guardar a lista de dicionários.
+
+    :param publicacoes: Publicações no formato do schema Publicacao.
+    :return: Lista de PublicacaoCompacta, na mesma ordem.
+    """
+    return [PublicacaoCompacta(publicacao) for publicacao in publicacoes]
+
+def compactar_andamentos(andamentos: Iterable[Andamento]) -> List[AndamentoCompacto]:
+    """
+    Converte andamentos (no formato do schema Andamento) em AndamentoCompacto.
+
+    :param andamentos: Andamentos no formato do schema Andamento.
+    :return: Lista de AndamentoCompacto, na mesma ordem.
+    """
+    return [AndamentoCompacto(andamento) for andamento in andamentos]
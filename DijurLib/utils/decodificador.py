@@ -0,0 +1,25 @@
+import json
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+def carregar_json(texto):
+    """
+    Converte o texto de uma resposta em objetos Python usando o decodificador JSON mais rápido disponível:
+    orjson, se estiver instalado (pip install orjson), senão o json da biblioteca padrão.
+
+    :param texto: Corpo da resposta em str ou bytes.
+    :return: Objeto Python correspondente ao JSON.
+    :raises ValueError: Se o texto não for um JSON válido.
+    """
+    if orjson is not None:
+        return orjson.loads(texto)
+    return json.loads(texto)
+
+def decodificador_ativo() -> str:
+    """
+    Retorna o nome do decodificador JSON em uso ('orjson' ou 'json').
+    """
+    return 'orjson' if orjson is not None else 'json'
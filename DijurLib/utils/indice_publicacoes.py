@@ -0,0 +1,145 @@
+import sqlite3
+import threading
+import time
+from typing import Iterable, List
+
+from .texto import remover_acentos
+
+class IndicePublicacoes:
+    """
+    Índice local (SQLite FTS5) dos textos das publicações, para buscar nomes de partes, números de OAB
+    e números de processo sem baixar e percorrer as publicações de novo.
+
+    As funções de listagem de publicações (listar_publicacoes, iter_publicacoes, consultar_publicacoes...) recebem
+    o índice no parâmetro `indice` e gravam nele cada página recebida. Cada publicação é guardada pelo
+    numeroPublicacaoJudicial; gravar de novo a mesma publicação substitui a anterior (ex: mudança de estado).
+
+    Os textos e as buscas passam pela mesma remoção de acentos de comparar_str, e o tokenizador unicode61
+    ignora maiúsculas e minúsculas, então 'Jose' encontra 'JOSÉ'.
+
+    Exemplo de uso:
+        >>> indice = IndicePublicacoes('C:/dijur/publicacoes.sqlite3')
+        >>> listar_publicacoes(driver, 'todas', 'stj', indice=indice)
+        >>> indice.buscar_frase('Banco do Brasil')
+        [123456, 123470]
+        >>> indice.buscar_prefixo('OAB/DF 123')
+    """
+
+    def __init__(self, caminho: str = 'indice_publicacoes.sqlite3'):
+        """
+        :param caminho: Caminho do arquivo SQLite (padrão: 'indice_publicacoes.sqlite3'). ':memory:' mantém o índice só em memória.
+        """
+        self.caminho = caminho
+        self._trava = threading.Lock()
+        self._conexao = sqlite3.connect(caminho, timeout=30, check_same_thread=False)
+        with self._conexao:
+            self._conexao.execute("PRAGMA journal_mode=WAL")
+            self._conexao.execute("PRAGMA synchronous=NORMAL")
+            # rowid = numeroPublicacaoJudicial; as colunas UNINDEXED só são guardadas, não entram na busca
+            self._conexao.execute("""
+                CREATE VIRTUAL TABLE IF NOT EXISTS publicacoes USING fts5(
+                    texto,
+                    processo,
+                    tribunal UNINDEXED,
+                    estado UNINDEXED,
+                    dataDivulgacao UNINDEXED,
+                    atualizadoEm UNINDEXED,
+                    tokenize = 'unicode61 remove_diacritics 2'
+                )
+            """)
+
+    def guardar(self, publicacoes: Iterable[dict]) -> int:
+        """
+        Grava (ou substitui) publicações no índice, em uma única transação.
+
+        :param publicacoes: Publicações no formato do schema Publicacao.
+        :return: Quantidade de publicações gravadas.
+        """
+        agora = time.time()
+        linhas = [
+            (
+                int(pub["numeroPublicacaoJudicial"]),
+                remover_acentos(pub.get("textoPublicacaoJudicial") or ""),
+                pub.get("numeroProcessoCompleto") or "",
+                pub.get("codigoIdentificadorJornalOficial"),
+                pub.get("codigoEstadoPublicacaoJudicial"),
+                pub.get("dataDivulgacao"),
+                agora,
+            )
+            for pub in publicacoes
+        ]
+        if not linhas:
+            return 0
+        with self._trava:
+            with self._conexao:
+                self._conexao.executemany("DELETE FROM publicacoes WHERE rowid = ?", [(linha[0],) for linha in linhas])
+                self._conexao.executemany(
+                    "INSERT INTO publicacoes (rowid, texto, processo, tribunal, estado, dataDivulgacao, atualizadoEm) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    linhas
+                )
+        return len(linhas)
+
+    def buscar(self, expressao: str, limite: int = None) -> List[int]:
+        """
+        Busca com a sintaxe do FTS5 (ex: 'banco NEAR(brasil)', 'joao AND silva', '"recurso especial" OR agravo').
+
+        :param expressao: Expressão de busca do FTS5. Os operadores (AND, OR, NOT, NEAR) devem estar em maiúsculas.
+        :param limite: (Opcional) Número máximo de resultados.
+        :return: Lista de numeroPublicacaoJudicial, das mais relevantes para as menos relevantes.
+        """
+        sql = "SELECT rowid FROM publicacoes WHERE publicacoes MATCH ? ORDER BY rank"
+        parametros = [remover_acentos(expressao)]
+        if limite is not None:
+            sql += " LIMIT ?"
+            parametros.append(limite)
+        with self._trava:
+            return [linha[0] for linha in self._conexao.execute(sql, parametros)]
+
+    def buscar_frase(self, frase: str, limite: int = None) -> List[int]:
+        """
+        Busca as publicações que contêm a frase exata (ignorando acentos, maiúsculas e pontuação).
+        Serve também para números de processo: '0001234-56.2024.5.02.0001' é buscado como a sequência dos seus números.
+
+        :param frase: Frase a buscar.
+        :param limite: (Opcional) Número máximo de resultados.
+        :return: Lista de numeroPublicacaoJudicial.
+        """
+        return self.buscar(_frase(frase), limite)
+
+    def buscar_prefixo(self, prefixo: str, limite: int = None) -> List[int]:
+        """
+        Busca as publicações com uma frase cuja última palavra começa pelo prefixo (ex: 'OAB/DF 123' encontra 'OAB/DF 12345').
+
+        :param prefixo: Início da frase a buscar.
+        :param limite: (Opcional) Número máximo de resultados.
+        :return: Lista de numeroPublicacaoJudicial.
+        """
+        return self.buscar(_frase(prefixo) + '*', limite)
+
+    def remover(self, numeros: Iterable[int]):
+        """
+        Remove publicações do índice.
+
+        :param numeros: Lista de numeroPublicacaoJudicial.
+        """
+        with self._trava:
+            with self._conexao:
+                self._conexao.executemany("DELETE FROM publicacoes WHERE rowid = ?", [(int(numero),) for numero in numeros])
+
+    def quantidade(self) -> int:
+        """
+        Retorna a quantidade de publicações no índice.
+        """
+        with self._trava:
+            return self._conexao.execute("SELECT count(*) FROM publicacoes").fetchone()[0]
+
+    def fechar(self):
+        """
+        Fecha a conexão com o arquivo.
+        """
+        with self._trava:
+            self._conexao.close()
+
+def _frase(texto: str) -> str:
+    # Aspas duplas dentro da frase são escapadas dobrando-as (sintaxe do FTS5)
+    return '"' + texto.replace('"', '""') + '"'
@@ -1,6 +1,3 @@
-from selenium import webdriver
-from selenium.webdriver.support.ui import WebDriverWait
-
 # Inicializar o navegador Edge usando webdriver-manager
 def iniciar_navegador(headless: bool = False, wait_time: int = 30):
     """
@@ -12,6 +9,10 @@ def iniciar_navegador(headless: bool = False, wait_time: int = 30):
     :param wait_time: Tempo máximo de espera para localizar elementos na página
     :return: Instância do WebDriver do Selenium e wait
     """
+    # O Selenium só é carregado quando um navegador é de fato iniciado
+    from selenium import webdriver
+    from selenium.webdriver.support.ui import WebDriverWait
+
     options = webdriver.EdgeOptions()
     if headless:
         options.add_argument('--headless')
@@ -27,4 +28,44 @@ def iniciar_navegador(headless: bool = False, wait_time: int = 30):
     driver.maximize_window()
     
     wait = WebDriverWait(driver, wait_time)
-    return driver, wait
\ No newline at end of file
+    return driver, wait
+
+URL_PAJ = 'https://juridico.intranet.bb.com.br/paj/app/'
+
+def aplicar_cookies(driver, cookies: list, url: str = URL_PAJ):
+    """
+    Copia cookies autenticados (ex: obtidos com driver.get_cookies() de outro navegador) para o navegador informado.
+    O Selenium só aceita cookies do domínio da página aberta, então a página do PAJ é aberta antes e recarregada depois.
+    Cookies de outros domínios (ex: os do SSO, gravados durante o login) são aplicados abrindo antes uma página
+    do domínio de cada um; os que não puderem ser aplicados são informados.
+
+    :param driver: Instância do WebDriver do Selenium que receberá os cookies.
+    :param cookies: Lista de cookies no formato de driver.get_cookies().
+    :param url: Página aberta para receber os cookies (padrão: página inicial do PAJ).
+    """
+    driver.get(url)
+    protocolo, _, dominio = url.split('/')[:3]
+    outros_dominios = {}
+    for cookie in cookies:
+        cookie = {chave: valor for chave, valor in cookie.items() if chave != 'sameSite' or valor in ('Strict', 'Lax', 'None')}
+        dominio_cookie = cookie.get('domain', '').lstrip('.')
+        if not dominio.endswith(dominio_cookie):
+            outros_dominios.setdefault(dominio_cookie, []).append(cookie)
+            continue
+        _adicionar_cookie(driver, cookie)
+
+    for dominio_cookie, lista in outros_dominios.items():
+        try:
+            driver.get(f'{protocolo}//{dominio_cookie}/')
+        except Exception as e:
+            print(f"Não foi possível abrir {dominio_cookie} para aplicar {len(lista)} cookies: {e}")
+            continue
+        for cookie in lista:
+            _adicionar_cookie(driver, cookie)
+    driver.get(url)
+
+def _adicionar_cookie(driver, cookie: dict):
+    try:
+        driver.add_cookie(cookie)
+    except Exception as e:
+        print(f"Cookie {cookie.get('name')} do domínio {cookie.get('domain')} não aplicado: {e}")
@@ -0,0 +1,201 @@
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+import threading
+
+from .navegador import iniciar_navegador, aplicar_cookies
+
+def navegador_saudavel(driver) -> bool:
+    """
+    Verifica se o navegador continua respondendo e com a página do PAJ aberta.
+
+    :param driver: Instância do WebDriver do Selenium.
+    :return: True se o navegador pode continuar sendo usado.
+    """
+    try:
+        driver.execute_script('return document.readyState;')
+        return 'juridico.intranet.bb.com.br' in driver.current_url
+    except Exception:
+        return False
+
+class DriverPool:
+    """
+    Conjunto de navegadores headless autenticados, para rodar funções de DijurLib.api em paralelo.
+
+    Uma sessão do WebDriver não é thread-safe, então um único navegador serializa todo o trabalho.
+    O pool abre N navegadores Edge headless, copia para eles os cookies de um único login e distribui
+    os itens entre threads com filas de roubo de trabalho: cada thread consome a sua fila e, quando ela
+    esvazia, pega itens do fim da fila de outra thread. Navegadores que travam ou fecham são substituídos
+    automaticamente; o item só é repetido no navegador novo se o chamador pedir (ver map).
+
+    Exemplo de uso:
+        >>> driver, wait = iniciar_navegador()
+        >>> login_com_chave(driver, wait, chave, senha)
+        >>> with DriverPool(driver, tamanho=4) as pool:
+        ...     resultados = pool.map(npj_dados_processo, lista_id_npj)
+    """
+
+    def __init__(self, driver_origem, tamanho: int = 4, wait_time: int = 30):
+        """
+        :param driver_origem: Navegador já autenticado no PAJ; os cookies dele são copiados para o pool.
+        :param tamanho: Número de navegadores do pool (padrão: 4).
+        :param wait_time: Tempo máximo de espera dos navegadores do pool (padrão: 30).
+        """
+        self.cookies = driver_origem.get_cookies()
+        self.wait_time = wait_time
+        self._trava = threading.Lock()
+        self.substituicoes = 0
+
+        print(f"Iniciando pool com {tamanho} navegadores...")
+        with ThreadPoolExecutor(max_workers=tamanho) as executor:
+            futuros = [executor.submit(self._novo_driver) for _ in range(tamanho)]
+        drivers = []
+        erro = None
+        for futuro in futuros:
+            try:
+                drivers.append(futuro.result())
+            except Exception as e:
+                erro = erro or e
+        if erro is not None:
+            # Um navegador não abriu: fecha os que já abriram antes de desistir
+            for driver in drivers:
+                try:
+                    driver.quit()
+                except Exception:
+                    pass
+            raise erro
+        self.drivers = drivers
+        print("Pool de navegadores pronto.")
+
+    def _novo_driver(self):
+        driver, _ = iniciar_navegador(headless=True, wait_time=self.wait_time)
+        aplicar_cookies(driver, self.cookies)
+        return driver
+
+    def _substituir(self, posicao: int):
+        driver_antigo = self.drivers[posicao]
+        try:
+            driver_antigo.quit()
+        except Exception:
+            pass
+        print(f"Substituindo o navegador {posicao} do pool...")
+        self.drivers[posicao] = self._novo_driver()
+        with self._trava:
+            self.substituicoes += 1
+
+    def atualizar_cookies(self, cookies: list):
+        """
+        Troca os cookies usados pelo pool (ex: depois de um novo login) e os aplica a todos os navegadores.
+
+        :param cookies: Lista de cookies no formato de driver.get_cookies().
+        """
+        self.cookies = cookies
+        for driver in self.drivers:
+            aplicar_cookies(driver, cookies)
+
+    def verificar(self) -> int:
+        """
+        Verifica todos os navegadores e substitui os que não respondem.
+
+        :return: Quantidade de navegadores substituídos.
+        """
+        substituidos = 0
+        for posicao, driver in enumerate(self.drivers):
+            if not navegador_saudavel(driver):
+                self._substituir(posicao)
+                substituidos += 1
+        return substituidos
+
+    def map(self, fn, items, ignorar_erros: bool = False, repetir: bool = False) -> list:
+        """
+        Executa fn(driver, item) para cada item, usando todos os navegadores do pool.
+
+        :param fn: Função que recebe o navegador e o item (ex: qualquer função de DijurLib.api com um só argumento além do driver).
+        :param items: Itens a processar.
+        :param ignorar_erros: Se True, os itens que falharem recebem {'error': ...} no resultado;
+                              se False, a primeira exceção é levantada depois que todos os itens forem processados.
+                              Uma falha ao abrir o navegador substituto conta como erro do item, e a thread
+                              daquele navegador para; as demais continuam com os itens restantes.
+        :param repetir: Se True, um item cujo navegador caiu é repetido uma vez no navegador substituto.
+                        Use só com funções idempotentes (consultas); em gravações (cadastro, tratamento de
+                        publicações) a requisição pode já ter sido aplicada. Padrão: False.
+        :return: Lista com os resultados, na mesma ordem dos itens.
+        """
+        items = list(items)
+        resultados = [None] * len(items)
+        erros = {}
+        filas = [deque() for _ in self.drivers]
+        travas = [threading.Lock() for _ in self.drivers]
+        for indice, item in enumerate(items):
+            filas[indice % len(filas)].append((indice, item))
+
+        def proximo(posicao: int):
+            # Primeiro a própria fila; depois rouba do fim da fila mais cheia
+            with travas[posicao]:
+                if filas[posicao]:
+                    return filas[posicao].popleft()
+            for vitima in sorted(range(len(filas)), key=lambda i: -len(filas[i])):
+                if vitima == posicao:
+                    continue
+                with travas[vitima]:
+                    if filas[vitima]:
+                        return filas[vitima].pop()
+            return None
+
+        def trabalhador(posicao: int):
+            while True:
+                tarefa = proximo(posicao)
+                if tarefa is None:
+                    return
+                indice, item = tarefa
+                for tentativa in range(2):
+                    try:
+                        resultados[indice] = fn(self.drivers[posicao], item)
+                        erros.pop(indice, None)
+                        break
+                    except Exception as e:
+                        erros[indice] = e
+                        if navegador_saudavel(self.drivers[posicao]):
+                            # O navegador está bem: o erro é do item, não adianta repetir
+                            break
+                        try:
+                            self._substituir(posicao)
+                        except Exception as erro_substituicao:
+                            print(f"Não foi possível substituir o navegador {posicao} do pool: {erro_substituicao}")
+                            erros[indice] = erro_substituicao
+                            # Sem navegador, esta thread para; os itens da fila dela são roubados pelas demais
+                            return
+                        if not repetir:
+                            # fn pode ter gravado algo no PAJ antes de o navegador cair: o erro fica registrado
+                            break
+
+        with ThreadPoolExecutor(max_workers=len(self.drivers)) as executor:
+            list(executor.map(trabalhador, range(len(self.drivers))))
+
+        # Itens que sobraram nas filas: todas as threads ficaram sem navegador
+        for fila in filas:
+            for indice, _ in fila:
+                erros[indice] = Exception("Nenhum navegador do pool disponível para processar o item.")
+
+        if erros:
+            print(f"{len(erros)} de {len(items)} itens falharam no pool.")
+            if not ignorar_erros:
+                raise erros[min(erros)]
+            for indice, erro in erros.items():
+                resultados[indice] = {'error': str(erro)}
+        return resultados
+
+    def fechar(self):
+        """
+        Fecha todos os navegadores do pool.
+        """
+        for driver in self.drivers:
+            try:
+                driver.quit()
+            except Exception:
+                pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.fechar()
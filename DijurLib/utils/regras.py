@@ -0,0 +1,253 @@
+import re
+from typing import Iterable, List, Optional
+
+from .texto import normalizar_texto, remover_acentos
+from .schema.schemaPublicacoes import DecisaoPublicacao, RegraPublicacao
+
+# Palavras do texto normalizado: letras e números; a pontuação separa as palavras
+_PALAVRA = re.compile(r'[a-z0-9]+')
+
+# Ações aceitas pelas regras (as mesmas de tratar_publicacoes_em_lote)
+ACOES_REGRAS = ('indicar', 'descartar', 'bbnaoparte')
+
+def palavras_normalizadas(texto: str) -> List[str]:
+    """
+    Divide um texto em palavras sem acentos, em minúsculas e sem pontuação.
+
+    :param texto: Texto a ser dividido.
+    :return: Lista de palavras.
+    :example: palavras_normalizadas("BANCO DO BRASIL S.A.") -> ['banco', 'do', 'brasil', 's', 'a']
+    """
+    return _PALAVRA.findall(normalizar_texto(texto))
+
+class AutomatoPalavras:
+    """
+    Automato de Aho-Corasick sobre palavras: encontra, em uma única passada pelo texto, todas as expressões
+    (sequências de palavras) de uma lista, não importa quantas sejam.
+
+    Cada passo consome uma palavra do texto, e não um caractere, então as expressões só casam com palavras
+    inteiras ('banco' não casa com 'bancoop') e o custo por texto é proporcional ao número de palavras.
+
+    Exemplo de uso:
+        >>> automato = AutomatoPalavras(['banco do brasil', 'recurso especial'])
+        >>> automato.buscar(palavras_normalizadas('Recurso Especial interposto pelo BANCO DO BRASIL S.A.'))
+        {0, 1}
+    """
+
+    def __init__(self, expressoes: Iterable[str] = ()):
+        """
+        :param expressoes: Expressões a buscar; a posição de cada uma na lista é o seu identificador.
+        """
+        self._filhos = [{}]
+        self._falha = [0]
+        self._saidas = [()]
+        self.quantidade = 0
+        for expressao in expressoes:
+            self._adicionar(palavras_normalizadas(expressao))
+        self._construir_falhas()
+
+    def _adicionar(self, palavras: List[str]):
+        identificador = self.quantidade
+        self.quantidade += 1
+        if not palavras:
+            return
+        estado = 0
+        for palavra in palavras:
+            proximo = self._filhos[estado].get(palavra)
+            if proximo is None:
+                proximo = len(self._filhos)
+                self._filhos.append({})
+                self._falha.append(0)
+                self._saidas.append(())
+                self._filhos[estado][palavra] = proximo
+            estado = proximo
+        self._saidas[estado] += (identificador,)
+
+    def _construir_falhas(self):
+        # Busca em largura: a falha de um estado aponta para o maior sufixo que também é prefixo de alguma expressão.
+        # As saídas da falha são copiadas para o estado, então a busca não precisa percorrer a cadeia de falhas.
+        fila = list(self._filhos[0].values())
+        for estado in fila:
+            for palavra, filho in self._filhos[estado].items():
+                fila.append(filho)
+                falha = self._falha[estado]
+                while falha and palavra not in self._filhos[falha]:
+                    falha = self._falha[falha]
+                destino = self._filhos[falha].get(palavra, 0)
+                self._falha[filho] = destino if destino != filho else 0
+                self._saidas[filho] += self._saidas[self._falha[filho]]
+
+    def buscar(self, palavras: List[str]) -> set:
+        """
+        Retorna os identificadores das expressões encontradas na lista de palavras.
+
+        :param palavras: Palavras do texto (ver palavras_normalizadas).
+        """
+        filhos, falha, saidas = self._filhos, self._falha, self._saidas
+        raiz = filhos[0]
+        encontradas = set()
+        # Nenhuma palavra do texto começa uma expressão: nada a percorrer
+        if raiz.keys().isdisjoint(palavras):
+            return encontradas
+        estado = 0
+        for palavra in palavras:
+            if estado:
+                while estado and palavra not in filhos[estado]:
+                    estado = falha[estado]
+                estado = filhos[estado].get(palavra, 0)
+            else:
+                # Caso mais comum: fora de qualquer expressão, basta uma consulta na raiz
+                estado = raiz.get(palavra, 0)
+                if not estado:
+                    continue
+            if saidas[estado]:
+                encontradas.update(saidas[estado])
+        return encontradas
+
+class _Regra:
+    def __init__(self, posicao: int, regra: RegraPublicacao):
+        self.nome = regra.get('nome') or f'regra {posicao + 1}'
+        self.acao = str(regra.get('acao', '')).lower().strip()
+        if self.acao not in ACOES_REGRAS:
+            raise ValueError(f"{self.nome}: ação inválida {regra.get('acao')!r}. Use uma de {ACOES_REGRAS}.")
+        self.mensagem = regra.get('mensagem')
+        if self.acao == 'descartar' and not self.mensagem:
+            raise ValueError(f"{self.nome}: o descarte exige uma mensagem.")
+        self.npj = regra.get('npj')
+        self.id_npj = regra.get('id_npj')
+        self.npj_regex = re.compile(regra['npj_regex'], re.IGNORECASE) if regra.get('npj_regex') else None
+        if self.acao == 'indicar' and not (self.npj or self.id_npj or self.npj_regex):
+            raise ValueError(f"{self.nome}: a indicação exige npj, id_npj ou npj_regex.")
+
+        self.tribunais = {t.lower().strip() for t in regra.get('tribunais', ())} or None
+        self.estados = {e.lower().strip() for e in regra.get('estados', ())} or None
+        self.exige_palavra = bool(regra.get('palavras'))
+        self.exige_parte = bool(regra.get('partes'))
+        regex = regra.get('regex') or ()
+        if isinstance(regex, str):
+            regex = [regex]
+        self.regex = re.compile('|'.join(f'(?:{r})' for r in regex), re.IGNORECASE) if regex else None
+
+class MotorRegras:
+    """
+    Classifica publicações (no formato de listar_publicacoes) em decisões de tratamento, a partir de um
+    conjunto declarativo de regras, conforme o schema RegraPublicacao.
+
+    As palavras-chave, as palavras excluídas e os nomes de partes de todas as regras vão para um único
+    AutomatoPalavras, então cada texto é percorrido uma vez só, não importa quantas regras existam.
+    Tribunal e estado são conferidos antes; as expressões regulares só rodam para as regras que
+    passaram pelas demais condições. As regras são avaliadas na ordem da lista e a primeira que casar decide.
+
+    Condições de uma regra (todas as informadas precisam ser atendidas):
+        - tribunais / estados: a publicação é de um deles;
+        - palavras: o texto contém alguma das palavras ou expressões;
+        - partes: o texto contém algum dos nomes;
+        - regex: o texto (sem acentos) casa com alguma das expressões regulares;
+        - palavras_excluidas: o texto não contém nenhuma delas.
+    Palavras, partes e palavras excluídas são comparadas sem acentos, sem maiúsculas e sem pontuação,
+    com a mesma normalização de comparar_str e do IndicePublicacoes.
+
+    Exemplo de uso:
+        >>> motor = MotorRegras([
+        ...     {'nome': 'banco não é parte', 'acao': 'bbnaoparte', 'palavras_excluidas': ['banco do brasil'], 'estados': ['pendente']},
+        ...     {'nome': 'execução fiscal', 'acao': 'indicar', 'palavras': ['execução fiscal'], 'npj_regex': r'NPJ\\s*(\\d{4}/\\d{7}-\\d{3})'},
+        ... ])
+        >>> decisoes = motor.classificar(listar_publicacoes(driver, 'pendente', 'stj')['listaPublicacao'])
+        >>> tratar_publicacoes_em_lote(driver, decisoes)
+    """
+
+    def __init__(self, regras: List[RegraPublicacao]):
+        """
+        :param regras: Lista de regras, na ordem de prioridade.
+        :raises ValueError: Se alguma regra for inválida.
+        """
+        self.regras = [_Regra(posicao, regra) for posicao, regra in enumerate(regras)]
+
+        # Expressão normalizada -> identificador no automato; cada identificador aponta para (regra, tipo)
+        expressoes = {}
+        self._alvos = []
+        for posicao, regra in enumerate(regras):
+            for tipo, chave in (('palavra', 'palavras'), ('parte', 'partes'), ('excluida', 'palavras_excluidas')):
+                for expressao in regra.get(chave) or ():
+                    normalizada = ' '.join(palavras_normalizadas(expressao))
+                    if not normalizada:
+                        raise ValueError(f"{self.regras[posicao].nome}: expressão vazia em {chave}.")
+                    if normalizada not in expressoes:
+                        expressoes[normalizada] = len(expressoes)
+                        self._alvos.append([])
+                    self._alvos[expressoes[normalizada]].append((posicao, tipo))
+        self.automato = AutomatoPalavras(expressoes)
+        # Regras que não exigem palavras nem partes precisam ser conferidas em toda publicação;
+        # as demais, só quando o automato encontrou alguma expressão delas
+        self._sempre = {posicao for posicao, regra in enumerate(self.regras) if not (regra.exige_palavra or regra.exige_parte)}
+
+    def avaliar(self, publicacao: dict) -> Optional[DecisaoPublicacao]:
+        """
+        Aplica as regras a uma publicação.
+
+        :param publicacao: Publicação no formato do schema Publicacao.
+        :return: Decisão da primeira regra que casar (pronta para tratar_publicacoes_em_lote), ou None.
+        """
+        texto = publicacao.get('textoPublicacaoJudicial') or ''
+        encontradas = {}
+        for identificador in self.automato.buscar(palavras_normalizadas(texto)):
+            for posicao, tipo in self._alvos[identificador]:
+                encontradas.setdefault(posicao, set()).add(tipo)
+
+        tribunal = str(publicacao.get('codigoIdentificadorJornalOficial', '')).lower()
+        estado = str(publicacao.get('codigoEstadoPublicacaoJudicial', '')).lower()
+        texto_sem_acentos = None
+
+        for posicao in sorted(self._sempre.union(encontradas)):
+            regra = self.regras[posicao]
+            if regra.tribunais is not None and tribunal not in regra.tribunais:
+                continue
+            if regra.estados is not None and estado not in regra.estados:
+                continue
+            tipos = encontradas.get(posicao, ())
+            if 'excluida' in tipos:
+                continue
+            if regra.exige_palavra and 'palavra' not in tipos:
+                continue
+            if regra.exige_parte and 'parte' not in tipos:
+                continue
+            if regra.regex is not None:
+                if texto_sem_acentos is None:
+                    texto_sem_acentos = remover_acentos(texto)
+                if not regra.regex.search(texto_sem_acentos):
+                    continue
+
+            decisao: DecisaoPublicacao = {
+                'numeroPublicacaoJudicial': publicacao['numeroPublicacaoJudicial'],
+                'acao': regra.acao,
+                'regra': regra.nome,
+            }
+            if regra.acao == 'descartar':
+                decisao['mensagem'] = regra.mensagem
+            elif regra.acao == 'indicar':
+                if regra.id_npj:
+                    decisao['id_npj'] = regra.id_npj
+                elif regra.npj:
+                    decisao['npj'] = regra.npj
+                else:
+                    encontrado = regra.npj_regex.search(texto)
+                    if encontrado is None:
+                        # Sem NPJ não há como indicar; a próxima regra pode decidir
+                        continue
+                    decisao['npj'] = encontrado.group(1) if encontrado.groups() else encontrado.group(0)
+            return decisao
+        return None
+
+    def classificar(self, publicacoes: Iterable[dict]) -> List[DecisaoPublicacao]:
+        """
+        Aplica as regras a várias publicações (aceita também o gerador de iter_publicacoes).
+
+        :param publicacoes: Publicações no formato do schema Publicacao.
+        :return: Decisões das publicações em que alguma regra casou, na ordem recebida.
+        """
+        decisoes = []
+        for publicacao in publicacoes:
+            decisao = self.avaliar(publicacao)
+            if decisao is not None:
+                decisoes.append(decisao)
+        return decisoes
@@ -0,0 +1,29 @@
+from typing import TypedDict, List
+
+class DocumentoBaixado(TypedDict):
+    """
+    Representa os metadados retornados pela função baixar_documento_stream.
+    """
+    id_documento: str
+    caminho: str
+    tamanho: int
+    contentType: str
+    sha256: str
+
+class FalhaDownload(TypedDict):
+    """
+    Representa um documento que não pôde ser baixado pela função baixar_documentos.
+    """
+    id_documento: str
+    erro: str
+
+class RelatorioDownloads(TypedDict):
+    """
+    Representa o relatório retornado pela função baixar_documentos.
+    """
+    baixados: List[DocumentoBaixado]
+    pulados: List[str]
+    falhas: List[FalhaDownload]
+    bytes: int
+    segundos: float
+    mb_por_segundo: float
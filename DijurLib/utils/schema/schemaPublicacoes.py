@@ -1,4 +1,4 @@
-from typing import TypedDict, List
+from typing import TypedDict, Dict, List, Optional
 
 class Publicacao(TypedDict):
     """
@@ -25,3 +25,79 @@ class PublicacoesResponse(TypedDict):
     """
     quantidadeRegistro: int
     listaPublicacao: List[Publicacao]
+
+class FatiaConsulta(TypedDict):
+    """
+    Representa uma listagem (tribunal × estado × fatia da janela) feita pela função consultar_publicacoes.
+    """
+    tribunal: str
+    tipo: str
+    dataInicio: str
+    dataFim: str
+    paginas: int
+    quantidade: int  # publicações recebidas, antes de remover as repetidas
+    segundos: float  # duração das levas de lote de que a listagem participou
+
+class ConsultaPublicacoesResponse(TypedDict):
+    """
+    Representa a resposta da função consultar_publicacoes.
+    """
+    quantidadeRegistro: int
+    listaPublicacao: List[Publicacao]
+    fatias: List[FatiaConsulta]
+
+class EventoPublicacao(TypedDict):
+    """
+    Representa uma mudança retornada pela função sincronizar_publicacoes.
+    """
+    evento: str  # 'inclusao' ou 'transicao'
+    numeroPublicacaoJudicial: int
+    de: Optional[str]
+    para: Optional[str]
+    publicacao: Optional[Publicacao]
+
+class DecisaoPublicacao(TypedDict, total=False):
+    """
+    Representa uma decisão de tratamento recebida pela função tratar_publicacoes_em_lote.
+    """
+    numeroPublicacaoJudicial: int
+    acao: str  # 'indicar', 'descartar' ou 'bbnaoparte'
+    npj: str  # indicar: NPJ do processo (ou id_npj)
+    id_npj: int  # indicar: ID do processo (ou npj)
+    mensagem: str  # descartar: justificativa do descarte
+    regra: str  # nome da regra que gerou a decisão (MotorRegras)
+
+class ResultadoTratamento(TypedDict):
+    """
+    Representa o resultado de uma decisão tratada pela função tratar_publicacoes_em_lote.
+    """
+    numeroPublicacaoJudicial: int
+    acao: str
+    sucesso: bool
+    resposta: Optional[dict]
+    erro: Optional[str]
+
+class RegraPublicacao(TypedDict, total=False):
+    """
+    Representa uma regra de classificação de publicações usada por MotorRegras.
+    """
+    nome: str
+    acao: str  # 'indicar', 'descartar' ou 'bbnaoparte'
+    palavras: List[str]  # o texto contém alguma destas palavras ou expressões
+    palavras_excluidas: List[str]  # o texto não contém nenhuma destas
+    partes: List[str]  # o texto contém algum destes nomes
+    regex: List[str]  # o texto casa com alguma destas expressões regulares
+    tribunais: List[str]  # ex: ['stj', 'tst']
+    estados: List[str]  # ex: ['pendente']
+    mensagem: str  # descartar: justificativa do descarte
+    npj: str  # indicar: NPJ fixo
+    id_npj: int  # indicar: ID do processo fixo
+    npj_regex: str  # indicar: expressão regular que extrai o NPJ do texto (grupo 1, se houver)
+
+class SerieTratamento(TypedDict):
+    """
+    Representa a resposta da função serie_tratamento_publicacoes.
+    """
+    dias: Dict[str, Dict[str, int]]  # 'dd/mm/aaaa' -> {estado: quantidade}
+    total: Dict[str, int]  # estado -> quantidade no período
+    requisicoes: int  # dias consultados no PAJ nesta chamada (os demais vieram do cache)
@@ -0,0 +1,23 @@
+import unicodedata
+
+def remover_acentos(texto: str) -> str:
+    """
+    Remove os acentos de um texto (decomposição NFD, descartando o que não for ASCII).
+
+    :param texto: Texto a ser tratado.
+    :return: Texto sem acentos.
+    :example: remover_acentos("Ação Civil Pública") -> "Acao Civil Publica"
+    """
+    texto = unicodedata.normalize('NFD', texto)
+    return texto.encode('ascii', 'ignore').decode("utf-8")
+
+def normalizar_texto(texto: str) -> str:
+    """
+    Normalização usada nas comparações de texto do DijurLib (comparar_str, índice e regras de publicações):
+    sem acentos e em minúsculas.
+
+    :param texto: Texto a ser tratado.
+    :return: Texto normalizado.
+    :example: normalizar_texto("BANCO DO BRASIL S.A. - Agência") -> "banco do brasil s.a. - agencia"
+    """
+    return remover_acentos(texto).lower()
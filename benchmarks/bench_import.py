@@ -0,0 +1,64 @@
+"""
+Mede o tempo de importação do DijurLib em processos novos e confere que o Selenium
+só é carregado por quem usa o navegador.
+
+Cada caso roda em um interpretador novo (como os workers de vida curta), várias vezes,
+e o menor tempo é informado. Termina com código 1 se algum caso leve carregar o Selenium
+ou passar do limite de tempo, para ser usado como verificação de regressão.
+
+Uso:
+    python benchmarks/bench_import.py              # limite padrão de 150 ms para os casos leves
+    python benchmarks/bench_import.py 80           # limite em milissegundos
+"""
+import os
+import subprocess
+import sys
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# (descrição, código importado, pode carregar o Selenium)
+CASOS = [
+    ("import DijurLib", "import DijurLib", False),
+    ("schemas", "from DijurLib.utils.schema.schemaPublicacoes import *", False),
+    ("get_processo_pje", "from DijurLib import get_processo_pje", False),
+    ("funções do PAJ", "from DijurLib.api import get_processos_npj, listar_publicacoes, npj_dados_processo", False),
+    # Referência: o que a primeira chamada que abre o navegador passa a pagar
+    ("navegador (Selenium)", "from DijurLib.utils.navegador import iniciar_navegador; from selenium.webdriver.remote.webdriver import WebDriver", True),
+]
+
+SCRIPT = """
+import sys, time
+inicio = time.perf_counter()
+{codigo}
+fim = time.perf_counter()
+print(fim - inicio, 'selenium' in sys.modules)
+"""
+
+def medir(codigo: str, repeticoes: int = 5):
+    ambiente = dict(os.environ, PYTHONPATH=RAIZ + os.pathsep + os.environ.get('PYTHONPATH', ''))
+    tempos = []
+    carregou_selenium = False
+    for _ in range(repeticoes):
+        saida = subprocess.run(
+            [sys.executable, '-c', SCRIPT.format(codigo=codigo)],
+            capture_output=True, text=True, env=ambiente, check=True
+        ).stdout.split()
+        tempos.append(float(saida[0]))
+        carregou_selenium = saida[1] == 'True'
+    return min(tempos), carregou_selenium
+
+if __name__ == "__main__":
+    limite_ms = float(sys.argv[1]) if len(sys.argv) > 1 else 150.0
+    falhou = False
+    for descricao, codigo, pode_selenium in CASOS:
+        segundos, carregou_selenium = medir(codigo)
+        problemas = []
+        if not pode_selenium:
+            if carregou_selenium:
+                problemas.append("carregou o Selenium")
+            if segundos * 1000 > limite_ms:
+                problemas.append(f"passou de {limite_ms:.0f} ms")
+        falhou = falhou or bool(problemas)
+        print(f"{descricao}: {segundos * 1000:.1f} ms | Selenium {'sim' if carregou_selenium else 'não'}"
+              + (f" | REGRESSÃO: {', '.join(problemas)}" if problemas else ""))
+    sys.exit(1 if falhou else 0)
@@ -0,0 +1,119 @@
+"""
+Compara o caminho de objetos (response.json() convertido pelo protocolo do WebDriver)
+com o modo texto_bruto (uma string convertida por carregar_json).
+
+Mede somente o lado Python; a serialização do objeto dentro do navegador, que o modo
+texto_bruto também evita, não aparece aqui.
+
+Uso:
+    python benchmarks/bench_json.py                 # payloads sintéticos de listaPublicacao e listaDocumento
+    python benchmarks/bench_json.py respostas/*.json # respostas gravadas do PAJ
+"""
+import json
+import os
+import sys
+import timeit
+
+from selenium.webdriver.remote.webdriver import WebDriver
+
+# Permite rodar o benchmark direto (python benchmarks/...) sem instalar o DijurLib
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, RAIZ)
+
+from DijurLib.utils.decodificador import carregar_json, decodificador_ativo
+
+# Reaproveita a conversão que o WebDriver aplica a todo valor retornado por execute_async_script
+class _Desembrulhador:
+    _unwrap_value = WebDriver._unwrap_value
+
+_desembrulhador = _Desembrulhador()
+
+def payload_publicacoes(quantidade: int = 500) -> dict:
+    return {
+        "statusCode": 200,
+        "status": "OK",
+        "messages": [],
+        "data": {
+            "totalDePublicacoes": quantidade,
+            "listaPublicacao": [
+                {
+                    "codigoEstadoPublicacaoJudicial": 3,
+                    "codigoExternoProcessoInteresse": "0001352-85.2000.8.06.0119",
+                    "codigoIdentificadorJornalOficial": 23,
+                    "codigoUnidadeOrganizacionalRecebedor": 18908,
+                    "dataDivulgacao": "16.01.2025",
+                    "dataPublicacao": "17.01.2025",
+                    "dataRecebimento": "16.01.2025",
+                    "nomeEmpresaResponsavel": "EMPRESA",
+                    "numeroProcesso": 20250019564 + i,
+                    "numeroProcessoCompleto": "2025/0019564-002",
+                    "numeroProcessoPrincipal": 20250019564,
+                    "numeroPublicacaoJudicial": 900000 + i,
+                    "numeroVariacao": 2,
+                    "textoPublicacaoJudicial": "Texto da publicação com acentuação. " * 60,
+                }
+                for i in range(quantidade)
+            ],
+        },
+    }
+
+def payload_documentos(quantidade: int = 2000) -> dict:
+    return {
+        "statusCode": 200,
+        "status": "OK",
+        "messages": [],
+        "data": {
+            "quantidadeOcorrencia": quantidade,
+            "listaDocumento": [
+                {
+                    "numeroSequencialInclusaoDocumento": i,
+                    "numeroIdentificacaoTipoDocumento": 23,
+                    "dataDigitalizacaoDocumento": "16.01.2025",
+                    "codigoGrupoDocumento": 2,
+                    "codigoGeralDocumento": 100 + i,
+                    "codigoFaseInclusaoDocumento": 1,
+                    "codigoTipoDocumentoDigitalizado": 2,
+                    "textoTipoDocumentoDigitalizado": "PDF",
+                    "codigoUsuarioResponsavelAtualizacao": "F1234567",
+                    "timestampAtualizacaoRegistro": "2025-01-16-12.40.45.000000",
+                    "codigoDocumentoJuridico": f"DOC{i:08d}",
+                    "numeroRastreamentoAno": 2025,
+                    "numeroRastreamentoSequencial": i,
+                    "nomeArquivoOriginal": f"documento_{i}.pdf",
+                    "codigoTipoDocumento": 7,
+                    "textoTipoDocumento": "PETICAO",
+                    "codigoNivelConfidencialidade": 2,
+                    "textoNivelConfidencialidade": "RESTRITO",
+                }
+                for i in range(quantidade)
+            ],
+        },
+    }
+
+def medir(nome: str, corpo: str, repeticoes: int = 20):
+    # Caminho de objetos: o WebDriver recebe o objeto serializado e desembrulha valor a valor
+    resposta_objeto = json.dumps({"value": json.loads(corpo)})
+    # Modo texto_bruto: o WebDriver recebe uma única string
+    resposta_texto = json.dumps({"value": corpo})
+
+    def caminho_objeto():
+        _desembrulhador._unwrap_value(json.loads(resposta_objeto)["value"])
+
+    def caminho_texto():
+        carregar_json(_desembrulhador._unwrap_value(json.loads(resposta_texto)["value"]))
+
+    t_objeto = min(timeit.repeat(caminho_objeto, number=repeticoes, repeat=3)) / repeticoes
+    t_texto = min(timeit.repeat(caminho_texto, number=repeticoes, repeat=3)) / repeticoes
+    print(f"{nome}: {len(corpo) / 1024:.0f} KB | objeto {t_objeto * 1000:.2f} ms | "
+          f"texto ({decodificador_ativo()}) {t_texto * 1000:.2f} ms | {t_objeto / t_texto:.1f}x")
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1:
+        for caminho in sys.argv[1:]:
+            with open(caminho, encoding="utf-8") as f:
+                medir(caminho, f.read())
+    else:
+        for quantidade in (50, 500):
+            medir(f"listaPublicacao com {quantidade} itens", json.dumps(payload_publicacoes(quantidade)))
+        for quantidade in (500, 5000):
+            medir(f"listaDocumento com {quantidade} itens", json.dumps(payload_documentos(quantidade)))
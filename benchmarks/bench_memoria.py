@@ -0,0 +1,136 @@
+"""
+Mede, com tracemalloc, a memória ocupada por listas grandes de publicações e de andamentos
+nos dicionários de sempre e nos registros compactos (PublicacaoCompacta / AndamentoCompacto).
+
+As listas são sintéticas e imitam o que chega do PAJ: são decodificadas em páginas de 50 registros,
+então os textos repetidos (tribunal, datas, tipo de andamento, matrículas) são strings distintas entre
+registros, como em uma resposta real. O andamento do servidor traz campos a mais, fora do schema Andamento.
+O texto da publicação ocupa o mesmo espaço nos dois formatos e fica vazio aqui; com os textos, a economia
+absoluta é a mesma, mas a proporcional é menor.
+
+Uso:
+    python benchmarks/bench_memoria.py                # 100.000 publicações e 100.000 andamentos
+    python benchmarks/bench_memoria.py 50000 300000   # quantidade de publicações e de andamentos
+"""
+import gc
+import json
+import os
+import random
+import sys
+import time
+import tracemalloc
+
+# Permite rodar o benchmark direto (python benchmarks/...) sem instalar o DijurLib
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, RAIZ)
+
+from DijurLib.utils.compacto import compactar_andamentos, compactar_publicacoes
+
+TAMANHO_PAGINA = 50
+
+TRIBUNAIS = ["stj", "stf", "tst", "tjdft", "trf1"]
+ESTADOS = ["pendente", "emtratamento", "tratada", "descartada"]
+TIPOS_ANDAMENTO = ["PETICAO", "DECISAO", "DESPACHO", "SENTENCA", "AUDIENCIA", "CITACAO", "INTIMACAO", "JUNTADA"]
+CATEGORIAS = ["PROCESSUAL", "ADMINISTRATIVO", "FINANCEIRO"]
+GRUPOS = ["ACOMPANHAMENTO", "PRAZO", "PAGAMENTO"]
+
+def _decodificar_paginas(registros: list) -> list:
+    # Cada página passa pelo JSON, como na resposta do servidor
+    decodificados = []
+    for inicio in range(0, len(registros), TAMANHO_PAGINA):
+        decodificados.extend(json.loads(json.dumps(registros[inicio:inicio + TAMANHO_PAGINA])))
+    return decodificados
+
+def gerar_publicacoes(quantidade: int, semente: int = 3) -> list:
+    aleatorio = random.Random(semente)
+    publicacoes = []
+    for numero in range(quantidade):
+        dia = f"{aleatorio.randint(1, 28):02d}.05.2025"
+        registro = {
+            "codigoEstadoPublicacaoJudicial": aleatorio.choice(ESTADOS),
+            "codigoExternoProcessoInteresse": "",
+            "codigoIdentificadorJornalOficial": aleatorio.choice(TRIBUNAIS),
+            "codigoUnidadeOrganizacionalRecebedor": 9999,
+            "dataDivulgacao": dia,
+            "dataPublicacao": dia,
+            "dataRecebimento": dia,
+            "nomeEmpresaResponsavel": "EMPRESA DE RECORTES LTDA",
+            "numeroProcesso": 100000000 + numero,
+            "numeroProcessoCompleto": f"{numero:07d}-12.2024.8.07.0001",
+            "numeroProcessoPrincipal": 0,
+            "numeroPublicacaoJudicial": 900000 + numero,
+            "numeroVariacao": 0,
+            "textoPublicacaoJudicial": "",
+        }
+        publicacoes.append(registro)
+    return _decodificar_paginas(publicacoes)
+
+def gerar_andamentos(quantidade: int, semente: int = 5) -> list:
+    aleatorio = random.Random(semente)
+    andamentos = []
+    for numero in range(quantidade):
+        tipo = aleatorio.randrange(len(TIPOS_ANDAMENTO))
+        registro = {
+            "numeroProcesso": 100000000 + numero // 40,
+            "numeroProcessoPrincipal": 0,
+            "numeroOrdemVariacao": 0,
+            "codigoTipoAndamento": 100 + tipo,
+            "textoTipoAndamento": TIPOS_ANDAMENTO[tipo],
+            "codigoTipoCategoriaAndamento": tipo % 3,
+            "textoTipoCategoriaAndamento": CATEGORIAS[tipo % 3],
+            "codigoGrupoTipoAndamento": tipo % 3,
+            "textoGrupoTipoAndamento": GRUPOS[tipo % 3],
+            "codigoTipoSolicitanteAndamento": "U",
+            "textoTipoSolicitanteAndamento": "USUARIO",
+            "numeroAndamentoProcesso": numero % 40 + 1,
+            "dataAndamento": f"{aleatorio.randint(1, 28):02d}.{aleatorio.randint(1, 12):02d}.2024",
+            "textoInformacao": f"Andamento {numero}",
+            "valorTotalCalculo": 0.0,
+            "codigoUsuarioResponsavelAtualizacao": f"C{aleatorio.randint(1, 50):07d}",
+            "timestampAtualizacaoRegistro": f"2024-05-{aleatorio.randint(1, 28):02d}-10.00.00.{numero:06d}",
+            "indicadorAndamentoCompleto": "S",
+            "indicadorRegistroAtivo": "S",
+            "indicadorDocumentoDigitalizado": "N",
+            "codigoUsuarioResponsavelAndamento": f"C{aleatorio.randint(1, 50):07d}",
+            "codigoNucleoResponsavelAndamento": 1,
+            "codigoDependenciaResponsavelAndamento": 9999,
+            "indicadorControleMensagemInterno": "N",
+            "codigoTipoConfidencialidade": 0,
+            "indicadorIncentivoJuridicoNegocial": "N",
+            "indicadorDocumentoDigitalizadoMigrado": "N",
+            "numeroFatura": 0,
+            "textoTag": "",
+            # Campos que o servidor devolve além do schema
+            "textoNomeUsuarioResponsavelAndamento": "FULANO DE TAL",
+            "textoSiglaDependencia": "DIJUR",
+            "indicadorAndamentoAutomatico": "N",
+        }
+        andamentos.append(registro)
+    return _decodificar_paginas(andamentos)
+
+def medir(descricao: str, construir) -> int:
+    gc.collect()
+    tracemalloc.start()
+    inicio = time.perf_counter()
+    resultado = construir()
+    segundos = time.perf_counter() - inicio
+    atual, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"  {descricao}: {atual / 2**20:8.1f} MiB ({atual / len(resultado):6.0f} bytes/registro, {segundos:.2f} s)")
+    del resultado
+    return atual
+
+def comparar(nome: str, gerar, compactar, quantidade: int):
+    print(f"{nome} ({quantidade} registros):")
+    # Dicionários: a lista decodificada, como fica hoje em memória
+    dicionarios = medir("dicionários", lambda: gerar(quantidade))
+    # Compactos: cada dicionário é descartado logo após a conversão, como em listar_publicacoes(compacto=True)
+    compactos = medir("compactos  ", lambda: compactar(iter(gerar(quantidade))))
+    print(f"  economia: {(1 - compactos / dicionarios) * 100:.0f}% ({dicionarios / compactos:.1f}x menos memória)")
+
+if __name__ == "__main__":
+    quantidade_publicacoes = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    quantidade_andamentos = int(sys.argv[2]) if len(sys.argv) > 2 else 100_000
+
+    comparar("Publicações", gerar_publicacoes, compactar_publicacoes, quantidade_publicacoes)
+    comparar("Andamentos", gerar_andamentos, compactar_andamentos, quantidade_andamentos)
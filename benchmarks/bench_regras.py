@@ -0,0 +1,120 @@
+"""
+Mede a vazão do MotorRegras na triagem de publicações e compara com a triagem por substrings
+(um `in` por palavra-chave de cada regra, como nos scripts de triagem), com o mesmo conjunto de regras.
+
+As publicações e as regras são sintéticas: textos de ~150 palavras sorteadas de um vocabulário jurídico,
+com nomes de partes e expressões das regras inseridos em parte delas. A triagem por substrings é medida
+em uma amostra e projetada para o total.
+
+Uso:
+    python benchmarks/bench_regras.py               # 100.000 publicações, 60 regras
+    python benchmarks/bench_regras.py 20000 200     # quantidade de publicações e de regras
+"""
+import os
+import random
+import sys
+import time
+
+# Permite rodar o benchmark direto (python benchmarks/...) sem instalar o DijurLib
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, RAIZ)
+
+from DijurLib.utils.regras import MotorRegras
+from DijurLib.utils.texto import normalizar_texto
+
+VOCABULARIO = (
+    "intimação processo autos recurso agravo apelação sentença decisão despacho prazo dias parte ré autor "
+    "advogado advogada OAB execução fiscal cumprimento embargos declaração tribunal turma relator ministro "
+    "juiz vara comarca petição manifestação pagamento custas honorários acórdão publique-se cumpra-se "
+    "contrato cédula crédito bancário agência conta valor débito banco caixa econômica federal estado "
+    "município união instituto nacional seguro social audiência conciliação perícia laudo certidão trânsito"
+).split()
+
+NOMES = ["José", "Maria", "João", "Ana", "Antônio", "Francisca", "Carlos", "Paula", "Luiz", "Márcia"]
+SOBRENOMES = ["Silva", "Santos", "Oliveira", "Souza", "Rodrigues", "Ferreira", "Alves", "Pereira", "Lima", "Gomes"]
+
+def gerar_regras(quantidade: int, semente: int = 7) -> list:
+    aleatorio = random.Random(semente)
+    regras = []
+    for i in range(quantidade):
+        tipo = i % 3
+        regra = {'nome': f'regra {i}', 'estados': ['pendente']}
+        if tipo == 0:
+            regra.update(acao='bbnaoparte',
+                         palavras=[f'expressao{i} {aleatorio.choice(VOCABULARIO)}' for _ in range(8)],
+                         palavras_excluidas=['banco do brasil'])
+        elif tipo == 1:
+            regra.update(acao='descartar', mensagem=f'Descarte automático {i}',
+                         partes=[f'{aleatorio.choice(NOMES)} {aleatorio.choice(SOBRENOMES)} {i}' for _ in range(5)],
+                         palavras=[f'termo{i}', f'chave{i} extra'])
+        else:
+            regra.update(acao='indicar', npj_regex=r'NPJ\s*(\d{4}/\d{7}-\d{3})',
+                         palavras=[f'assunto{i}', f'materia{i} especifica'],
+                         regex=[rf'processo\s+n[o.]?\s*{i}\b'])
+        regras.append(regra)
+    return regras
+
+def gerar_publicacoes(quantidade: int, regras: list, semente: int = 11) -> list:
+    aleatorio = random.Random(semente)
+    publicacoes = []
+    for numero in range(quantidade):
+        palavras = [aleatorio.choice(VOCABULARIO) for _ in range(150)]
+        # Parte das publicações recebe expressões de alguma regra
+        if aleatorio.random() < 0.3:
+            regra = aleatorio.choice(regras)
+            for chave in ('palavras', 'partes'):
+                if regra.get(chave):
+                    palavras.insert(aleatorio.randrange(len(palavras)), aleatorio.choice(regra[chave]).upper())
+            palavras.append('NPJ 2025/0019564-002')
+        if aleatorio.random() < 0.5:
+            palavras.insert(aleatorio.randrange(len(palavras)), 'BANCO DO BRASIL S.A.')
+        publicacoes.append({
+            'numeroPublicacaoJudicial': 900000 + numero,
+            'codigoEstadoPublicacaoJudicial': 'pendente',
+            'codigoIdentificadorJornalOficial': 'stj',
+            'textoPublicacaoJudicial': ' '.join(palavras),
+        })
+    return publicacoes
+
+def triagem_substrings(publicacoes: list, regras: list) -> int:
+    # Triagem ingênua: normaliza o texto e testa cada palavra-chave de cada regra com `in`
+    decididas = 0
+    for publicacao in publicacoes:
+        texto = normalizar_texto(publicacao['textoPublicacaoJudicial'])
+        for regra in regras:
+            if any(normalizar_texto(p) in texto for p in regra.get('palavras_excluidas', ())):
+                continue
+            if regra.get('palavras') and not any(normalizar_texto(p) in texto for p in regra['palavras']):
+                continue
+            if regra.get('partes') and not any(normalizar_texto(p) in texto for p in regra['partes']):
+                continue
+            decididas += 1
+            break
+    return decididas
+
+if __name__ == "__main__":
+    quantidade = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    quantidade_regras = int(sys.argv[2]) if len(sys.argv) > 2 else 60
+
+    regras = gerar_regras(quantidade_regras)
+    print(f"Gerando {quantidade} publicações...")
+    publicacoes = gerar_publicacoes(quantidade, regras)
+
+    inicio = time.perf_counter()
+    motor = MotorRegras(regras)
+    compilacao = time.perf_counter() - inicio
+    print(f"Compilação: {quantidade_regras} regras, {motor.automato.quantidade} expressões no automato, {compilacao * 1000:.1f} ms")
+
+    inicio = time.perf_counter()
+    decisoes = motor.classificar(publicacoes)
+    segundos = time.perf_counter() - inicio
+    print(f"MotorRegras: {quantidade} publicações em {segundos:.2f} s | {quantidade / segundos:,.0f} publicações/s | "
+          f"{len(decisoes)} decisões")
+
+    amostra = publicacoes[:min(quantidade, 5000)]
+    inicio = time.perf_counter()
+    triagem_substrings(amostra, regras)
+    segundos_amostra = time.perf_counter() - inicio
+    projetado = segundos_amostra * quantidade / len(amostra)
+    print(f"Substrings: {len(amostra)} publicações em {segundos_amostra:.2f} s | {len(amostra) / segundos_amostra:,.0f} publicações/s | "
+          f"projeção para {quantidade}: {projetado:.1f} s ({projetado / segundos:.1f}x)")
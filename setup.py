@@ -2,12 +2,16 @@ from setuptools import setup, find_packages
 
 setup(
     name="DijurLib",
-    version="0.0.13.4",
+    version="0.0.14.0",
     packages=find_packages(),
     install_requires=[
         "selenium",
         "requests"
         ],
+    extras_require={
+        "rapido": ["orjson"],
+        "sessao": ["cryptography"],
+    },
     description="Biblioteca interna da DIJUR",
     author="DIJUR",
 )